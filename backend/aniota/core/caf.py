@@ -108,6 +108,9 @@ class CognitiveFramework(CoreSystemModule):
             'identity_stability_required': True,
         }
 
+        # Offline HardCodedKnowledgeBase that vetted concepts are published to
+        self.offline_knowledge_base = None
+
         # Initialize teaching knowledge with core innate knowledge
         self._initialize_teaching_knowledge()
         # Initialize knowledge curation and vetting systems
@@ -655,6 +658,10 @@ class CognitiveFramework(CoreSystemModule):
                 # Update teaching capabilities based on new knowledge
                 teaching_updates = self._update_teaching_capabilities(integration_result)
                 
+                # Patch the offline knowledge base in place while it keeps serving
+                if self.offline_knowledge_base is not None:
+                    self._publish_to_offline_knowledge(vetting_result.get('vetted_knowledge', raw_knowledge))
+                
                 # Log successful integration
                 self.knowledge_integration_log.append({
                     'timestamp': datetime.now().isoformat(),
@@ -686,6 +693,38 @@ class CognitiveFramework(CoreSystemModule):
             self.logger.error(f"Knowledge integration failed for {knowledge_source}: {e}")
             return {'integration_successful': False, 'error': str(e)}
 
+    def attach_offline_knowledge_base(self, knowledge_base) -> None:
+        """
+        Attach the HardCodedKnowledgeBase that integrate_vetted_knowledge publishes to
+        
+        Engines built on that knowledge base (e.g. TruthEngine) see each
+        published concept through its change listeners. Pass None to stop
+        publishing.
+        """
+        self.offline_knowledge_base = knowledge_base
+        if knowledge_base is not None:
+            self.logger.info(f"Offline knowledge base attached ({len(knowledge_base.knowledge_base)} concepts)")
+    
+    def _publish_to_offline_knowledge(self, vetted_knowledge: Dict[str, Any]) -> Optional[str]:
+        """
+        Add or update one vetted concept in the attached HardCodedKnowledgeBase
+        
+        Uses its incremental add_concept/update_concept, so the keyword index
+        and TruthEngine caches are patched without a rebuild. Knowledge without
+        a 'concept_id' is not concept-shaped and is skipped.
+        """
+        concept_id = vetted_knowledge.get('concept_id')
+        if not concept_id:
+            return None
+        
+        concept_data = {key: value for key, value in vetted_knowledge.items() if key != 'concept_id'}
+        if concept_id in self.offline_knowledge_base.knowledge_base:
+            self.offline_knowledge_base.update_concept(concept_id, concept_data)
+        else:
+            self.offline_knowledge_base.add_concept(concept_id, concept_data)
+        
+        return concept_id
+    
     def start_collaborative_learning_session(self, learner_profile: Dict[str, Any], 
                                            learning_objectives: List[str],
                                            subject_domain: str) -> str:
@@ -16,20 +16,208 @@ log_file_traversal("ieb.py", "system_initialization", "import", "Auto-generated
 Input Event Buffer (IEB) for Aniota
 - Buffers sensor snapshots every 5 seconds (default)
 - Each recording costs Aniota 1 point
-- Snapshots are written to a session meta file in JSON
+- Snapshots are written to a session meta file in JSON (one record per line)
+  by a background writer that batches writes, rotates the file by size/age
+  and optionally compresses rotated segments (gzip, or zstd if installed)
 - Sensors are modular and can be registered
 - Sampling interval and device selection are adjustable
 """
+import os
 import time
 import json
-from threading import Thread, Event
+import gzip
+import io
+import shutil
+from collections import deque
+from threading import Thread, Event, Lock
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    zstandard = None
+    ZSTD_AVAILABLE = False
+
+SEGMENT_EXTENSIONS = {None: "", "gzip": ".gz", "zstd": ".zst"}
+
+class MetaFileWriter:
+    """
+    Batched JSON-lines writer with size/age rotation
+
+    write() only queues the record; a writer thread appends queued records
+    through one open handle every flush_interval seconds (or once batch_size
+    records are waiting). When the active file passes max_segment_bytes or
+    max_segment_age seconds it is renamed to <name>.<n><ext>, compressed, and
+    segments beyond max_segments are deleted.
+    """
+    def __init__(self, path, max_segment_bytes=8 * 1024 * 1024, max_segment_age=3600,
+                 compression="gzip", flush_interval=1.0, batch_size=256, max_segments=50):
+        if compression == "zstd" and not ZSTD_AVAILABLE:
+            compression = "gzip"  # zstandard not installed
+        if compression not in SEGMENT_EXTENSIONS:
+            raise ValueError(f"Unsupported compression: {compression}")
+
+        self.path = path
+        self.max_segment_bytes = max_segment_bytes
+        self.max_segment_age = max_segment_age
+        self.compression = compression
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_segments = max_segments
+
+        self.pending = deque()
+        self.pending_lock = Lock()
+        self.write_lock = Lock()  # guards the file handle
+        self.wake_event = Event()
+        self.stop_event = Event()
+        self.thread = None
+        self.handle = None
+        self.segment_started = time.time()
+        self.records_written = 0
+        self.write_errors = 0
+
+    def write(self, record):
+        """Queue a record for the writer thread"""
+        with self.pending_lock:
+            self.pending.append(record)
+            full = len(self.pending) >= self.batch_size
+        if full:
+            self.wake_event.set()
+
+    def start(self):
+        if self.thread and self.thread.is_alive():
+            return
+        self.stop_event.clear()
+        self.thread = Thread(target=self._run, daemon=True, name="IEBMetaWriterThread")
+        self.thread.start()
+
+    def close(self):
+        """Stop the writer thread and write everything still queued"""
+        self.stop_event.set()
+        self.wake_event.set()
+        if self.thread:
+            self.thread.join(timeout=10.0)
+            self.thread = None
+        self.flush()
+        with self.write_lock:
+            if self.handle:
+                self.handle.close()
+                self.handle = None
+
+    def flush(self):
+        """Append all queued records in one write, rotating first if the segment is due"""
+        with self.pending_lock:
+            records = list(self.pending)
+            self.pending.clear()
+        if not records:
+            return 0
+
+        with self.write_lock:
+            try:
+                if self.handle is None:
+                    self._open_active()
+                elif self._rotation_due():
+                    self.rotate()
+                self.handle.write("".join(json.dumps(record) + "\n" for record in records))
+                self.handle.flush()
+                self.records_written += len(records)
+            except Exception:
+                self.write_errors += 1  # Logging can be added here
+        return len(records)
+
+    def rotate(self):
+        """Seal the active file as the next numbered segment and start a new one (call with write_lock held)"""
+        if self.handle:
+            self.handle.close()
+            self.handle = None
+        if os.path.exists(self.path) and os.path.getsize(self.path) > 0:
+            numbers = [number for number, _ in segment_files(self.path)]
+            segment = f"{self.path}.{max(numbers, default=0) + 1:06d}"
+            os.replace(self.path, segment)
+            self._compress_segment(segment)
+            self._apply_retention()
+        self._open_active()
+
+    def _run(self):
+        while not self.stop_event.is_set():
+            self.wake_event.wait(self.flush_interval)
+            self.wake_event.clear()
+            self.flush()
+
+    def _open_active(self):
+        self.handle = open(self.path, "a", encoding="utf-8")
+        self.segment_started = time.time()
+
+    def _rotation_due(self):
+        if self.handle.tell() >= self.max_segment_bytes:
+            return True
+        return time.time() - self.segment_started >= self.max_segment_age
+
+    def _compress_segment(self, segment):
+        if self.compression is None:
+            return
+        target = segment + SEGMENT_EXTENSIONS[self.compression]
+        with open(segment, "rb") as source, open(target + ".tmp", "wb") as raw:
+            if self.compression == "zstd":
+                with zstandard.ZstdCompressor().stream_writer(raw, closefd=False) as compressed:
+                    shutil.copyfileobj(source, compressed)
+            else:
+                with gzip.GzipFile(fileobj=raw, mode="wb") as compressed:
+                    shutil.copyfileobj(source, compressed)
+        os.replace(target + ".tmp", target)
+        os.remove(segment)
+
+    def _apply_retention(self):
+        if not self.max_segments:
+            return
+        segments = segment_files(self.path)
+        for _, segment in segments[:max(0, len(segments) - self.max_segments)]:
+            os.remove(segment)
+
+def segment_files(path):
+    """Rotated segments of a meta file as (number, path), oldest first"""
+    directory = os.path.dirname(path) or "."
+    prefix = os.path.basename(path) + "."
+    segments = []
+    for name in os.listdir(directory):
+        if not name.startswith(prefix) or name.endswith(".tmp"):
+            continue
+        number = name[len(prefix):].split(".", 1)[0]
+        if number.isdigit():
+            segments.append((int(number), os.path.join(directory, name)))
+    return sorted(segments)
+
+def _open_segment(segment):
+    if segment.endswith(".gz"):
+        return gzip.open(segment, "rt", encoding="utf-8")
+    if segment.endswith(".zst"):
+        if not ZSTD_AVAILABLE:
+            raise RuntimeError(f"zstandard is required to read {segment}")
+        raw = open(segment, "rb")
+        return io.TextIOWrapper(zstandard.ZstdDecompressor().stream_reader(raw, closefd=True), encoding="utf-8")
+    return open(segment, "r", encoding="utf-8")
+
+def read_meta_records(path):
+    """Lazily yield every record of a meta file: rotated segments first, then the active file"""
+    files = [segment for _, segment in segment_files(path)]
+    if os.path.exists(path):
+        files.append(path)
+    for file_path in files:
+        with _open_segment(file_path) as handle:
+            for line in handle:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue  # Torn last line from an unclean shutdown
 
 class InputEventBuffer:
-    def __init__(self, sensors=None, sampling_interval=5, meta_filename="ieb_meta.json"):
+    def __init__(self, sensors=None, sampling_interval=5, meta_filename="ieb_meta.json",
+                 max_buffered_snapshots=1000, **writer_options):
         self.sensors = sensors if sensors else []
         self.sampling_interval = sampling_interval
         self.meta_filename = meta_filename
-        self.buffer = []
+        self.buffer = deque(maxlen=max_buffered_snapshots)  # most recent snapshots only
+        self.meta_writer = MetaFileWriter(meta_filename, **writer_options)
         self.running = False
         self.stop_event = Event()
         self.aniota_points = 100  # Starting points, adjustable
@@ -53,20 +241,24 @@ class InputEventBuffer:
         self.write_to_meta_file(snapshot)
 
     def write_to_meta_file(self, snapshot):
-        try:
-            with open(self.meta_filename, "a", encoding="utf-8") as f:
-                f.write(json.dumps(snapshot) + "\n")
-        except Exception:
-            pass  # Logging can be added here
+        self.meta_writer.write(snapshot)
+        if not self.running:
+            self.meta_writer.flush()  # No writer thread outside start()/stop()
+
+    def read_meta_file(self):
+        """Stream recorded snapshots back, oldest first"""
+        return read_meta_records(self.meta_filename)
 
     def start(self):
         self.running = True
         self.stop_event.clear()
+        self.meta_writer.start()
         Thread(target=self._run, daemon=True).start()
 
     def stop(self):
         self.running = False
         self.stop_event.set()
+        self.meta_writer.close()
 
     def _run(self):
         while self.running and not self.stop_event.is_set():
@@ -24,6 +24,8 @@ Supports the four-choice Socratic system: Expand/Explore/Extend/Review
 from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 import math
+import time
+import numpy as np
 from templates.base_module import CoreSystemModule
 
 
@@ -39,6 +41,8 @@ class QuadVector:
     - X-axis: Relatedness (0.0 = unrelated, 1.0 = highly related)
     - Y-axis: Difficulty (0.0 = easy, 1.0 = challenging)
     """
+    __slots__ = ('expand', 'explore', 'extend', 'review', 'timestamp', 'difficulty', 'relatedness')
+    
     def __init__(self, expand: float, explore: float, extend: float, review: float,
                  difficulty: float = None, relatedness: float = None):
         self.expand = expand      # High/High quadrant
@@ -99,6 +103,195 @@ class QuadVector:
         correlation = (dot_product / (self_magnitude * other_magnitude) + 1) / 2
         return correlation
 
+QUADRANTS = ('expand', 'explore', 'extend', 'review')
+
+class QuadVectorBatch:
+    """
+    Columnar stream of quad vectors for high-rate micro-events
+
+    Four float32 component arrays plus an int64 monotonic timestamp array
+    (time.monotonic_ns) instead of one QuadVector object per event, with
+    vectorized to_coordinates / dominant_quadrant / magnitude. Explicit
+    (relatedness, difficulty) overrides are stored only once one is given.
+    Capacity grows by doubling.
+    """
+    
+    def __init__(self, initial_capacity: int = 1024):
+        self.components = np.zeros((4, initial_capacity), dtype=np.float32)  # rows follow QUADRANTS
+        self.timestamps = np.zeros(initial_capacity, dtype=np.int64)
+        self.coordinates: Optional[np.ndarray] = None  # 2×capacity (relatedness, difficulty), NaN = derive
+        self.count = 0
+    
+    @classmethod
+    def from_vectors(cls, vectors: List[QuadVector]) -> 'QuadVectorBatch':
+        batch = cls(max(len(vectors), 1))
+        for vector in vectors:
+            batch.append(vector.expand, vector.explore, vector.extend, vector.review,
+                         difficulty=vector.difficulty, relatedness=vector.relatedness)
+        return batch
+    
+    def __len__(self) -> int:
+        return self.count
+    
+    def __getitem__(self, index: int) -> QuadVector:
+        """Materialize one event as a QuadVector"""
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        expand, explore, extend, review = self.components[:, index].tolist()
+        relatedness = difficulty = None
+        if self.coordinates is not None and not np.isnan(self.coordinates[0, index]):
+            relatedness, difficulty = self.coordinates[:, index].tolist()
+        return QuadVector(expand, explore, extend, review, difficulty=difficulty, relatedness=relatedness)
+    
+    @property
+    def expand(self) -> np.ndarray:
+        return self.components[0, :self.count]
+    
+    @property
+    def explore(self) -> np.ndarray:
+        return self.components[1, :self.count]
+    
+    @property
+    def extend(self) -> np.ndarray:
+        return self.components[2, :self.count]
+    
+    @property
+    def review(self) -> np.ndarray:
+        return self.components[3, :self.count]
+    
+    def append(self, expand: float, explore: float, extend: float, review: float,
+               timestamp_ns: int = None, difficulty: float = None, relatedness: float = None) -> int:
+        """Add one event; returns its index"""
+        self._reserve(1)
+        index = self.count
+        self.components[:, index] = (expand, explore, extend, review)
+        self.timestamps[index] = time.monotonic_ns() if timestamp_ns is None else timestamp_ns
+        if difficulty is not None and relatedness is not None:
+            self._coordinate_columns()[:, index] = (relatedness, difficulty)
+        self.count += 1
+        return index
+    
+    def extend_components(self, components: np.ndarray, timestamps_ns: np.ndarray = None) -> None:
+        """Add a k×4 array of (expand, explore, extend, review) rows"""
+        components = np.asarray(components, dtype=np.float32).reshape(-1, 4)
+        size = len(components)
+        self._reserve(size)
+        self.components[:, self.count:self.count + size] = components.T
+        self.timestamps[self.count:self.count + size] = (
+            time.monotonic_ns() if timestamps_ns is None else timestamps_ns
+        )
+        self.count += size
+    
+    def component_matrix(self) -> np.ndarray:
+        """k×4 float64 components, the layout QuadPatternStore.normalize expects"""
+        return self.components[:, :self.count].T.astype(np.float64)
+    
+    def to_coordinates(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Vectorized QuadVector.to_coordinates: (relatedness, difficulty) arrays"""
+        relatedness = (self.expand + self.review) / 2.0
+        difficulty = (self.expand + self.extend) / 2.0
+        if self.coordinates is not None:
+            explicit = ~np.isnan(self.coordinates[0, :self.count])
+            relatedness[explicit] = self.coordinates[0, :self.count][explicit]
+            difficulty[explicit] = self.coordinates[1, :self.count][explicit]
+        return relatedness, difficulty
+    
+    def dominant_quadrant(self) -> np.ndarray:
+        """Vectorized QuadVector.dominant_quadrant (first dimension wins ties)"""
+        return np.asarray(QUADRANTS)[np.argmax(self.components[:, :self.count], axis=0)]
+    
+    def magnitude(self) -> np.ndarray:
+        """Vectorized QuadVector.magnitude"""
+        live = self.components[:, :self.count]
+        return np.sqrt(np.einsum('ij,ij->j', live, live))
+    
+    def nbytes(self) -> int:
+        """Memory held by the column arrays"""
+        total = self.components.nbytes + self.timestamps.nbytes
+        return total + (self.coordinates.nbytes if self.coordinates is not None else 0)
+    
+    def _reserve(self, size: int) -> None:
+        capacity = self.timestamps.shape[0]
+        if self.count + size <= capacity:
+            return
+        while capacity < self.count + size:
+            capacity *= 2
+        components = np.zeros((4, capacity), dtype=np.float32)
+        components[:, :self.count] = self.components[:, :self.count]
+        timestamps = np.zeros(capacity, dtype=np.int64)
+        timestamps[:self.count] = self.timestamps[:self.count]
+        self.components, self.timestamps = components, timestamps
+        if self.coordinates is not None:
+            coordinates = np.full((2, capacity), np.nan, dtype=np.float32)
+            coordinates[:, :self.count] = self.coordinates[:, :self.count]
+            self.coordinates = coordinates
+    
+    def _coordinate_columns(self) -> np.ndarray:
+        if self.coordinates is None:
+            self.coordinates = np.full((2, self.timestamps.shape[0]), np.nan, dtype=np.float32)
+        return self.coordinates
+
+class QuadPatternStore:
+    """
+    Learned quad patterns as a pre-normalized N×4 float32 matrix
+
+    Rows are unit vectors, so the cosine similarity of a new vector with
+    every pattern is one matrix-vector product. Zero-magnitude patterns keep
+    a zero row and are masked out (correlation_with returns 0.0 for them).
+    Capacity grows by doubling.
+    """
+    
+    def __init__(self, initial_capacity: int = 64):
+        self.unit_vectors = np.zeros((initial_capacity, 4), dtype=np.float32)
+        self.nonzero = np.zeros(initial_capacity, dtype=bool)
+        self.count = 0
+    
+    def __len__(self) -> int:
+        return self.count
+    
+    @staticmethod
+    def normalize(components: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Unit rows (float32) and a nonzero-magnitude mask for a k×4 array of components"""
+        magnitudes = np.sqrt(np.einsum('ij,ij->i', components, components))
+        nonzero = magnitudes > 0
+        units = np.zeros(components.shape, dtype=np.float32)
+        units[nonzero] = components[nonzero] / magnitudes[nonzero, None]
+        return units, nonzero
+    
+    def add(self, unit: np.ndarray, nonzero: bool) -> int:
+        """Append a normalized pattern; returns its row"""
+        if self.count == len(self.unit_vectors):
+            self.unit_vectors = np.concatenate([self.unit_vectors, np.zeros_like(self.unit_vectors)])
+            self.nonzero = np.concatenate([self.nonzero, np.zeros_like(self.nonzero)])
+        
+        self.unit_vectors[self.count] = unit
+        self.nonzero[self.count] = nonzero
+        self.count += 1
+        return self.count - 1
+    
+    def best_matches(self, units: np.ndarray, nonzero: np.ndarray, start: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Highest correlation (0-1 scale of correlation_with) of each query row
+        with the patterns from row start onward, and the matching row (-1 if none)
+        """
+        best = np.zeros(len(units), dtype=np.float64)
+        best_rows = np.full(len(units), -1, dtype=np.int64)
+        if self.count <= start or not len(units):
+            return best, best_rows
+        
+        similarities = units @ self.unit_vectors[start:self.count].T
+        correlations = (similarities.astype(np.float64) + 1) / 2
+        correlations[:, ~self.nonzero[start:self.count]] = 0.0
+        correlations[~nonzero] = 0.0
+        
+        rows = np.argmax(correlations, axis=1)
+        best = correlations[np.arange(len(units)), rows]
+        matched = best > 0
+        best_rows[matched] = rows[matched] + start
+        return best, best_rows
+
 class QuadVectorMathematicalLearningEngine(CoreSystemModule):
     """
     QVMLE - Quad Vector Mathematical Learning Engine
@@ -111,8 +304,9 @@ class QuadVectorMathematicalLearningEngine(CoreSystemModule):
     def __init__(self, parent=None):
         super().__init__("QVMLE", parent)
         
-        # Quad Vector storage
+        # Quad Vector storage (pattern_store holds the same patterns, normalized, row for row)
         self.learned_vectors: List[QuadVector] = []
+        self.pattern_store = QuadPatternStore()
         self.correlation_threshold = 0.75  # High correlation threshold
         
         # Learning statistics
@@ -131,145 +325,226 @@ class QuadVectorMathematicalLearningEngine(CoreSystemModule):
     def process_mouse_event(self, event_data: Dict[str, Any]) -> Optional[QuadVector]:
         """Convert mouse event into quad vector"""
         try:
-            # Extract timing data
-            start_time = event_data.get('start_time', 0)
-            end_time = event_data.get('end_time', 0)
-            duration = end_time - start_time
-            
-            # Map mouse behavior to learning dimensions
-            # Expand: deliberate, slower movements (going deeper)
-            expand = min(duration / 5.0, 1.0) if duration > 1.0 else 0.0
-            
-            # Explore: rapid movements, scanning behavior (discovering)
-            velocity = event_data.get('velocity', 0)
-            explore = min(velocity / 100.0, 1.0) if velocity > 10 else 0.0
-            
-            # Extend: movements toward new areas of screen (applying)
-            x_pos = event_data.get('x', 0) / 1000.0  # Normalize
-            y_pos = event_data.get('y', 0) / 1000.0
-            extend = abs(x_pos - 0.5) + abs(y_pos - 0.5)  # Distance from center
-            
-            # Review: return movements, hesitation patterns (reflecting)
-            review = 0.0
-            if 'return_movement' in event_data and event_data['return_movement']:
-                review = 0.8
-            elif duration > 3.0:  # Long pause = reflection
-                review = 0.6
-                
-            vector = QuadVector(expand, explore, extend, review)
+            vector = self._mouse_vector(event_data)
             return self._learn_from_vector(vector)
             
         except Exception as e:
             self.logger.error(f"Error processing mouse event: {e}")
             return None
     
+    def process_mouse_events(self, events: List[Dict[str, Any]]) -> List[Optional[QuadVector]]:
+        """Convert a batch of mouse events into quad vectors and learn from them together"""
+        return self._process_events(events, self._mouse_vector, "mouse")
+    
+    def _mouse_vector(self, event_data: Dict[str, Any]) -> QuadVector:
+        """Map one mouse event onto the four learning dimensions"""
+        # Extract timing data
+        start_time = event_data.get('start_time', 0)
+        end_time = event_data.get('end_time', 0)
+        duration = end_time - start_time
+        
+        # Map mouse behavior to learning dimensions
+        # Expand: deliberate, slower movements (going deeper)
+        expand = min(duration / 5.0, 1.0) if duration > 1.0 else 0.0
+        
+        # Explore: rapid movements, scanning behavior (discovering)
+        velocity = event_data.get('velocity', 0)
+        explore = min(velocity / 100.0, 1.0) if velocity > 10 else 0.0
+        
+        # Extend: movements toward new areas of screen (applying)
+        x_pos = event_data.get('x', 0) / 1000.0  # Normalize
+        y_pos = event_data.get('y', 0) / 1000.0
+        extend = abs(x_pos - 0.5) + abs(y_pos - 0.5)  # Distance from center
+        
+        # Review: return movements, hesitation patterns (reflecting)
+        review = 0.0
+        if 'return_movement' in event_data and event_data['return_movement']:
+            review = 0.8
+        elif duration > 3.0:  # Long pause = reflection
+            review = 0.6
+            
+        return QuadVector(expand, explore, extend, review)
+
     def process_keyboard_event(self, event_data: Dict[str, Any]) -> Optional[QuadVector]:
         """Convert keyboard event into quad vector"""
         try:
-            # Extract timing between keystrokes
-            interval = event_data.get('interval', 0)
-            key_type = event_data.get('key_type', 'letter')
-            sequence_length = len(event_data.get('sequence', ''))
-            
-            # Map keyboard behavior to learning dimensions
-            # Expand: deliberate typing, corrections (going deeper)
-            expand = 0.0
-            if 'backspace' in event_data or interval > 2.0:
-                expand = 0.7  # Corrections indicate deeper thinking
-                
-            # Explore: rapid typing bursts (discovering ideas)
-            explore = max(0, 1.0 - (interval / 5.0)) if interval < 5.0 else 0.0
-            
-            # Extend: special characters, numbers (applying concepts)
-            extend_mapping = {
-                'letter': 0.1,
-                'number': 0.6,
-                'symbol': 0.8,
-                'function': 0.9
-            }
-            extend = extend_mapping.get(key_type, 0.5)
-            
-            # Review: pauses in typing (reflecting)
-            review = min(interval / 10.0, 1.0) if interval > 3.0 else 0.0
-                
-            vector = QuadVector(expand, explore, extend, review)
+            vector = self._keyboard_vector(event_data)
             return self._learn_from_vector(vector)
             
         except Exception as e:
             self.logger.error(f"Error processing keyboard event: {e}")
             return None
     
+    def process_keyboard_events(self, events: List[Dict[str, Any]]) -> List[Optional[QuadVector]]:
+        """Convert a batch of keyboard events into quad vectors and learn from them together"""
+        return self._process_events(events, self._keyboard_vector, "keyboard")
+    
+    def _keyboard_vector(self, event_data: Dict[str, Any]) -> QuadVector:
+        """Map one keyboard event onto the four learning dimensions"""
+        # Extract timing between keystrokes
+        interval = event_data.get('interval', 0)
+        key_type = event_data.get('key_type', 'letter')
+        sequence_length = len(event_data.get('sequence', ''))
+        
+        # Map keyboard behavior to learning dimensions
+        # Expand: deliberate typing, corrections (going deeper)
+        expand = 0.0
+        if 'backspace' in event_data or interval > 2.0:
+            expand = 0.7  # Corrections indicate deeper thinking
+            
+        # Explore: rapid typing bursts (discovering ideas)
+        explore = max(0, 1.0 - (interval / 5.0)) if interval < 5.0 else 0.0
+        
+        # Extend: special characters, numbers (applying concepts)
+        extend_mapping = {
+            'letter': 0.1,
+            'number': 0.6,
+            'symbol': 0.8,
+            'function': 0.9
+        }
+        extend = extend_mapping.get(key_type, 0.5)
+        
+        # Review: pauses in typing (reflecting)
+        review = min(interval / 10.0, 1.0) if interval > 3.0 else 0.0
+            
+        return QuadVector(expand, explore, extend, review)
+
     def process_clipboard_event(self, event_data: Dict[str, Any]) -> Optional[QuadVector]:
         """Convert clipboard event into quad vector"""
         try:
-            action = event_data.get('action', 'copy')  # copy, paste, cut
-            duration = event_data.get('duration', 0)
-            content_length = event_data.get('content_length', 0)
-            
-            # Map clipboard behavior to learning dimensions
-            # Expand: copying detailed content (preserving depth)
-            expand = min(content_length / 200.0, 1.0) if action == 'copy' else 0.0
-            
-            # Explore: rapid copy/paste cycles (discovering connections)
-            explore = 0.8 if duration < 1.0 and action in ['copy', 'paste'] else 0.0
-            
-            # Extend: pasting into new contexts (applying knowledge)
-            extend = 0.9 if action == 'paste' else 0.0
-            
-            # Review: careful selection and cutting (reflecting on content)
-            review = 0.7 if action == 'cut' or duration > 3.0 else 0.0
-                
-            vector = QuadVector(expand, explore, extend, review)
+            vector = self._clipboard_vector(event_data)
             return self._learn_from_vector(vector)
             
         except Exception as e:
             self.logger.error(f"Error processing clipboard event: {e}")
             return None
     
-    def _learn_from_vector(self, new_vector: QuadVector) -> QuadVector:
-        """Core learning logic: compare quad vector with existing patterns"""
-        self.total_events += 1
+    def process_clipboard_events(self, events: List[Dict[str, Any]]) -> List[Optional[QuadVector]]:
+        """Convert a batch of clipboard events into quad vectors and learn from them together"""
+        return self._process_events(events, self._clipboard_vector, "clipboard")
+    
+    def _clipboard_vector(self, event_data: Dict[str, Any]) -> QuadVector:
+        """Map one clipboard event onto the four learning dimensions"""
+        action = event_data.get('action', 'copy')  # copy, paste, cut
+        duration = event_data.get('duration', 0)
+        content_length = event_data.get('content_length', 0)
         
-        # Update dimension statistics
-        self._update_dimension_stats(new_vector)
+        # Map clipboard behavior to learning dimensions
+        # Expand: copying detailed content (preserving depth)
+        expand = min(content_length / 200.0, 1.0) if action == 'copy' else 0.0
         
-        # Find highest correlation with existing vectors
-        best_correlation = 0.0
-        best_match = None
+        # Explore: rapid copy/paste cycles (discovering connections)
+        explore = 0.8 if duration < 1.0 and action in ['copy', 'paste'] else 0.0
         
-        for existing_vector in self.learned_vectors:
-            correlation = new_vector.correlation_with(existing_vector)
-            if correlation > best_correlation:
-                best_correlation = correlation
-                best_match = existing_vector
+        # Extend: pasting into new contexts (applying knowledge)
+        extend = 0.9 if action == 'paste' else 0.0
+        
+        # Review: careful selection and cutting (reflecting on content)
+        review = 0.7 if action == 'cut' or duration > 3.0 else 0.0
+            
+        return QuadVector(expand, explore, extend, review)
+
+    def _learn_from_vector(self, new_vector: QuadVector) -> QuadVector:
+        """Core learning logic: compare quad vector with existing patterns"""
+        recognized, best_correlation = self._learn_from_vectors([new_vector])[0]
         
         # Learning decision
-        if best_correlation >= self.correlation_threshold:
-            # Recognized pattern
-            self.recognized_patterns += 1
+        if recognized:
             self.logger.info(f"Quad pattern recognized with {best_correlation:.3f} correlation")
         else:
-            # New pattern - learn it
-            self.learned_vectors.append(new_vector)
-            self.new_patterns_learned += 1
             self.logger.info(f"New quad pattern learned. Total patterns: {len(self.learned_vectors)}")
         
         return new_vector
     
-    def _update_dimension_stats(self, vector: QuadVector):
-        """Update statistics for each learning dimension"""
-        dimensions = [
-            ('expand', vector.expand),
-            ('explore', vector.explore), 
-            ('extend', vector.extend),
-            ('review', vector.review)
-        ]
+    def _process_events(self, events: List[Dict[str, Any]], to_vector, event_kind: str) -> List[Optional[QuadVector]]:
+        """Map a batch of events to quad vectors (None where mapping fails) and learn from them in one pass"""
+        vectors: List[Optional[QuadVector]] = []
+        for event_data in events:
+            try:
+                vectors.append(to_vector(event_data))
+            except Exception as e:
+                self.logger.error(f"Error processing {event_kind} event: {e}")
+                vectors.append(None)
+        
+        learnable = [vector for vector in vectors if vector is not None]
+        decisions = self._learn_from_vectors(learnable)
+        recognized = sum(1 for is_recognized, _ in decisions if is_recognized)
+        self.logger.info(
+            f"Processed {len(learnable)} {event_kind} events: {recognized} recognized, "
+            f"{len(learnable) - recognized} new. Total patterns: {len(self.learned_vectors)}"
+        )
+        return vectors
+    
+    def _learn_from_vectors(self, new_vectors: List[QuadVector]) -> List[Tuple[bool, float]]:
+        """Match vectors against the pattern store in order; returns (recognized, best correlation) per vector"""
+        if not new_vectors:
+            return []
         
-        for name, value in dimensions:
+        components = np.array(
+            [(vector.expand, vector.explore, vector.extend, vector.review) for vector in new_vectors],
+            dtype=np.float64
+        )
+        return self._learn_from_components(components, new_vectors.__getitem__)
+    
+    def learn_from_batch(self, batch: QuadVectorBatch) -> List[Tuple[bool, float]]:
+        """Learn from a columnar batch; QuadVector objects are only created for new patterns"""
+        decisions = self._learn_from_components(batch.component_matrix(), batch.__getitem__)
+        recognized = sum(1 for is_recognized, _ in decisions if is_recognized)
+        self.logger.info(
+            f"Processed {len(batch)} batched quad vectors: {recognized} recognized, "
+            f"{len(batch) - recognized} new. Total patterns: {len(self.learned_vectors)}"
+        )
+        return decisions
+    
+    def _learn_from_components(self, components: np.ndarray, vector_at) -> List[Tuple[bool, float]]:
+        """
+        Shared matching loop over a k×4 component array; vector_at(i) gives the QuadVector to keep
+        
+        Matches against patterns learned before the batch are one matrix product;
+        only vectors left unrecognized are compared with patterns learned earlier
+        in the same batch, so the decisions equal processing them one at a time.
+        """
+        if not len(components):
+            return []
+        
+        self.total_events += len(components)
+        
+        # Update dimension statistics
+        self._update_dimension_stats_batch(components)
+        
+        # Find highest correlation with existing patterns
+        units, nonzero = QuadPatternStore.normalize(components)
+        best_correlations, _ = self.pattern_store.best_matches(units, nonzero)
+        batch_start = len(self.pattern_store)
+        
+        decisions = []
+        for index in range(len(components)):
+            best_correlation = float(best_correlations[index])
+            if best_correlation < self.correlation_threshold and len(self.pattern_store) > batch_start:
+                batch_best, _ = self.pattern_store.best_matches(units[index:index + 1], nonzero[index:index + 1], batch_start)
+                best_correlation = max(best_correlation, float(batch_best[0]))
+            
+            if best_correlation >= self.correlation_threshold:
+                # Recognized pattern
+                self.recognized_patterns += 1
+                decisions.append((True, best_correlation))
+            else:
+                # New pattern - learn it
+                self.learned_vectors.append(vector_at(index))
+                self.pattern_store.add(units[index], nonzero[index])
+                self.new_patterns_learned += 1
+                decisions.append((False, best_correlation))
+        
+        return decisions
+    
+    def _update_dimension_stats_batch(self, components: np.ndarray):
+        """Update dimension statistics for a k×4 batch of components in one step"""
+        totals = components.sum(axis=0).tolist()
+        for name, total in zip(('expand', 'explore', 'extend', 'review'), totals):
             stats = self.dimension_stats[name]
-            stats['count'] += 1
-            # Running average
-            stats['avg_strength'] = (stats['avg_strength'] * (stats['count'] - 1) + value) / stats['count']
+            previous_count = stats['count']
+            stats['count'] += len(components)
+            stats['avg_strength'] = (stats['avg_strength'] * previous_count + total) / stats['count']
     
     def get_learning_stats(self) -> Dict[str, Any]:
         """Return current learning statistics for quad vector system"""
@@ -302,6 +577,11 @@ class QuadVectorMathematicalLearningEngine(CoreSystemModule):
         ]
         dominant = max(dimensions, key=lambda x: x[1])
         
+        units, nonzero = QuadPatternStore.normalize(
+            np.array([[vector.expand, vector.explore, vector.extend, vector.review]], dtype=np.float64)
+        )
+        best_correlation = float(self.pattern_store.best_matches(units, nonzero)[0][0])
+        
         explanation = f"""
 Quad Vector Mathematical Learning Analysis:
 Vector: expand={vector.expand:.2f}, explore={vector.explore:.2f}, extend={vector.extend:.2f}, review={vector.review:.2f}
@@ -309,7 +589,7 @@ Magnitude: {vector.magnitude():.3f}
 Dominant dimension: {dominant[0]} ({dominant[1]:.2f})
 Correlations with existing patterns:
 {chr(10).join(correlations[:3])}
-Decision: {'Recognized' if max([v.correlation_with(vector) for v in self.learned_vectors] + [0]) >= self.correlation_threshold else 'New quad pattern learned'}
+Decision: {'Recognized' if best_correlation >= self.correlation_threshold else 'New quad pattern learned'}
 Learning context: Socratic {dominant[0]} behavior detected
 """
         return explanation
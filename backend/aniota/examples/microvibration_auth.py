@@ -16,10 +16,18 @@ log_file_traversal("microvibration_auth.py", "system_initialization", "import",
 import time
 import math
 import statistics
-from typing import List, Dict, Tuple, Optional
+from collections import deque
+from typing import List, Dict, Tuple, Optional, Deque
 from dataclasses import dataclass
+import numpy as np
 from templates.base_module import BaseModule
 
+# Events of context behind each microvibration vector
+CONTEXT_EVENTS = 5
+
+# Columns of extract_feature_matrix
+FEATURE_COLUMNS = ('temporal', 'radial', 'spatial', 'velocity', 'acceleration')
+
 
 @dataclass
 class MouseEvent:
@@ -64,104 +72,273 @@ class MicrovibrationVector:
         return numerator / denominator
 
 
-class MicrovibrationAnalyzer(BaseModule):
+class MicrovibrationFeatureStream:
     """
-    Mathematical analysis engine for microvibration-based authentication.
-    Captures mouse movement patterns during natural gameplay and converts to
-    mathematical signatures using triadic vector correlation analysis.
+    Streaming microvibration feature extractor, O(1) per event
+
+    The collection window is a deque trimmed from the left as events expire;
+    the last CONTEXT_EVENTS events and the segment lengths/time deltas
+    between them are kept in fixed-size deques, so nothing is rebuilt or
+    re-measured when a new event arrives.
     """
     
-    def __init__(self):
-        super().__init__()
-        self.movement_history: List[MouseEvent] = []
-        self.baseline_patterns: List[MicrovibrationVector] = []
-        # Correlation threshold for authentication
-        self.authentication_threshold = 0.75
-        self.collection_window = 10.0  # Seconds of data to analyze
-        self.is_learning = True
-        self.signature_established = False
-        
-    def process_mouse_event(self, x: float, y: float, 
-                          event_type: str = 'move') -> Optional[MicrovibrationVector]:
-        """
-        Process a single mouse event and convert to microvibration vector.
-        Called passively during natural gameplay interaction.
-        """
-        current_time = time.time()
-        
-        # Calculate velocity and acceleration if we have previous events
+    def __init__(self, collection_window: float = 10.0):
+        self.collection_window = collection_window
+        self.movement_history: Deque[MouseEvent] = deque()
+        self.recent_events: Deque[MouseEvent] = deque(maxlen=CONTEXT_EVENTS)
+        self.segment_distances: Deque[float] = deque(maxlen=CONTEXT_EVENTS - 1)
+        self.time_deltas: Deque[float] = deque(maxlen=CONTEXT_EVENTS - 1)
+    
+    def push(self, timestamp: float, x: float, y: float,
+             event_type: str = 'move') -> Optional[MicrovibrationVector]:
+        """Add one event; returns its microvibration vector once the window holds enough context"""
         velocity = 0.0
         acceleration = 0.0
+        distance = 0.0
         
-        if len(self.movement_history) >= 1:
+        if self.movement_history:
             prev_event = self.movement_history[-1]
-            time_delta = current_time - prev_event.timestamp
+            time_delta = timestamp - prev_event.timestamp
+            distance = math.sqrt((x - prev_event.x)**2 + (y - prev_event.y)**2)
             if time_delta > 0:
-                distance = math.sqrt((x - prev_event.x)**2 + (y - prev_event.y)**2)
                 velocity = distance / time_delta
                 
                 if len(self.movement_history) >= 2:
-                    velocity_change = velocity - prev_event.velocity
-                    acceleration = velocity_change / time_delta
+                    acceleration = (velocity - prev_event.velocity) / time_delta
         
-        # Create mouse event
         event = MouseEvent(
-            timestamp=current_time,
+            timestamp=timestamp,
             x=x, y=y,
             event_type=event_type,
             velocity=velocity,
             acceleration=acceleration
         )
         
+        if self.recent_events:
+            self.segment_distances.append(distance)
+            self.time_deltas.append(timestamp - self.recent_events[-1].timestamp)
+        self.recent_events.append(event)
         self.movement_history.append(event)
         
         # Trim history to collection window
-        cutoff_time = current_time - self.collection_window
-        self.movement_history = [e for e in self.movement_history if e.timestamp > cutoff_time]
+        cutoff_time = timestamp - self.collection_window
+        while self.movement_history[0].timestamp <= cutoff_time:
+            self.movement_history.popleft()
+        
+        if len(self.movement_history) >= CONTEXT_EVENTS:
+            return self._current_vector()
         
-        # Generate microvibration vector if we have enough data
-        if len(self.movement_history) >= 5:
-            return self._generate_microvibration_vector(event)
-            
         return None
     
-    def _generate_microvibration_vector(self, current_event: MouseEvent) -> MicrovibrationVector:
-        """Generate triadic vector from current movement context"""
-        recent_events = self.movement_history[-5:]  # Last 5 events for context
-        
-        # Temporal component: movement frequency and timing patterns
-        time_deltas = []
-        for i in range(1, len(recent_events)):
-            time_deltas.append(recent_events[i].timestamp - recent_events[i-1].timestamp)
-        
-        temporal = statistics.mean(time_deltas) if time_deltas else 0.0
-        
-        # Radial component: deviation from smooth movement (tremor/jitter analysis)
-        if len(recent_events) >= 3:
-            # Calculate expected position based on linear interpolation
-            start = recent_events[0]
-            end = recent_events[-1]
-            progress = (current_event.timestamp - start.timestamp) / (end.timestamp - start.timestamp)
-            
-            expected_x = start.x + (end.x - start.x) * progress
-            expected_y = start.y + (end.y - start.y) * progress
-            
-            radial = math.sqrt((current_event.x - expected_x)**2 + (current_event.y - expected_y)**2)
-        else:
-            radial = 0.0
-        
-        # Spatial component: overall movement magnitude and direction
-        if len(recent_events) >= 2:
-            total_distance = 0.0
-            for i in range(1, len(recent_events)):
-                prev = recent_events[i-1]
-                curr = recent_events[i]
-                total_distance += math.sqrt((curr.x - prev.x)**2 + (curr.y - prev.y)**2)
-            spatial = total_distance
-        else:
-            spatial = 0.0
+    def _current_vector(self) -> MicrovibrationVector:
+        """Triadic vector over the last CONTEXT_EVENTS events"""
+        start = self.recent_events[0]
+        end = self.recent_events[-1]
+        
+        # Temporal component: mean time between events
+        temporal = sum(self.time_deltas) / len(self.time_deltas)
+        
+        # Radial component: mean distance of the interior context events from
+        # where a linear, constant-speed start→end movement would put them
+        span = end.timestamp - start.timestamp
+        radial = 0.0
+        if span > 0:
+            interior = list(self.recent_events)[1:-1]
+            for event in interior:
+                progress = (event.timestamp - start.timestamp) / span
+                expected_x = start.x + (end.x - start.x) * progress
+                expected_y = start.y + (end.y - start.y) * progress
+                radial += math.sqrt((event.x - expected_x)**2 + (event.y - expected_y)**2)
+            radial /= len(interior)
+        
+        # Spatial component: path length over the context events
+        spatial = sum(self.segment_distances)
         
         return MicrovibrationVector(temporal=temporal, radial=radial, spatial=spatial)
+
+def extract_feature_matrix(timestamps, xs, ys, collection_window: float = 10.0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Batch mode: features for a whole recorded trace in NumPy
+    
+    Returns an N×5 matrix (columns FEATURE_COLUMNS) and a mask of the rows
+    where MicrovibrationFeatureStream.push would have returned a vector.
+    Timestamps must be non-decreasing.
+    """
+    timestamps = np.asarray(timestamps, dtype=np.float64)
+    xs = np.asarray(xs, dtype=np.float64)
+    ys = np.asarray(ys, dtype=np.float64)
+    count = len(timestamps)
+    features = np.zeros((count, len(FEATURE_COLUMNS)), dtype=np.float64)
+    if count == 0:
+        return features, np.zeros(0, dtype=bool)
+    
+    # Events inside each event's collection window (including itself)
+    window_starts = np.searchsorted(timestamps, timestamps - collection_window, side='right')
+    window_counts = np.arange(count) - window_starts + 1
+    ready = window_counts >= CONTEXT_EVENTS
+    
+    time_deltas = np.diff(timestamps)
+    distances = np.hypot(np.diff(xs), np.diff(ys))
+    
+    # Velocity / acceleration, as the stream computes them
+    moving = time_deltas > 0
+    velocity = np.zeros(count)
+    velocity[1:][moving] = distances[moving] / time_deltas[moving]
+    acceleration = np.zeros(count)
+    accelerating = moving & (window_counts[:-1] >= 2)
+    acceleration[1:][accelerating] = (velocity[1:] - velocity[:-1])[accelerating] / time_deltas[accelerating]
+    features[:, 3] = velocity
+    features[:, 4] = acceleration
+    
+    context = CONTEXT_EVENTS - 1
+    if count > context:
+        # Sliding sums over the last CONTEXT_EVENTS - 1 segments
+        window_deltas = np.lib.stride_tricks.sliding_window_view(time_deltas, context)
+        window_distances = np.lib.stride_tricks.sliding_window_view(distances, context)
+        features[context:, 0] = window_deltas.sum(axis=1) / context
+        features[context:, 2] = window_distances.sum(axis=1)
+        
+        # Radial: mean deviation of the interior events from the time-interpolated start→end line
+        window_times = np.lib.stride_tricks.sliding_window_view(timestamps, CONTEXT_EVENTS)
+        window_xs = np.lib.stride_tricks.sliding_window_view(xs, CONTEXT_EVENTS)
+        window_ys = np.lib.stride_tricks.sliding_window_view(ys, CONTEXT_EVENTS)
+        start_t, start_x, start_y = window_times[:, :1], window_xs[:, :1], window_ys[:, :1]
+        span = window_times[:, -1:] - start_t
+        progress = np.divide(window_times[:, 1:-1] - start_t, span,
+                             out=np.zeros((len(span), context - 1)), where=span > 0)
+        radial = np.hypot(window_xs[:, 1:-1] - (start_x + (window_xs[:, -1:] - start_x) * progress),
+                          window_ys[:, 1:-1] - (start_y + (window_ys[:, -1:] - start_y) * progress))
+        features[context:, 1] = np.where(span[:, 0] > 0, radial.mean(axis=1), 0.0)
+    
+    features[~ready, :3] = 0.0
+    return features, ready
+
+# Orthonormal basis of the plane orthogonal to (1, 1, 1): mean-centered
+# triadic vectors live in it, so each reduces to a single angle
+_PLANE_BASIS = np.array([
+    [1.0, -1.0, 0.0],
+    [1.0, 1.0, -2.0],
+]) / np.array([[math.sqrt(2.0)], [math.sqrt(6.0)]])
+
+def vectors_to_matrix(vectors: List[MicrovibrationVector]) -> np.ndarray:
+    """Stack microvibration vectors into an N×3 (temporal, radial, spatial) matrix"""
+    return np.array(
+        [(v.temporal, v.radial, v.spatial) for v in vectors], dtype=np.float64
+    ).reshape(-1, 3)
+
+def _plane_coordinates(matrix: np.ndarray) -> np.ndarray:
+    """Mean-centered rows projected onto the (1, 1, 1)-orthogonal plane"""
+    centered = matrix - matrix.mean(axis=1, keepdims=True)
+    return centered @ _PLANE_BASIS.T
+
+class MicrovibrationSignature:
+    """
+    Compiled baseline signature for vectorized authentication
+    
+    Pearson correlation of two triadic vectors is the cosine between the
+    mean-centered vectors, and those all lie in one plane. The baseline is
+    compiled to a sorted array of angles in that plane, so a test vector's
+    best correlation is the cosine to its nearest baseline angle: a binary
+    search instead of a pass over every baseline pattern. Zero-variance
+    vectors correlate 0.0 with everything, as in correlation_with.
+    """
+    
+    def __init__(self, baseline: np.ndarray):
+        baseline = np.asarray(baseline, dtype=np.float64).reshape(-1, 3)
+        coordinates = _plane_coordinates(baseline)
+        norms = np.hypot(coordinates[:, 0], coordinates[:, 1])
+        varying = norms > 0
+        
+        self.pattern_count = len(baseline)
+        self.has_flat_patterns = bool((~varying).any())
+        self.angles = np.unique(np.arctan2(coordinates[varying, 1], coordinates[varying, 0]))
+        
+        # Mean pairwise correlation from the resultant of the unit vectors:
+        # sum over pairs of u_i·u_j = (|sum u|² - count) / 2
+        units = coordinates[varying] / norms[varying, None]
+        pair_count = self.pattern_count * (self.pattern_count - 1) / 2
+        resultant = units.sum(axis=0)
+        self.mean_pairwise_correlation = (
+            float((resultant @ resultant - len(units)) / 2 / pair_count) if pair_count else 0.0
+        )
+    
+    @classmethod
+    def from_vectors(cls, vectors: List[MicrovibrationVector]) -> 'MicrovibrationSignature':
+        return cls(vectors_to_matrix(vectors))
+    
+    def best_correlations(self, test_matrix: np.ndarray) -> np.ndarray:
+        """Maximum correlation against the baseline for each row of an N×3 matrix"""
+        coordinates = _plane_coordinates(np.asarray(test_matrix, dtype=np.float64).reshape(-1, 3))
+        varying = np.hypot(coordinates[:, 0], coordinates[:, 1]) > 0
+        best = np.zeros(len(coordinates))
+        
+        if len(self.angles) and varying.any():
+            angles = np.arctan2(coordinates[varying, 1], coordinates[varying, 0])
+            
+            # Nearest baseline angle on either side, wrapping around the circle
+            upper = np.searchsorted(self.angles, angles) % len(self.angles)
+            lower = upper - 1
+            gap = np.minimum(
+                np.abs(np.angle(np.exp(1j * (angles - self.angles[upper])))),
+                np.abs(np.angle(np.exp(1j * (angles - self.angles[lower]))))
+            )
+            best[varying] = np.cos(gap)
+        
+        if self.has_flat_patterns:
+            # A zero-variance baseline pattern still scores 0.0
+            best = np.maximum(best, 0.0)
+        
+        return best
+
+class MicrovibrationAnalyzer(BaseModule):
+    """
+    Mathematical analysis engine for microvibration-based authentication.
+    Captures mouse movement patterns during natural gameplay and converts to
+    mathematical signatures using triadic vector correlation analysis.
+    """
+    
+    def __init__(self):
+        super().__init__()
+        self.feature_stream = MicrovibrationFeatureStream(collection_window=10.0)  # Seconds of data to analyze
+        self.baseline_patterns: List[MicrovibrationVector] = []
+        self.signature: Optional[MicrovibrationSignature] = None
+        # Correlation threshold for authentication
+        self.authentication_threshold = 0.75
+        self.is_learning = True
+        self.signature_established = False
+        
+    @property
+    def collection_window(self) -> float:
+        return self.feature_stream.collection_window
+    
+    @collection_window.setter
+    def collection_window(self, seconds: float):
+        self.feature_stream.collection_window = seconds
+    
+    @property
+    def movement_history(self) -> Deque[MouseEvent]:
+        return self.feature_stream.movement_history
+    
+    def process_mouse_event(self, x: float, y: float, 
+                          event_type: str = 'move') -> Optional[MicrovibrationVector]:
+        """
+        Process a single mouse event and convert to microvibration vector.
+        Called passively during natural gameplay interaction.
+        """
+        return self.feature_stream.push(time.time(), x, y, event_type)
+    
+    def extract_trace_features(self, events: List[MouseEvent]) -> List[MicrovibrationVector]:
+        """Batch mode: microvibration vectors for a recorded trace of mouse events"""
+        features, ready = extract_feature_matrix(
+            [event.timestamp for event in events],
+            [event.x for event in events],
+            [event.y for event in events],
+            self.collection_window
+        )
+        return [
+            MicrovibrationVector(temporal=temporal, radial=radial, spatial=spatial)
+            for temporal, radial, spatial in features[ready, :3].tolist()
+        ]
     
     def update_baseline_patterns(self, vector: MicrovibrationVector):
         """Update baseline patterns during learning phase"""
@@ -174,8 +351,20 @@ class MicrovibrationAnalyzer(BaseModule):
         if len(self.baseline_patterns) >= 50 and not self.signature_established:
             self.signature_established = True
             self.is_learning = False
+            self.compile_signature()
             self.log_info(f"Microvibration signature established with {len(self.baseline_patterns)} patterns")
     
+    def compile_signature(self) -> MicrovibrationSignature:
+        """Compile the baseline patterns into a signature model for scoring"""
+        self.signature = MicrovibrationSignature.from_vectors(self.baseline_patterns)
+        return self.signature
+    
+    def _current_signature(self) -> MicrovibrationSignature:
+        """Compiled signature, recompiled if the baseline changed since"""
+        if self.signature is None or self.signature.pattern_count != len(self.baseline_patterns):
+            return self.compile_signature()
+        return self.signature
+    
     def authenticate_user(self, test_vectors: List[MicrovibrationVector]) -> Tuple[bool, float]:
         """
         Authenticate user based on microvibration pattern correlation.
@@ -187,24 +376,11 @@ class MicrovibrationAnalyzer(BaseModule):
         if len(test_vectors) < 10:
             return False, 0.0  # Need minimum sample size
         
-        # Calculate correlation scores against baseline patterns
-        correlation_scores = []
-        
-        for test_vector in test_vectors:
-            vector_correlations = []
-            for baseline_vector in self.baseline_patterns:
-                correlation = test_vector.correlation_with(baseline_vector)
-                vector_correlations.append(correlation)
-            
-            # Use maximum correlation (best match)
-            if vector_correlations:
-                correlation_scores.append(max(vector_correlations))
-        
-        if not correlation_scores:
-            return False, 0.0
+        # Best correlation of each test vector against the baseline
+        correlation_scores = self._current_signature().best_correlations(vectors_to_matrix(test_vectors))
         
         # Calculate overall authentication confidence
-        mean_correlation = statistics.mean(correlation_scores)
+        mean_correlation = float(correlation_scores.mean())
         confidence = abs(mean_correlation)  # Both positive and negative correlations are signatures
         
         is_authenticated = confidence >= self.authentication_threshold
@@ -213,23 +389,45 @@ class MicrovibrationAnalyzer(BaseModule):
         
         return is_authenticated, confidence
     
+    def authenticate_sessions(self, sessions: Dict[str, List[MicrovibrationVector]]) -> Dict[str, Tuple[bool, float]]:
+        """
+        Authenticate many sessions with a single scoring call.
+        Returns {session_id: (is_authenticated, confidence_score)}
+        """
+        results = {session_id: (False, 0.0) for session_id in sessions}
+        if not self.signature_established or len(self.baseline_patterns) == 0:
+            return results
+        
+        # Sessions below the minimum sample size are not scored
+        scored = [(session_id, vectors) for session_id, vectors in sessions.items() if len(vectors) >= 10]
+        if not scored:
+            return results
+        
+        correlation_scores = self._current_signature().best_correlations(
+            vectors_to_matrix([vector for _, vectors in scored for vector in vectors])
+        )
+        session_index = np.repeat(np.arange(len(scored)), [len(vectors) for _, vectors in scored])
+        mean_correlations = (
+            np.bincount(session_index, weights=correlation_scores, minlength=len(scored))
+            / np.bincount(session_index, minlength=len(scored))
+        )
+        
+        for (session_id, _), mean_correlation in zip(scored, mean_correlations.tolist()):
+            confidence = abs(mean_correlation)
+            results[session_id] = (confidence >= self.authentication_threshold, confidence)
+        
+        authenticated = sum(1 for is_authenticated, _ in results.values() if is_authenticated)
+        self.log_info(f"Session authentication: {len(scored)} scored, {authenticated} authenticated")
+        
+        return results
+    
     def get_signature_strength(self) -> float:
         """Calculate the mathematical strength of the established signature"""
         if not self.signature_established or len(self.baseline_patterns) < 2:
             return 0.0
         
-        # Calculate internal consistency of baseline patterns
-        correlations = []
-        for i in range(len(self.baseline_patterns)):
-            for j in range(i + 1, len(self.baseline_patterns)):
-                correlation = self.baseline_patterns[i].correlation_with(self.baseline_patterns[j])
-                correlations.append(correlation)
-        
-        if not correlations:
-            return 0.0
-        
         # Signature strength is the consistency of internal correlations
-        return abs(statistics.mean(correlations))
+        return abs(self._current_signature().mean_pairwise_correlation)
     
     def export_signature_data(self) -> Dict:
         """Export signature data for Queen Bee validation system"""
@@ -107,7 +107,7 @@ def demo_socratic_inquiry_engine():
     for memory in learning_memories:
         wms.store_memory(memory['id'], memory['content'], memory['type'])
         # Set high consolidation score to ensure transfer to LDM
-        wms.active_memories[memory['id']]['consolidation_score'] = 0.9
+        wms.set_consolidation_score(memory['id'], 0.9)
     
     # Force consolidation
     wms.last_decay_cycle = datetime.now() - timedelta(seconds=wms.decay_interval + 1)
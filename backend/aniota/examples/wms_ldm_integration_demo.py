@@ -118,7 +118,7 @@ def demo_wms_ldm_integration():
     
     for memory_id in ['memory_001', 'memory_002', 'memory_003']:
         # Simulate high consolidation scores
-        wms.active_memories[memory_id]['consolidation_score'] = 0.9
+        wms.set_consolidation_score(memory_id, 0.9)
         print(f"✓ Set high consolidation score for {memory_id}")
     
     print()
@@ -132,6 +132,9 @@ def demo_wms_ldm_integration():
     decay_stats = wms.process_decay_cycle()
     print(f"Decay cycle results: {decay_stats}")
     
+    # Consolidation runs on a background worker; wait for it before reading LDM
+    wms.flush_consolidation()
+    
     # Check LDM status
     ldm_stats = ldm.get_memory_statistics()
     print(f"LDM Status: {ldm_stats['active_memories']} active memories")
@@ -193,13 +196,12 @@ def demo_wms_ldm_integration():
     # Demonstrate fade cycle
     print("\n10. Demonstrating LDM fade cycle...")
     
-    # Simulate time passage by manually adjusting timestamps
+    # Simulate time passage: strength decays from each memory's anchor time,
+    # so run the fade cycle as of 48 hours from now
     print("Simulating time passage...")
-    for memory_id, memory in ldm.long_term_memories.items():
-        # Move last access time back by 48 hours
-        memory['last_access_time'] = datetime.now() - timedelta(hours=48)
+    simulated_now = time.time() + 48 * 3600
     
-    fade_stats = ldm.process_fade_cycle()
+    fade_stats = ldm.process_fade_cycle(now=simulated_now)
     print(f"Fade cycle results: {fade_stats}")
     
     final_ldm_stats = ldm.get_memory_statistics()
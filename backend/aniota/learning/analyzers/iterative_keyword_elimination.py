@@ -27,7 +27,7 @@ sys.path.append(os.path.dirname(__file__))
 
 try:
     from truth_engine import TruthEngine
-    from hard_coded_knowledge import HardCodedKnowledgeBase
+    from hard_coded_knowledge import load_knowledge_base
 except ImportError as e:
     print(f"Import error: {e}")
     sys.exit(1)
@@ -36,7 +36,7 @@ class IterativeKeywordAnalyzer:
     """Analyzes statements by iteratively removing least correlated keywords."""
     
     def __init__(self):
-        self.knowledge = HardCodedKnowledgeBase()
+        self.knowledge = load_knowledge_base()
         self.engine = TruthEngine(self.knowledge)
         
     def extract_all_words(self, statement: str) -> List[str]:
@@ -0,0 +1,349 @@
+"""
+
+import sys
+import os
+
+try:
+    from dev_log import log_file_traversal, log_file_dependency
+except ImportError:
+    def log_file_traversal(*args, **kwargs): pass
+    def log_file_dependency(*args, **kwargs): pass
+
+log_file_traversal("truth_batch_engine.py", "system_initialization", "import", "Auto-generated dev log entry")
+
+🧮 TRUTH BATCH ENGINE - Vectorized Keyword Correlation 🧮
+
+Scores large sets of statements against the knowledge base in one pass:
+1. Build a concept×keyword matrix once (CSC postings over the keyword vocabulary)
+2. Build a sparse statement×keyword matrix per chunk of statements
+3. Compute every statement/concept overlap as a sparse matrix product in NumPy
+4. Apply the TruthEngine overlap/coverage formula and ranking to the whole chunk
+5. Reduce each statement's correlations to what calculate_truth_score reads
+   (count, top scores, keyword coverage, subject counts, contradiction
+   candidates) before anything is turned back into Python objects
+
+DESIGN PRINCIPLE: Same truth_score/truth_level as TruthEngine.verify_statement,
+only the correlation step is batched.
+"""
+
+from typing import Dict, List, Any, Set
+import numpy as np
+
+class BatchTruthEngine:
+    """
+    🧮 Batch scorer built on top of a TruthEngine's correlation index
+
+    Intended for nightly re-scoring of stored learner responses, where
+    per-statement Python loops over the knowledge base dominate.
+    """
+
+    def __init__(self, truth_engine, chunk_size: int = 4096):
+        self.truth_engine = truth_engine
+        self.chunk_size = chunk_size
+        self.subject_codes: Dict[Any, int] = {}
+        self.subject_names: List[Any] = []
+        self._build_concept_matrix()
+
+    def _build_concept_matrix(self):
+        """Build the concept×keyword matrix in CSC form (keyword → concept rows) and per-concept arrays"""
+        engine = self.truth_engine
+        self.snapshot = engine.snapshot_index
+        if self.snapshot is not None:
+            self._load_snapshot_matrix()
+            return
+
+        # Row index follows knowledge base order so it doubles as the tie-breaker
+        self.concept_ids = sorted(engine.concept_keywords, key=engine.concept_order.get)
+        concept_rows = {concept_id: row for row, concept_id in enumerate(self.concept_ids)}
+
+        self.vocabulary: Dict[str, int] = {}
+        column_pointers = [0]
+        row_indices = []
+        for column, (keyword, concept_ids) in enumerate(engine.keyword_postings.items()):
+            self.vocabulary[keyword] = column
+            row_indices.extend(sorted(concept_rows[concept_id] for concept_id in concept_ids))
+            column_pointers.append(len(row_indices))
+
+        self.keywords = list(self.vocabulary)
+        self.column_pointers = np.asarray(column_pointers, dtype=np.int64)
+        self.row_indices = np.asarray(row_indices, dtype=np.int64)
+        self.concept_sizes = np.asarray(
+            [engine.concept_keyword_sizes[concept_id] for concept_id in self.concept_ids],
+            dtype=np.float64
+        )
+
+        knowledge = engine.knowledge_base.knowledge_base
+        self.concept_subjects = np.empty(len(self.concept_ids), dtype=np.int64)
+        self.concept_may_contradict = np.empty(len(self.concept_ids), dtype=bool)
+        for row, concept_id in enumerate(self.concept_ids):
+            self._describe_concept(row, concept_id, knowledge[concept_id])
+
+    def _load_snapshot_matrix(self):
+        """
+        Use a knowledge snapshot's term index as the matrix (rows are record numbers)
+
+        The CSR arrays are zero-copy views of the mapped file. Per-concept
+        sizes, subjects and contradiction flags are filled in as concepts are
+        first hit (concept_sizes == 0 marks a record not described yet).
+        """
+        snapshot = self.snapshot
+        self.concept_ids = None
+        self.vocabulary = None
+        self.keywords = None
+        self.column_pointers = np.frombuffer(snapshot._term_indptr, dtype=np.uint32)
+        self.row_indices = np.frombuffer(snapshot._term_postings, dtype=np.uint32)
+        self.concept_sizes = np.zeros(snapshot.concept_count, dtype=np.float64)
+        self.concept_subjects = np.zeros(snapshot.concept_count, dtype=np.int64)
+        self.concept_may_contradict = np.zeros(snapshot.concept_count, dtype=bool)
+
+    def _describe_concept(self, row: int, concept_id: str, concept_data: Dict[str, Any]):
+        """Record a concept's subject code and whether it can trigger a contradiction penalty"""
+        engine = self.truth_engine
+        subject = concept_data.get('subject', 'unknown')
+        code = self.subject_codes.get(subject)
+        if code is None:
+            code = self.subject_codes[subject] = len(self.subject_names)
+            self.subject_names.append(subject)
+        self.concept_subjects[row] = code
+        self.concept_may_contradict[row] = engine.may_contradict(
+            concept_id, concept_data, engine.concept_definition_words[concept_id]
+        )
+
+    def _describe_snapshot_concepts(self, record_numbers: np.ndarray):
+        """Decode the hit snapshot records that have not been described yet"""
+        engine = self.truth_engine
+        for record_number in record_numbers[self.concept_sizes[record_numbers] == 0].tolist():
+            concept_id, concept_data, concept_keywords = engine.snapshot_concept(record_number)
+            self.concept_sizes[record_number] = len(concept_keywords)
+            self._describe_concept(record_number, concept_id, concept_data)
+
+    def _concept(self, row: int):
+        """(concept_id, concept_data) of a matrix row"""
+        if self.snapshot is not None:
+            concept_id, concept_data, _ = self.truth_engine.snapshot_concept(row)
+            return concept_id, concept_data
+        concept_id = self.concept_ids[row]
+        return concept_id, self.truth_engine.knowledge_base.knowledge_base[concept_id]
+
+    def _keyword_column(self, keyword: str):
+        """Matrix column of a keyword, or None when no concept has it"""
+        if self.snapshot is not None:
+            column = self.snapshot.find_term(keyword)
+            return column if column >= 0 else None
+        return self.vocabulary.get(keyword)
+
+    def verify_statements(self, statements: List[str]) -> List[Dict[str, Any]]:
+        """Verify statements chunk by chunk; output matches batch_verify_statements"""
+        results = []
+
+        for start in range(0, len(statements), self.chunk_size):
+            chunk = statements[start:start + self.chunk_size]
+            results.extend(self._verify_chunk(chunk))
+
+        return results
+
+    def _verify_chunk(self, statements: List[str]) -> List[Dict[str, Any]]:
+        """Score one chunk of statements"""
+        engine = self.truth_engine
+        feature_sets = [engine.featurize_statement(statement) for statement in statements]
+        summaries = self.summarize([features.keywords for features in feature_sets])
+
+        results = []
+        for statement, features, summary in zip(statements, feature_sets, summaries):
+            truth_score = engine.calculate_truth_score(
+                features.keywords, None, statement, features=features, summary=summary
+            )
+            truth_level, _ = engine.classify_truth_score(truth_score)
+            results.append({
+                'statement': statement,
+                'truth_score': truth_score,
+                'truth_level': truth_level
+            })
+
+        return results
+
+    def _match_pairs(self, keyword_sets: List[Set[str]]):
+        """
+        Sparse product of the statement×keyword and keyword×concept matrices
+
+        Returns None when nothing matches, otherwise a dict of NumPy arrays:
+        the matching (statement, keyword column, concept) pairs, the
+        statement's keyword entries, the keyword names by column, and one
+        row per (statement, concept) with its overlap and score, ranked by
+        statement, score descending, then knowledge base order.
+        """
+        # Statement×keyword matrix in COO form, restricted to the known vocabulary
+        statement_rows = []
+        keyword_columns = []
+        keyword_names = {}
+        for row, keywords in enumerate(keyword_sets):
+            for keyword in keywords:
+                column = self._keyword_column(keyword)
+                if column is not None:
+                    statement_rows.append(row)
+                    keyword_columns.append(column)
+                    keyword_names[column] = keyword
+
+        if not statement_rows:
+            return None
+
+        statement_rows = np.asarray(statement_rows, dtype=np.int64)
+        keyword_columns = np.asarray(keyword_columns, dtype=np.int64)
+        query_sizes = np.asarray([len(keywords) for keywords in keyword_sets], dtype=np.float64)
+
+        # Expand each (statement, keyword) entry along the keyword's concept postings
+        starts = self.column_pointers[keyword_columns].astype(np.int64)
+        lengths = self.column_pointers[keyword_columns + 1].astype(np.int64) - starts
+        total = int(lengths.sum())
+        offsets = np.arange(total, dtype=np.int64) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        pair_concepts = self.row_indices[np.repeat(starts, lengths) + offsets].astype(np.int64)
+        pair_statements = np.repeat(statement_rows, lengths)
+        pair_keywords = np.repeat(keyword_columns, lengths)
+
+        if self.snapshot is not None:
+            self._describe_snapshot_concepts(np.unique(pair_concepts))
+            keep = self._snapshot_true_matches(pair_keywords, pair_concepts, keyword_names)
+            if keep is not None:
+                pair_statements, pair_keywords, pair_concepts = (
+                    pair_statements[keep], pair_keywords[keep], pair_concepts[keep]
+                )
+                if not len(pair_concepts):
+                    return None
+
+        # Overlap = number of shared keywords per (statement, concept)
+        concept_count = len(self.concept_sizes)
+        pair_keys = pair_statements * concept_count + pair_concepts
+        unique_keys, overlaps = np.unique(pair_keys, return_counts=True)
+        statements_idx = unique_keys // concept_count
+        concepts_idx = unique_keys % concept_count
+
+        # Same overlap/coverage weighting as TruthEngine._overlap_correlation
+        scores = (overlaps / query_sizes[statements_idx]) * 0.7 + (overlaps / self.concept_sizes[concepts_idx]) * 0.3
+
+        # Rank within each statement: score descending, then knowledge base order
+        ranking = np.lexsort((concepts_idx, -scores, statements_idx))
+
+        return {
+            'pair_statements': pair_statements,
+            'pair_keywords': pair_keywords,
+            'pair_keys': pair_keys,
+            'keyword_names': keyword_names,
+            'statements': statements_idx[ranking],
+            'concepts': concepts_idx[ranking],
+            'keys': unique_keys[ranking],
+            'scores': scores[ranking]
+        }
+
+    def _snapshot_true_matches(self, pair_keywords: np.ndarray, pair_concepts: np.ndarray,
+                               keyword_names: Dict[int, str]):
+        """
+        Mask of the snapshot term hits that are correlation keyword matches
+
+        Snapshot terms differ from correlation keywords only by the short or
+        connective definition words, which statement keywords never are; only
+        pairs for such keywords (passed in by correlate callers) are checked
+        one by one. Returns None when every pair is a true match.
+        """
+        engine = self.truth_engine
+        unchecked = [
+            column for column, keyword in keyword_names.items()
+            if keyword in engine.connective_words or len(keyword) <= 2
+        ]
+        if not unchecked:
+            return None
+
+        keep = np.ones(len(pair_concepts), dtype=bool)
+        for index in np.flatnonzero(np.isin(pair_keywords, unchecked)).tolist():
+            _, _, concept_keywords = engine.snapshot_concept(int(pair_concepts[index]))
+            keep[index] = keyword_names[int(pair_keywords[index])] in concept_keywords
+        return keep
+
+    def summarize(self, keyword_sets: List[Set[str]]) -> List['CorrelationSummary']:
+        """
+        📊 CorrelationSummary per keyword set, reduced in NumPy
+
+        Equivalent to CorrelationSummary.from_correlations over the
+        find_correlating_facts result, without building the per-concept
+        correlation dicts: only the contradiction candidates are materialized.
+        """
+        # truth_engine imports this module, so its dataclass is resolved at call time
+        from truth_engine import CorrelationSummary
+
+        count = len(keyword_sets)
+        matches = self._match_pairs(keyword_sets)
+        if matches is None:
+            return [CorrelationSummary(0, [], 0, {}, []) for _ in keyword_sets]
+
+        statements_idx = matches['statements']
+        concepts_idx = matches['concepts']
+        correlation_counts = np.bincount(statements_idx, minlength=count)
+        first_ranked = np.concatenate(([0], np.cumsum(correlation_counts)[:-1]))
+
+        # Distinct matched keywords per statement
+        covered_entries = np.unique(matches['pair_statements'] * (matches['pair_keywords'].max() + 1)
+                                    + matches['pair_keywords'])
+        covered_counts = np.bincount(covered_entries // (matches['pair_keywords'].max() + 1), minlength=count)
+
+        # Correlations per (statement, subject)
+        subject_total = max(len(self.subject_names), 1)
+        subject_keys, subject_counts = np.unique(
+            statements_idx * subject_total + self.concept_subjects[concepts_idx], return_counts=True
+        )
+        subject_lists = [{} for _ in keyword_sets]
+        for key, subject_count in zip(subject_keys.tolist(), subject_counts.tolist()):
+            statement, code = divmod(key, subject_total)
+            subject_lists[statement][self.subject_names[code]] = subject_count
+
+        # Only concepts that can add a contradiction penalty become correlation dicts
+        candidate_lists = [[] for _ in keyword_sets]
+        for position in np.flatnonzero(self.concept_may_contradict[concepts_idx]).tolist():
+            concept_id, concept_data = self._concept(int(concepts_idx[position]))
+            candidate_lists[statements_idx[position]].append({
+                'concept_id': concept_id,
+                'concept_data': concept_data
+            })
+
+        scores = matches['scores'].tolist()
+        summaries = []
+        for statement, (correlation_count, first) in enumerate(zip(correlation_counts.tolist(), first_ranked.tolist())):
+            summaries.append(CorrelationSummary(
+                count=correlation_count,
+                top_scores=scores[first:first + min(correlation_count, 3)],
+                covered_keyword_count=int(covered_counts[statement]),
+                subject_counts=subject_lists[statement],
+                contradiction_candidates=candidate_lists[statement]
+            ))
+        return summaries
+
+    def correlate(self, keyword_sets: List[Set[str]]) -> List[List[Dict[str, Any]]]:
+        """
+        📊 Vectorized find_correlating_facts for a list of keyword sets
+
+        Returns one ranked correlation list per keyword set, in the same
+        format and order as TruthEngine.find_correlating_facts.
+        """
+        correlation_lists = [[] for _ in keyword_sets]
+        matches = self._match_pairs(keyword_sets)
+        if matches is None:
+            return correlation_lists
+
+        # Matching keyword names grouped by (statement, concept) key
+        pair_order = np.argsort(matches['pair_keys'], kind='stable')
+        group_keys, group_starts = np.unique(matches['pair_keys'][pair_order], return_index=True)
+        group_ends = np.append(group_starts[1:], len(pair_order)).tolist()
+        group_starts = group_starts.tolist()
+        keyword_names = matches['keyword_names']
+        pair_names = [keyword_names[column] for column in matches['pair_keywords'][pair_order].tolist()]
+        groups = np.searchsorted(group_keys, matches['keys']).tolist()
+
+        for statement, row, group, score in zip(matches['statements'].tolist(), matches['concepts'].tolist(),
+                                                groups, matches['scores'].tolist()):
+            concept_id, concept_data = self._concept(row)
+            correlation_lists[statement].append({
+                'concept_id': concept_id,
+                'concept_data': concept_data,
+                'correlation_score': score,
+                'matching_keywords': pair_names[group_starts[group]:group_ends[group]]
+            })
+
+        return correlation_lists
@@ -25,10 +25,81 @@ Simple and elegant truth verification system:
 DESIGN PRINCIPLE: Elegantly simple - more matches = higher truth probability
 """
 
-from typing import Dict, List, Any, Set, Tuple
+from typing import Dict, List, Any, Set, Tuple, Optional, Callable, Iterator
+import os
 import re
+import time
+import copy
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from functools import partial
+from dataclasses import dataclass, asdict
 from datetime import datetime
-from hard_coded_knowledge import HardCodedKnowledgeBase
+from hard_coded_knowledge import HardCodedKnowledgeBase, ReadWriteLock
+from truth_batch_engine import BatchTruthEngine
+
+# Word runs as matched by r'\b\w+\b' on the whole statement
+WORD_PATTERN = re.compile(r'\w+')
+
+@dataclass
+class StatementFeatures:
+    """Everything the truth scorers read from a statement, from one tokenization pass."""
+    tokens: List[str]                       # lowercased whitespace tokens (punctuation kept)
+    words: Set[str]                         # all word runs in the statement
+    keywords: Set[str]                      # factual keywords (see extract_factual_keywords)
+    token_positions: Dict[str, List[int]]   # punctuation-stripped token → token positions
+    connective_count: int = 0
+    has_articles: bool = False
+    has_verbs: bool = False
+    
+    def keyword_positions(self, keywords: Set[str]) -> Dict[str, List[int]]:
+        """Positions of the given keywords among the statement tokens"""
+        return {keyword: self.token_positions[keyword] for keyword in keywords if keyword in self.token_positions}
+
+@dataclass
+class VerificationTrace:
+    """Score breakdown recorded for a single statement verification."""
+    keyword_count: int = 0
+    correlations_found: int = 0
+    base_score: float = 0.0
+    proximity_score: float = 0.0
+    proximity_boost: float = 0.0
+    subject_consistency: float = 0.0
+    subject_boost: float = 0.0
+    correlation_boost: float = 0.0
+    coverage_boost: float = 0.0
+    contradiction_penalty: float = 0.0
+    unnatural_keyword_list: bool = False
+    unnatural_penalty: float = 0.0
+    final_score: float = 0.0
+    truth_score: int = 0
+
+@dataclass
+class CorrelationSummary:
+    """Everything calculate_truth_score reads from a ranked correlation list."""
+    count: int                                   # correlating concepts
+    top_scores: List[float]                      # correlation scores of the best three
+    covered_keyword_count: int                   # distinct statement keywords matched by any concept
+    subject_counts: Dict[str, int]               # correlating concepts per subject, in ranking order
+    contradiction_candidates: List[Dict[str, Any]]  # correlations detect_contradictions may penalize
+    
+    @classmethod
+    def from_correlations(cls, correlations: List[Dict[str, Any]]) -> 'CorrelationSummary':
+        subject_counts: Dict[str, int] = {}
+        for correlation in correlations:
+            subject = correlation['concept_data'].get('subject', 'unknown')
+            subject_counts[subject] = subject_counts.get(subject, 0) + 1
+        
+        return cls(
+            count=len(correlations),
+            top_scores=[c['correlation_score'] for c in correlations[:3]],
+            covered_keyword_count=len(set().union(*[c['matching_keywords'] for c in correlations])),
+            subject_counts=subject_counts,
+            contradiction_candidates=correlations
+        )
 
 class TruthEngine:
     """
@@ -38,9 +109,14 @@ class TruthEngine:
     degree of truth from 0 to 100.
     """
     
-    def __init__(self, knowledge_base: HardCodedKnowledgeBase):
+    def __init__(self, knowledge_base: HardCodedKnowledgeBase, verbose: bool = True,
+                 cache_size: int = 1024, cache_ttl: float = 3600.0):
         self.knowledge_base = knowledge_base
         
+        # Console output of the verification pipeline; the score breakdown
+        # is always returned in the report's 'trace' regardless of this flag
+        self.verbose = verbose
+        
         # Connective words to remove (these don't carry factual content)
         self.connective_words = {
             'the', 'a', 'an', 'and', 'or', 'but', 'so', 'yet', 'for', 'nor',
@@ -55,38 +131,279 @@ class TruthEngine:
             'some', 'any', 'all', 'each', 'every', 'no', 'not', 'only', 'just'
         }
         
-        print("🔍 Truth Engine initialized")
-        print(f"   📚 Knowledge base: {len(self.knowledge_base.knowledge_base)} facts")
-        print(f"   🚫 Connective words filtered: {len(self.connective_words)}")
+        # Common contradictory word pairs with enhanced detection
+        self.contradiction_pairs = [
+            ('up', 'down'), ('upward', 'downward'), ('above', 'below'),
+            ('hot', 'cold'), ('big', 'small'), ('fast', 'slow'),
+            ('true', 'false'), ('correct', 'incorrect'), ('right', 'wrong'),
+            ('add', 'subtract'), ('multiply', 'divide'), ('increase', 'decrease'),
+            ('always', 'never'), ('all', 'none'), ('yes', 'no'),
+            ('action', 'person'), ('action', 'place'), ('action', 'thing'),
+            ('verb', 'noun'), ('movement', 'naming')
+        ]
+        
+        # LRU + TTL cache of verification reports (cache_size=0 disables it)
+        self.verification_cache: "OrderedDict[Tuple[str, int], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self.cache_lock = threading.Lock()
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self._cache_version = getattr(knowledge_base, 'version', 0)
+        self.cache_stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0, 'invalidations': 0}
+        
+        # Inverted keyword index over the knowledge base (see _build_correlation_index)
+        self.concept_keywords: Dict[str, frozenset] = {}
+        self.concept_keyword_sizes: Dict[str, int] = {}
+        self.concept_definition_words: Dict[str, frozenset] = {}
+        self.concept_order: Dict[str, int] = {}
+        self.keyword_postings: Dict[str, Set[str]] = {}
+        self._batch_engine = None
+        
+        # Snapshot-backed knowledge bases are correlated straight from the
+        # snapshot's term index instead (see _find_snapshot_correlations)
+        self.snapshot_index = None
+        self.snapshot_concepts: Dict[int, Tuple[str, Dict[str, Any], frozenset]] = {}
+        
+        # Shared with the knowledge base: its writers patch this index through
+        # _on_knowledge_change, so queries read the index under the same lock
+        self.index_lock = getattr(self.knowledge_base, 'update_lock', None) or ReadWriteLock()
+        
+        with self.index_lock.read():
+            self._build_correlation_index()
+            
+            # Keep the index in step with incremental knowledge base updates
+            if hasattr(self.knowledge_base, 'add_change_listener'):
+                self.knowledge_base.add_change_listener(self._on_knowledge_change)
+        
+        if self.verbose:
+            print("🔍 Truth Engine initialized")
+            print(f"   📚 Knowledge base: {len(self.knowledge_base.knowledge_base)} facts")
+            print(f"   🚫 Connective words filtered: {len(self.connective_words)}")
+            if self.snapshot_index is not None:
+                print(f"   🗂️ Correlation index: {self.snapshot_index.term_count} snapshot terms")
+            else:
+                print(f"   🗂️ Correlation index: {len(self.keyword_postings)} keywords")
+    
+    def _build_correlation_index(self):
+        """
+        🗂️ Build the inverted keyword index used by find_correlating_facts
+        
+        Caches each concept's keyword set and size once, and maps every
+        keyword to the concepts that contain it, so a query only scores
+        concepts sharing at least one keyword with it. A snapshot-backed
+        knowledge base already carries term postings, so nothing is built
+        or decoded up front for it.
+        """
+        self.snapshot_index = getattr(self.knowledge_base, 'snapshot', None)
+        self.snapshot_concepts = {}
+        self.concept_keywords = {}
+        self.concept_keyword_sizes = {}
+        self.concept_definition_words = {}
+        self.concept_order = {}
+        self.keyword_postings = {}
+        self._next_concept_order = 0
+        self._batch_engine = None  # Concept matrix is derived from this index
+        self.clear_verification_cache()
+        
+        if self.snapshot_index is not None:
+            return
+        
+        for concept_id, concept_data in self.knowledge_base.knowledge_base.items():
+            self._index_concept(concept_id, concept_data)
+    
+    def _index_concept(self, concept_id: str, concept_data: Dict[str, Any]):
+        """Add one concept to the correlation index"""
+        if concept_id not in self.concept_order:
+            self.concept_order[concept_id] = self._next_concept_order
+            self._next_concept_order += 1
+        
+        concept_keywords = frozenset(self._collect_concept_keywords(concept_data))
+        self.concept_keywords[concept_id] = concept_keywords
+        self.concept_keyword_sizes[concept_id] = len(concept_keywords)
+        
+        # Definition word set used by detect_contradictions
+        definition = concept_data.get('definition', '').lower()
+        self.concept_definition_words[concept_id] = frozenset(re.findall(r'\b\w+\b', definition))
+        
+        for keyword in concept_keywords:
+            if keyword not in self.keyword_postings:
+                self.keyword_postings[keyword] = set()
+            self.keyword_postings[keyword].add(concept_id)
+    
+    def _unindex_concept(self, concept_id: str):
+        """Remove one concept's postings and cached keyword data from the correlation index"""
+        for keyword in self.concept_keywords.pop(concept_id, ()):
+            concept_ids = self.keyword_postings.get(keyword)
+            if concept_ids is not None:
+                concept_ids.discard(concept_id)
+                if not concept_ids:
+                    del self.keyword_postings[keyword]
+        
+        self.concept_keyword_sizes.pop(concept_id, None)
+        self.concept_definition_words.pop(concept_id, None)
+    
+    def _on_knowledge_change(self, action: str, concept_id: str,
+                             old_data: Optional[Dict[str, Any]], new_data: Optional[Dict[str, Any]]):
+        """
+        🔄 Patch the correlation index for one changed concept
+        
+        Called by HardCodedKnowledgeBase after add/update/remove_concept,
+        with the write lock held; an updated concept keeps its position in
+        the ranking tie order.
+        """
+        if self.snapshot_index is not None:
+            # The first write copied the snapshot into dicts (change included)
+            self._build_correlation_index()
+            return
+        
+        if old_data is not None:
+            self._unindex_concept(concept_id)
+        if new_data is not None:
+            self._index_concept(concept_id, new_data)
+        else:
+            self.concept_order.pop(concept_id, None)
+        
+        # Concept matrix and cached reports no longer match the knowledge base
+        self._batch_engine = None
+        self.clear_verification_cache()
     
     def verify_statement(self, statement: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
         """
         🎯 Main truth verification function
         
-        Returns degree of truth from 0 to 100 based on keyword correlation
+        Returns degree of truth from 0 to 100 based on keyword correlation.
+        The report's 'trace' entry carries the full score breakdown.
+        Safe to call while another thread updates the knowledge base.
         """
-        print(f"\n🔍 TRUTH ENGINE VERIFICATION")
-        print(f"   📝 Statement: \"{statement}\"")
+        if self.verbose:
+            print(f"\n🔍 TRUTH ENGINE VERIFICATION")
+            print(f"   📝 Statement: \"{statement}\"")
         
-        # Step 1: Extract factual keywords
-        keywords = self.extract_factual_keywords(statement)
-        print(f"   🔑 Extracted keywords: {list(keywords)}")
+        # One consistent knowledge base version for the whole verification
+        with self.index_lock.read():
+            return self._verify_statement(statement, context)
+    
+    def _verify_statement(self, statement: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
+        """verify_statement body (caller holds the index read lock)"""
+        cache_key = self._verification_cache_key(statement)
+        cached_report = self._get_cached_verification(cache_key)
+        if cached_report is not None:
+            if self.verbose:
+                print(f"   ♻️ Cached truth score: {cached_report['truth_score']}/100")
+            return cached_report
+        
+        # Step 1: Tokenize once and extract factual keywords
+        features = self.featurize_statement(statement)
+        keywords = features.keywords
+        if self.verbose:
+            print(f"   🔑 Extracted keywords: {list(keywords)}")
         
         # Step 2: Find correlating facts
         correlations = self.find_correlating_facts(keywords)
-        print(f"   📊 Found correlations: {len(correlations)}")
+        if self.verbose:
+            print(f"   📊 Found correlations: {len(correlations)}")
         
         # Step 3: Calculate truth score
-        truth_score = self.calculate_truth_score(keywords, correlations, statement)
-        print(f"   🎯 Truth score: {truth_score}/100")
+        trace = VerificationTrace(keyword_count=len(keywords), correlations_found=len(correlations))
+        truth_score = self.calculate_truth_score(keywords, correlations, statement, trace, features)
+        if self.verbose:
+            print(f"   🎯 Truth score: {truth_score}/100")
         
         # Step 4: Generate verification report
         verification_report = self.generate_verification_report(
             statement, keywords, correlations, truth_score, context
         )
+        verification_report['trace'] = asdict(trace)
+        self._cache_verification(cache_key, verification_report)
         
         return verification_report
     
+    def _verification_cache_key(self, statement: str) -> Tuple[str, int]:
+        """
+        Cache key: the statement's lowercased word sequence plus the knowledge base version
+        
+        Every scorer works on the lowercased, whitespace-split statement, so
+        statements differing only in case or spacing share one entry.
+        """
+        normalized = ' '.join(statement.lower().split())
+        version = getattr(self.knowledge_base, 'version', 0)
+        
+        # Entries from an older knowledge base can never hit again, so drop them
+        with self.cache_lock:
+            if version != self._cache_version:
+                self._clear_cache_entries()
+                self._cache_version = version
+        
+        return normalized, version
+    
+    def _get_cached_verification(self, cache_key: Tuple[str, int]) -> Optional[Dict[str, Any]]:
+        """Get a cached verification report if present and not expired"""
+        if self.cache_size <= 0:
+            return None
+        
+        with self.cache_lock:
+            cached_item = self.verification_cache.get(cache_key)
+            if cached_item is None:
+                self.cache_stats['misses'] += 1
+                return None
+            
+            cached_at, report = cached_item
+            if time.monotonic() - cached_at > self.cache_ttl:
+                del self.verification_cache[cache_key]
+                self.cache_stats['expirations'] += 1
+                self.cache_stats['misses'] += 1
+                return None
+            
+            self.verification_cache.move_to_end(cache_key)
+            self.cache_stats['hits'] += 1
+        
+        # Deep copy so callers can't mutate the cached entry or its nested lists/trace
+        # (cached entries are never modified, so this needs no lock)
+        cached_report = copy.deepcopy(report)
+        cached_report['verification_timestamp'] = datetime.now().isoformat()
+        return cached_report
+    
+    def _cache_verification(self, cache_key: Tuple[str, int], report: Dict[str, Any]):
+        """Cache a verification report, evicting the least recently used entries"""
+        if self.cache_size <= 0:
+            return
+        
+        # Deep copy so the caller's report and the cached entry share nothing
+        cached_entry = (time.monotonic(), copy.deepcopy(report))
+        
+        with self.cache_lock:
+            self.verification_cache[cache_key] = cached_entry
+            self.verification_cache.move_to_end(cache_key)
+            
+            while len(self.verification_cache) > self.cache_size:
+                self.verification_cache.popitem(last=False)
+                self.cache_stats['evictions'] += 1
+    
+    def clear_verification_cache(self):
+        """Drop all cached verification reports (e.g. after the knowledge base changes)"""
+        with self.cache_lock:
+            self._clear_cache_entries()
+    
+    def _clear_cache_entries(self):
+        """Empty the verification cache (caller holds cache_lock)"""
+        if self.verification_cache:
+            self.cache_stats['invalidations'] += 1
+        self.verification_cache.clear()
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get hit/miss statistics for the verification cache"""
+        with self.cache_lock:
+            cache_stats = dict(self.cache_stats)
+            entries = len(self.verification_cache)
+        
+        lookups = cache_stats['hits'] + cache_stats['misses']
+        return {
+            **cache_stats,
+            'entries': entries,
+            'max_entries': self.cache_size,
+            'ttl_seconds': self.cache_ttl,
+            'hit_rate': cache_stats['hits'] / lookups if lookups else 0.0
+        }
+    
     def extract_factual_keywords(self, statement: str) -> Set[str]:
         """
         🔑 Extract keywords that carry factual content
@@ -106,33 +423,145 @@ class TruthEngine:
         
         return factual_keywords
     
+    def featurize_statement(self, statement: str) -> StatementFeatures:
+        """
+        🧩 Tokenize a statement once for every scorer
+        
+        Records tokens, word runs, factual keywords, token positions and
+        the connective/article/verb counts that proximity, contradiction
+        and unnatural-list scoring read.
+        """
+        tokens = statement.lower().split()
+        words = set()
+        keywords = set()
+        token_positions: Dict[str, List[int]] = {}
+        connective_count = 0
+        has_articles = False
+        has_verbs = False
+        
+        for position, token in enumerate(tokens):
+            parts = WORD_PATTERN.findall(token)
+            clean_token = ''.join(parts)  # Token with punctuation removed
+            token_positions.setdefault(clean_token, []).append(position)
+            
+            for word in parts:
+                words.add(word)
+                if word not in self.connective_words and len(word) > 2 and not word.isdigit():
+                    keywords.add(word)
+            
+            if token in self.connective_words:
+                connective_count += 1
+            if token in ('the', 'a', 'an'):
+                has_articles = True
+            if token in ('is', 'are', 'was', 'were', 'use', 'make', 'do', 'have'):
+                has_verbs = True
+
+        
+        return StatementFeatures(
+            tokens=tokens,
+            words=words,
+            keywords=keywords,
+            token_positions=token_positions,
+            connective_count=connective_count,
+            has_articles=has_articles,
+            has_verbs=has_verbs
+        )
+    
     def find_correlating_facts(self, keywords: Set[str]) -> List[Dict[str, Any]]:
         """
         📊 Find facts in knowledge base that correlate with keywords
         
-        Returns list of matching facts with correlation scores
+        Returns list of matching facts with correlation scores.
+        Candidates come from the inverted keyword index, so only concepts
+        sharing at least one keyword with the query are scored.
         """
+        if not keywords:
+            return []
+        
+        # Writers patch the index under the same lock, so candidates can't vanish mid-scoring
+        with self.index_lock.read():
+            if self.snapshot_index is not None:
+                return self._find_snapshot_correlations(keywords)
+            return self._find_indexed_correlations(keywords)
+    
+    def _find_indexed_correlations(self, keywords: Set[str]) -> List[Dict[str, Any]]:
+        """Score index candidates for find_correlating_facts (caller holds the read lock)"""
         correlations = []
         
-        for concept_id, concept_data in self.knowledge_base.knowledge_base.items():
-            correlation_score = self.calculate_keyword_correlation(keywords, concept_data)
+        candidate_ids = set()
+        for keyword in keywords:
+            candidate_ids.update(self.keyword_postings.get(keyword, ()))
+        
+        concepts = self.knowledge_base.knowledge_base
+        for concept_id in candidate_ids:
+            matches = keywords.intersection(self.concept_keywords[concept_id])
+            correlation_score = self._overlap_correlation(
+                len(matches), len(keywords), self.concept_keyword_sizes[concept_id]
+            )
             
-            if correlation_score > 0:
-                correlations.append({
-                    'concept_id': concept_id,
-                    'concept_data': concept_data,
-                    'correlation_score': correlation_score,
-                    'matching_keywords': self.find_matching_keywords(keywords, concept_data)
-                })
+            correlations.append({
+                'concept_id': concept_id,
+                'concept_data': concepts[concept_id],
+                'correlation_score': correlation_score,
+                'matching_keywords': list(matches)
+            })
         
-        # Sort by correlation score
-        correlations.sort(key=lambda x: x['correlation_score'], reverse=True)
+        # Sort by correlation score (ties keep knowledge base order)
+        correlations.sort(key=lambda x: (-x['correlation_score'], self.concept_order[x['concept_id']]))
         
         return correlations
     
-    def calculate_keyword_correlation(self, query_keywords: Set[str], concept_data: Dict[str, Any]) -> float:
-        """Calculate correlation between query keywords and concept data"""
-        # Collect all keywords from concept
+    def _find_snapshot_correlations(self, keywords: Set[str]) -> List[Dict[str, Any]]:
+        """
+        Score candidates from a knowledge snapshot's term index (caller holds the read lock)
+        
+        Snapshot terms are a superset of each concept's correlation keywords,
+        so the candidates match the dict index; only candidates are decoded.
+        """
+        candidate_records = set()
+        for keyword in keywords:
+            candidate_records.update(self.snapshot_index.term_records(keyword))
+        
+        scored = []
+        for record_number in sorted(candidate_records):
+            concept_id, concept_data, concept_keywords = self.snapshot_concept(record_number)
+            matches = keywords.intersection(concept_keywords)
+            if not matches:
+                continue
+            
+            scored.append({
+                'concept_id': concept_id,
+                'concept_data': concept_data,
+                'correlation_score': self._overlap_correlation(len(matches), len(keywords), len(concept_keywords)),
+                'matching_keywords': list(matches)
+            })
+        
+        # Candidates are in record (knowledge base) order, so a stable sort keeps ties in it
+        scored.sort(key=lambda x: -x['correlation_score'])
+        return scored
+    
+    def snapshot_concept(self, record_number: int) -> Tuple[str, Dict[str, Any], frozenset]:
+        """
+        (concept_id, concept_data, correlation keywords) of one snapshot record
+        
+        Decoded on first use and cached, so only concepts that queries
+        actually touch are ever turned into Python objects.
+        """
+        cached = self.snapshot_concepts.get(record_number)
+        if cached is None:
+            concept_id = self.snapshot_index.concept_id(record_number)
+            concept_data = self.snapshot_index.decode_concept(record_number)
+            
+            # Definition word set used by detect_contradictions
+            definition = concept_data.get('definition', '').lower()
+            self.concept_definition_words[concept_id] = frozenset(re.findall(r'\b\w+\b', definition))
+            
+            cached = (concept_id, concept_data, frozenset(self._collect_concept_keywords(concept_data)))
+            self.snapshot_concepts[record_number] = cached
+        return cached
+    
+    def _collect_concept_keywords(self, concept_data: Dict[str, Any]) -> Set[str]:
+        """Collect all keywords a concept is correlated on"""
         concept_keywords = set()
         
         # Add explicit keywords
@@ -150,20 +579,29 @@ class TruthEngine:
         concept_name = concept_data.get('concept_id', '').replace('_', ' ')
         concept_keywords.add(concept_name.lower())
         
+        return concept_keywords
+    
+    def _overlap_correlation(self, overlap: int, query_size: int, concept_size: int) -> float:
+        """Combine overlap and coverage into a single correlation value"""
+        # Score based on both overlap and coverage
+        overlap_score = overlap / query_size  # How much of query is covered
+        coverage_score = overlap / concept_size  # How well concept matches
+        
+        # Weighted average favoring overlap (more important that query is covered)
+        return (overlap_score * 0.7) + (coverage_score * 0.3)
+    
+    def calculate_keyword_correlation(self, query_keywords: Set[str], concept_data: Dict[str, Any]) -> float:
+        """Calculate correlation between query keywords and concept data"""
+        # Collect all keywords from concept
+        concept_keywords = self._collect_concept_keywords(concept_data)
+        
         # Calculate overlap
         if not concept_keywords or not query_keywords:
             return 0.0
         
         overlap = len(query_keywords.intersection(concept_keywords))
         
-        # Score based on both overlap and coverage
-        overlap_score = overlap / len(query_keywords)  # How much of query is covered
-        coverage_score = overlap / len(concept_keywords)  # How well concept matches
-        
-        # Weighted average favoring overlap (more important that query is covered)
-        correlation = (overlap_score * 0.7) + (coverage_score * 0.3)
-        
-        return correlation
+        return self._overlap_correlation(overlap, len(query_keywords), len(concept_keywords))
     
     def find_matching_keywords(self, query_keywords: Set[str], concept_data: Dict[str, Any]) -> List[str]:
         """Find which specific keywords match between query and concept"""
@@ -182,7 +620,10 @@ class TruthEngine:
         matches = query_keywords.intersection(concept_keywords)
         return list(matches)
     
-    def calculate_truth_score(self, keywords: Set[str], correlations: List[Dict[str, Any]], original_statement: str) -> int:
+    def calculate_truth_score(self, keywords: Set[str], correlations: List[Dict[str, Any]], original_statement: str,
+                              trace: Optional[VerificationTrace] = None,
+                              features: Optional[StatementFeatures] = None,
+                              summary: Optional[CorrelationSummary] = None) -> int:
         """
         🎯 Calculate truth score from 0-100 based on correlations
         
@@ -190,22 +631,31 @@ class TruthEngine:
         - Word proximity within statement
         - Subject consistency across correlations
         - Contradiction detection for false statements
+        
+        When a trace is given, every score component is recorded on it.
+        Statement features are computed here unless the caller passes them;
+        the batch engine passes a precomputed summary instead of correlations.
         """
-        if not correlations:
+        if summary is None:
+            summary = CorrelationSummary.from_correlations(correlations)
+        
+        if not summary.count:
             return 0  # No correlating facts found
+        
+        if features is None:
+            features = self.featurize_statement(original_statement)
 
         # Step 1: Analyze word proximity in statement
-        proximity_score = self.analyze_word_proximity(original_statement, keywords)
+        proximity_score = self.analyze_word_proximity(original_statement, keywords, features)
         
         # Step 2: Check subject consistency
-        subject_consistency = self.analyze_subject_consistency(correlations)
+        subject_consistency = self._subject_consistency(summary.subject_counts)
         
         # Step 3: Check for contradictions
-        contradiction_penalty = self.detect_contradictions(original_statement, correlations)
+        contradiction_penalty = self._contradiction_penalty(original_statement, summary.contradiction_candidates, features)
 
         # Step 4: Base score from best correlations
-        top_correlations = correlations[:3]  # Use top 3 matches
-        correlation_scores = [c['correlation_score'] for c in top_correlations]
+        correlation_scores = summary.top_scores  # Use top 3 matches
 
         if not correlation_scores:
             return 0
@@ -218,19 +668,21 @@ class TruthEngine:
         subject_boost = subject_consistency * 0.1  # Max 10% boost for subject consistency
 
         # Boost score based on number of correlating facts (increased for math)
-        correlation_boost = min(len(correlations) * 0.08, 0.20)  # Increased to help math
+        correlation_boost = min(summary.count * 0.08, 0.20)  # Increased to help math
 
         # Boost score based on keyword coverage
         total_keywords = len(keywords)
-        covered_keywords = len(set().union(*[c['matching_keywords'] for c in correlations]))
+        covered_keywords = summary.covered_keyword_count
         coverage_ratio = covered_keywords / total_keywords if total_keywords > 0 else 0
         coverage_boost = coverage_ratio * 0.1
         
         # Detect unnatural keyword lists and heavily penalize
         unnatural_penalty = 0.0
-        if self.is_unnatural_keyword_list(statement, keywords):
+        unnatural_list = self.is_unnatural_keyword_list(original_statement, keywords, features)
+        if unnatural_list:
             unnatural_penalty = 0.45  # Heavy penalty for keyword lists
-            print(f"      ⚠️ Unnatural keyword list detected!")
+            if self.verbose:
+                print(f"      ⚠️ Unnatural keyword list detected!")
 
         # Calculate final score with all factors
         final_score = (base_score + proximity_boost + subject_boost + 
@@ -239,16 +691,33 @@ class TruthEngine:
         # Convert to 0-100 scale and cap
         truth_score = max(0, min(int(final_score * 100), 100))
         
-        print(f"   📊 Score breakdown:")
-        print(f"      Base correlation: {base_score:.2f}")
-        print(f"      Proximity bonus: +{proximity_boost:.2f}")
-        print(f"      Subject bonus: +{subject_boost:.2f}")
-        print(f"      Contradiction penalty: -{contradiction_penalty:.2f}")
-        print(f"      Final score: {truth_score}/100")
+        if trace is not None:
+            trace.base_score = base_score
+            trace.proximity_score = proximity_score
+            trace.proximity_boost = proximity_boost
+            trace.subject_consistency = subject_consistency
+            trace.subject_boost = subject_boost
+            trace.correlation_boost = correlation_boost
+            trace.coverage_boost = coverage_boost
+            trace.contradiction_penalty = contradiction_penalty
+            trace.unnatural_keyword_list = unnatural_list
+            trace.unnatural_penalty = unnatural_penalty
+            trace.final_score = final_score
+            trace.truth_score = truth_score
+        
+        if self.verbose:
+            print(f"   📊 Score breakdown:")
+            print(f"      Base correlation: {base_score:.2f}")
+            print(f"      Proximity bonus: +{proximity_boost:.2f}")
+            print(f"      Subject bonus: +{subject_boost:.2f}")
+            print(f"      Contradiction penalty: -{contradiction_penalty:.2f}")
+            print(f"      Unnatural list penalty: -{unnatural_penalty:.2f}")
+            print(f"      Final score: {truth_score}/100")
         
         return truth_score
     
-    def analyze_word_proximity(self, statement: str, keywords: Set[str]) -> float:
+    def analyze_word_proximity(self, statement: str, keywords: Set[str],
+                               features: Optional[StatementFeatures] = None) -> float:
         """
         🔍 Analyze how close important keywords are to each other in the statement
         
@@ -256,35 +725,31 @@ class TruthEngine:
         which can indicate more coherent and truthful statements.
         Enhanced to detect unnatural word arrangements vs natural sentences.
         """
-        words = statement.lower().split()
-        keyword_positions = {}
+        if features is None:
+            features = self.featurize_statement(statement)
         
         # Find positions of all keywords in the statement
-        for i, word in enumerate(words):
-            clean_word = re.sub(r'[^\w]', '', word)  # Remove punctuation
-            if clean_word in keywords:
-                if clean_word not in keyword_positions:
-                    keyword_positions[clean_word] = []
-                keyword_positions[clean_word].append(i)
+        keyword_positions = features.keyword_positions(keywords)
         
         if len(keyword_positions) < 2:
             return 0.5  # Neutral score if not enough keywords for proximity analysis
         
         # Special case: Check for unnatural arrangements (keywords without proper connectors)
-        total_words = len(words)
+        total_words = len(features.tokens)
         keyword_word_count = sum(len(positions) for positions in keyword_positions.values())
         keyword_density = keyword_word_count / total_words if total_words > 0 else 0
         
         # Count connective words to determine if this is a natural sentence
-        connective_count = sum(1 for word in words if word in self.connective_words)
-        has_connectives = connective_count > 0
+        has_connectives = features.connective_count > 0
         
         # If statement is mostly keywords without connectors AND lacks structure, penalize
         if keyword_density > 0.8 and not has_connectives and total_words > 3:
-            print(f"      🔍 Unnatural keyword list detected: {keyword_density:.1%} keywords, no connectives")
+            if self.verbose:
+                print(f"      🔍 Unnatural keyword list detected: {keyword_density:.1%} keywords, no connectives")
             return 0.2  # Poor proximity for unstructured keyword lists
         elif keyword_density > 0.6 and total_words <= 6:  # Short natural sentences are OK
-            print(f"      🔍 Natural sentence with high keyword density: {keyword_density:.1%}")
+            if self.verbose:
+                print(f"      🔍 Natural sentence with high keyword density: {keyword_density:.1%}")
         
         # Calculate average distance between keywords
         total_distance = 0
@@ -324,7 +789,8 @@ class TruthEngine:
         else:
             proximity_score = 0.2  # Very poor proximity
         
-        print(f"      🔍 Proximity analysis: {avg_distance:.1f} avg distance → {proximity_score:.2f} score")
+        if self.verbose:
+            print(f"      🔍 Proximity analysis: {avg_distance:.1f} avg distance → {proximity_score:.2f} score")
         return proximity_score
     
     def analyze_subject_consistency(self, correlations: List[Dict[str, Any]]) -> float:
@@ -337,23 +803,16 @@ class TruthEngine:
         if not correlations:
             return 0.0
         
-        # Extract subjects from correlations
-        subjects = []
-        for correlation in correlations:
-            subject = correlation['concept_data'].get('subject', 'unknown')
-            subjects.append(subject)
-        
+        return self._subject_consistency(CorrelationSummary.from_correlations(correlations).subject_counts)
+    
+    def _subject_consistency(self, subject_counts: Dict[str, int]) -> float:
+        """Subject consistency score from per-subject correlation counts"""
         # Calculate subject consistency
-        if not subjects:
+        if not subject_counts:
             return 0.5  # Neutral if no subject information
         
-        # Count subject frequency
-        subject_counts = {}
-        for subject in subjects:
-            subject_counts[subject] = subject_counts.get(subject, 0) + 1
-        
         # Find dominant subject
-        total_correlations = len(subjects)
+        total_correlations = sum(subject_counts.values())
         max_count = max(subject_counts.values())
         dominant_ratio = max_count / total_correlations
         
@@ -368,10 +827,12 @@ class TruthEngine:
             consistency_score = 0.3  # Poor consistency
         
         dominant_subject = max(subject_counts, key=subject_counts.get)
-        print(f"      📚 Subject consistency: {dominant_subject} ({dominant_ratio:.1%}) → {consistency_score:.2f} score")
+        if self.verbose:
+            print(f"      📚 Subject consistency: {dominant_subject} ({dominant_ratio:.1%}) → {consistency_score:.2f} score")
         return consistency_score
     
-    def detect_contradictions(self, statement: str, correlations: List[Dict[str, Any]]) -> float:
+    def detect_contradictions(self, statement: str, correlations: List[Dict[str, Any]],
+                              features: Optional[StatementFeatures] = None) -> float:
         """
         ⚠️ Detect contradictions between statement and known facts
         
@@ -381,20 +842,21 @@ class TruthEngine:
         if not correlations:
             return 0.0
         
-        statement_lower = statement.lower()
-        statement_words = set(re.findall(r'\b\w+\b', statement_lower))
-        contradiction_penalty = 0.0
+        return self._contradiction_penalty(statement, correlations, features)
+    
+    def _contradiction_penalty(self, statement: str, correlations: List[Dict[str, Any]],
+                               features: Optional[StatementFeatures] = None) -> float:
+        """
+        detect_contradictions for a statement known to have correlations
         
-        # Common contradictory word pairs with enhanced detection
-        contradiction_pairs = [
-            ('up', 'down'), ('upward', 'downward'), ('above', 'below'),
-            ('hot', 'cold'), ('big', 'small'), ('fast', 'slow'),
-            ('true', 'false'), ('correct', 'incorrect'), ('right', 'wrong'),
-            ('add', 'subtract'), ('multiply', 'divide'), ('increase', 'decrease'),
-            ('always', 'never'), ('all', 'none'), ('yes', 'no'),
-            ('action', 'person'), ('action', 'place'), ('action', 'thing'),
-            ('verb', 'noun'), ('movement', 'naming')
-        ]
+        Only correlations passing may_contradict can add to the penalty, so
+        callers may pass just those.
+        """
+        if features is None:
+            features = self.featurize_statement(statement)
+        
+        statement_words = features.words
+        contradiction_penalty = 0.0
         
         # Domain-specific contradiction detection
         
@@ -403,31 +865,37 @@ class TruthEngine:
             if any(word in statement_words for word in ['upward', 'up']):
                 # This is a major physics contradiction
                 contradiction_penalty += 0.7  # Severe penalty
-                print(f"      ⚠️ MAJOR PHYSICS CONTRADICTION: Gravity + upward motion")
+                if self.verbose:
+                    print(f"      ⚠️ MAJOR PHYSICS CONTRADICTION: Gravity + upward motion")
         
         # 2. Grammar Contradiction (Nouns vs Actions)
         if 'noun' in statement_words or 'nouns' in statement_words:
             if any(word in statement_words for word in ['action', 'movement', 'verb', 'verbs']):
                 contradiction_penalty += 0.3  # Moderate grammar contradiction (was 0.5)
-                print(f"      ⚠️ GRAMMAR CONTRADICTION: Nouns described as action words")
+                if self.verbose:
+                    print(f"      ⚠️ GRAMMAR CONTRADICTION: Nouns described as action words")
         
         # 3. Mathematical Operation Contradictions
         if 'addition' in statement_words:
             if any(word in statement_words for word in ['subtract', 'subtraction', 'divide', 'division']):
                 contradiction_penalty += 0.4
-                print(f"      ⚠️ MATH CONTRADICTION: Addition vs other operations")
+                if self.verbose:
+                    print(f"      ⚠️ MATH CONTRADICTION: Addition vs other operations")
         
         # 4. Check correlations for semantic contradictions
         for correlation in correlations:
-            fact_text = correlation['concept_data'].get('definition', '').lower()
-            fact_words = set(re.findall(r'\b\w+\b', fact_text))
+            fact_words = self.concept_definition_words.get(correlation['concept_id'])
+            if fact_words is None:
+                fact_text = correlation['concept_data'].get('definition', '').lower()
+                fact_words = set(re.findall(r'\b\w+\b', fact_text))
             
             # Look for contradictory word pairs between statement and facts
-            for word1, word2 in contradiction_pairs:
+            for word1, word2 in self.contradiction_pairs:
                 if ((word1 in statement_words and word2 in fact_words) or 
                     (word2 in statement_words and word1 in fact_words)):
                     contradiction_penalty += 0.3  # Moderate penalty per contradiction
-                    print(f"      ⚠️ Semantic contradiction: '{word1}' vs '{word2}'")
+                    if self.verbose:
+                        print(f"      ⚠️ Semantic contradiction: '{word1}' vs '{word2}'")
         
         # 5. Subject-specific validation
         for correlation in correlations:
@@ -438,20 +906,30 @@ class TruthEngine:
             if subject == 'science':
                 if concept_id == 'photosynthesis' and 'dark' in statement_words:
                     contradiction_penalty += 0.4
-                    print(f"      ⚠️ SCIENCE CONTRADICTION: Photosynthesis requires light")
+                    if self.verbose:
+                        print(f"      ⚠️ SCIENCE CONTRADICTION: Photosynthesis requires light")
                 
                 if concept_id == 'gravity' and any(word in statement_words for word in ['float', 'rise', 'upward']):
                     contradiction_penalty += 0.6
-                    print(f"      ⚠️ SCIENCE CONTRADICTION: Gravity direction")
+                    if self.verbose:
+                        print(f"      ⚠️ SCIENCE CONTRADICTION: Gravity direction")
         
         # Cap the penalty to prevent negative scores
         contradiction_penalty = min(contradiction_penalty, 0.9)
         
         if contradiction_penalty > 0:
-            print(f"      ⚠️ Total contradiction penalty: -{contradiction_penalty:.2f}")
+            if self.verbose:
+                print(f"      ⚠️ Total contradiction penalty: -{contradiction_penalty:.2f}")
         
         return contradiction_penalty
     
+    def may_contradict(self, concept_id: str, concept_data: Dict[str, Any], definition_words: frozenset) -> bool:
+        """Whether steps 4-5 of detect_contradictions can penalize a correlation with this concept"""
+        if concept_data.get('subject', '') == 'science' and concept_id in ('photosynthesis', 'gravity'):
+            return True
+        return any(word1 in definition_words or word2 in definition_words
+                   for word1, word2 in self.contradiction_pairs)
+    
     def generate_verification_report(self, statement: str, keywords: Set[str], 
                                    correlations: List[Dict[str, Any]], truth_score: int,
                                    context: Dict[str, Any] = None) -> Dict[str, Any]:
@@ -459,21 +937,7 @@ class TruthEngine:
         📊 Generate comprehensive truth verification report
         """
         # Determine truth level
-        if truth_score >= 80:
-            truth_level = "Very High"
-            confidence = "Strong evidence supports this statement"
-        elif truth_score >= 60:
-            truth_level = "High"
-            confidence = "Good evidence supports this statement"
-        elif truth_score >= 40:
-            truth_level = "Moderate"
-            confidence = "Some evidence supports this statement"
-        elif truth_score >= 20:
-            truth_level = "Low"
-            confidence = "Limited evidence supports this statement"
-        else:
-            truth_level = "Very Low"
-            confidence = "Little to no evidence supports this statement"
+        truth_level, confidence = self.classify_truth_score(truth_score)
         
         # Identify supporting facts
         supporting_facts = []
@@ -506,6 +970,19 @@ class TruthEngine:
             'user_display': f"Truth Level: {truth_score}/100 ({truth_level})"
         }
     
+    def classify_truth_score(self, truth_score: int) -> Tuple[str, str]:
+        """Map a 0-100 truth score to its truth level and confidence description"""
+        if truth_score >= 80:
+            return "Very High", "Strong evidence supports this statement"
+        elif truth_score >= 60:
+            return "High", "Good evidence supports this statement"
+        elif truth_score >= 40:
+            return "Moderate", "Some evidence supports this statement"
+        elif truth_score >= 20:
+            return "Low", "Limited evidence supports this statement"
+        else:
+            return "Very Low", "Little to no evidence supports this statement"
+    
     def _assess_coverage(self, keywords: Set[str]) -> str:
         """Assess how well the knowledge base covers the query keywords"""
         total_keywords = len(keywords)
@@ -528,8 +1005,29 @@ class TruthEngine:
         else:
             return "Poor"
     
-    def batch_verify_statements(self, statements: List[str]) -> List[Dict[str, Any]]:
-        """Verify multiple statements and return truth scores"""
+    def batch_verify_statements(self, statements: List[str], vectorized: bool = False,
+                                workers: int = 0, chunk_size: int = 256,
+                                knowledge_factory: Callable[[], HardCodedKnowledgeBase] = None) -> List[Dict[str, Any]]:
+        """
+        Verify multiple statements and return truth scores
+        
+        With vectorized=True the keyword correlations for the whole batch are
+        computed by the NumPy kernel in BatchTruthEngine (same scores, built
+        for large re-scoring jobs). With workers > 0 the statements are spread
+        across a process pool (see stream_verify_statements).
+        """
+        if workers > 0:
+            return list(self.stream_verify_statements(
+                statements, workers, chunk_size, vectorized, knowledge_factory
+            ))
+        
+        if vectorized:
+            with self.index_lock.read():
+                batch_engine = self._batch_engine
+                if batch_engine is None:
+                    batch_engine = self._batch_engine = BatchTruthEngine(self)
+                return batch_engine.verify_statements(statements)
+        
         results = []
         
         for statement in statements:
@@ -542,6 +1040,64 @@ class TruthEngine:
         
         return results
     
+    def stream_verify_statements(self, statements: List[str], workers: int = 2, chunk_size: int = 256,
+                                 vectorized: bool = False,
+                                 knowledge_factory: Callable[[], HardCodedKnowledgeBase] = None) -> Iterator[Dict[str, Any]]:
+        """
+        ⚙️ Verify statements across a process pool, yielding results in input order
+        
+        Each worker builds its own knowledge base and TruthEngine once in the
+        pool initializer, so only statement chunks and result rows cross the
+        process boundary. knowledge_factory must be picklable.
+        
+        By default the workers open a snapshot of this knowledge base as it
+        is now: a snapshot-backed knowledge base is reopened from its file,
+        and any other is compiled to a temporary snapshot first, so concepts
+        added or changed incrementally are scored the same in every worker.
+        Workers check they loaded the current knowledge base version.
+        """
+        expected_version = None
+        temp_snapshot_path = None
+        
+        if knowledge_factory is None:
+            knowledge_factory, expected_version, temp_snapshot_path = self._default_worker_knowledge()
+        
+        chunks = [statements[start:start + chunk_size] for start in range(0, len(statements), chunk_size)]
+        
+        try:
+            with ProcessPoolExecutor(max_workers=workers,
+                                     initializer=_init_verification_worker,
+                                     initargs=(knowledge_factory, expected_version)) as executor:
+                for results in executor.map(_verify_chunk_in_worker, chunks, repeat(vectorized)):
+                    yield from results
+        finally:
+            if temp_snapshot_path is not None and os.path.exists(temp_snapshot_path):
+                os.remove(temp_snapshot_path)
+    
+    def _default_worker_knowledge(self) -> Tuple[Callable[[], HardCodedKnowledgeBase], int, Optional[str]]:
+        """
+        Worker knowledge factory matching the current knowledge base
+        
+        Returns (factory, knowledge version, temporary snapshot path or None).
+        """
+        knowledge_class = type(self.knowledge_base)
+        
+        with self.index_lock.read():
+            version = getattr(self.knowledge_base, 'version', 0)
+            snapshot = getattr(self.knowledge_base, 'snapshot', None)
+            if snapshot is not None:
+                return partial(knowledge_class.from_snapshot, snapshot.snapshot_path), version, None
+            
+            if hasattr(self.knowledge_base, 'save_snapshot'):
+                snapshot_fd, snapshot_path = tempfile.mkstemp(prefix='truth_workers_', suffix='.ixkb')
+                os.close(snapshot_fd)
+                self.knowledge_base.save_snapshot(snapshot_path)
+                return partial(knowledge_class.from_snapshot, snapshot_path), version, snapshot_path
+        
+        if version:
+            raise ValueError("Knowledge base has changed since it was built; pass a knowledge_factory for the workers")
+        return knowledge_class, version, None
+    
     def get_truth_engine_status(self) -> Dict[str, Any]:
         """Get status and capabilities of Truth Engine"""
         return {
@@ -553,28 +1109,47 @@ class TruthEngine:
             'correlation_method': 'keyword_overlap_scoring',
             'verification_speed': 'fast',
             'offline_capable': True,
+            'verification_cache': self.get_cache_stats(),
             'last_updated': datetime.now().isoformat()
         }
     
-    def is_unnatural_keyword_list(self, statement: str, keywords: Set[str]) -> bool:
+    def is_unnatural_keyword_list(self, statement: str, keywords: Set[str],
+                                  features: Optional[StatementFeatures] = None) -> bool:
         """
         🔍 Detect if a statement is just an unnatural list of keywords
         
         This helps identify statements like "Plants photosynthesis sunlight water democracy"
         which are incoherent and should score very low.
         """
-        words = statement.lower().split()
-        non_keyword_words = [w for w in words if w not in keywords and w not in self.connective_words]
+        if features is None:
+            features = self.featurize_statement(statement)
+        words = features.tokens
         
         # If most words are keywords and there are very few connective words
         keyword_ratio = len(keywords) / len(words) if words else 0
         
-        # Check for lack of natural sentence structure
-        has_articles = any(word in ['the', 'a', 'an'] for word in words)
-        has_verbs = any(word in ['is', 'are', 'was', 'were', 'use', 'make', 'do', 'have'] for word in words)
-        
+        # Check for lack of natural sentence structure (articles / common verbs)
         # Unnatural if: high keyword ratio + no articles + no common verbs
-        if keyword_ratio > 0.7 and not has_articles and not has_verbs:
+        if keyword_ratio > 0.7 and not features.has_articles and not features.has_verbs:
             return True
             
-        return False# 2025-09-11 | [XX]    | [Description]                        | [Reason]
+        return False
+
+# Per-process TruthEngine used by stream_verify_statements workers
+_worker_truth_engine = None
+
+def _init_verification_worker(knowledge_factory: Callable[[], HardCodedKnowledgeBase],
+                              expected_version: Optional[int] = None):
+    """Pool initializer: build the read-only knowledge base and indexes once per worker"""
+    global _worker_truth_engine
+    knowledge_base = knowledge_factory()
+    
+    version = getattr(knowledge_base, 'version', 0)
+    if expected_version is not None and version != expected_version:
+        raise RuntimeError(f"Worker loaded knowledge base version {version}, expected {expected_version}")
+    
+    _worker_truth_engine = TruthEngine(knowledge_base, verbose=False)
+
+def _verify_chunk_in_worker(statements: List[str], vectorized: bool) -> List[Dict[str, Any]]:
+    """Verify one chunk of statements with this worker's TruthEngine"""
+    return _worker_truth_engine.batch_verify_statements(statements, vectorized=vectorized)# 2025-09-11 | [XX]    | [Description]                        | [Reason]
\ No newline at end of file
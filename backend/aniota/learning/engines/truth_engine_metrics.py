@@ -16,14 +16,35 @@ log_file_traversal("truth_engine_metrics.py", "system_initialization", "import",
 
 Truth Engine Metrics and Progress Tracking System
 Monitors accuracy improvements and system performance over time.
+
+Benchmark sessions (record_benchmark_session) time verify_statement and
+batch_verify_statements against synthetic knowledge bases and store the
+throughput/latency/memory figures in the same history file, so the
+progress report can flag performance regressions between runs.
 """
 
 import json
 import datetime
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass
+import os
+import random
+import sys
+import time
+import tracemalloc
+from typing import Dict, List, Any, Optional, Tuple
+from dataclasses import dataclass, field, asdict
 from pathlib import Path
 
+# Knowledge base sizes (concepts) used by the benchmark suite
+BENCHMARK_KNOWLEDGE_SIZES = (1000, 10000, 100000)
+
+# Fractional throughput drop / p99 latency rise reported as a regression
+REGRESSION_TOLERANCE = 0.10
+
+# Syllables for synthetic keywords (pronounceable, never connective words)
+SYNTHETIC_SYLLABLES = ['ka', 'lo', 'mi', 'ru', 'te', 'vi', 'zo', 'ne', 'pa', 'si',
+                       'du', 'fe', 'go', 'hi', 'ju', 'ba', 'co', 'ly', 'wa', 'xe']
+SYNTHETIC_SUBJECTS = ['mathematics', 'science', 'language_arts', 'social_studies', 'geography']
+
 @dataclass
 class TestResult:
     """Individual test result data."""
@@ -35,6 +56,17 @@ class TestResult:
     focus_area: str
     timestamp: datetime.datetime
 
+@dataclass
+class BenchmarkResult:
+    """Throughput/latency/memory measurement for one operation and knowledge size."""
+    operation: str
+    knowledge_size: int
+    statement_count: int
+    throughput: float
+    p50_latency_ms: float  # per statement (batch call time / batch length)
+    p99_latency_ms: float  # per statement (batch call time / batch length)
+    peak_memory_mb: float
+
 @dataclass
 class MetricsSnapshot:
     """System performance snapshot."""
@@ -47,6 +79,7 @@ class MetricsSnapshot:
     test_results: List[TestResult]
     improvements: List[str]
     issues: List[str]
+    benchmarks: List[BenchmarkResult] = field(default_factory=list)
 
 class TruthEngineMetrics:
     """Track Truth Engine performance and improvements over time."""
@@ -84,7 +117,8 @@ class TruthEngineMetrics:
                           version: str,
                           test_results: List[Dict[str, Any]],
                           improvements: List[str] = None,
-                          issues: List[str] = None):
+                          issues: List[str] = None,
+                          benchmarks: List[BenchmarkResult] = None):
         """Record a new test session."""
         
         # Convert test results
@@ -112,10 +146,11 @@ class TruthEngineMetrics:
             total_tests=len(results),
             passed_tests=passed_count,
             failed_tests=len(results) - passed_count,
-            success_rate=round((passed_count / len(results)) * 100, 1),
+            success_rate=round((passed_count / len(results)) * 100, 1) if results else 0.0,
             test_results=results,
             improvements=improvements or [],
-            issues=issues or []
+            issues=issues or [],
+            benchmarks=benchmarks or []
         )
         
         self.history.append(snapshot)
@@ -131,16 +166,19 @@ class TruthEngineMetrics:
         report.append("📊 TRUTH ENGINE PROGRESS REPORT")
         report.append("=" * 50)
         
+        # Benchmark-only sessions carry no accuracy results
+        accuracy_history = [s for s in self.history if s.total_tests]
+        
         # Overall progress
-        if len(self.history) >= 2:
-            latest = self.history[-1]
-            previous = self.history[-2]
+        if len(accuracy_history) >= 2:
+            latest = accuracy_history[-1]
+            previous = accuracy_history[-2]
             change = latest.success_rate - previous.success_rate
             trend = "📈" if change > 0 else "📉" if change < 0 else "➡️"
             report.append(f"Current Success Rate: {latest.success_rate}% {trend}")
             report.append(f"Change from Previous: {change:+.1f}%")
-        else:
-            report.append(f"Current Success Rate: {self.history[-1].success_rate}%")
+        elif accuracy_history:
+            report.append(f"Current Success Rate: {accuracy_history[-1].success_rate}%")
         
         report.append("")
         
@@ -149,46 +187,81 @@ class TruthEngineMetrics:
         report.append("-" * 30)
         for i, snapshot in enumerate(self.history, 1):
             date_str = snapshot.timestamp.strftime("%Y-%m-%d %H:%M")
-            report.append(f"{i:2d}. {date_str} | v{snapshot.version} | "
-                         f"{snapshot.passed_tests}/{snapshot.total_tests} "
-                         f"({snapshot.success_rate}%)")
+            if snapshot.total_tests:
+                report.append(f"{i:2d}. {date_str} | v{snapshot.version} | "
+                             f"{snapshot.passed_tests}/{snapshot.total_tests} "
+                             f"({snapshot.success_rate}%)")
+            else:
+                report.append(f"{i:2d}. {date_str} | v{snapshot.version} | "
+                             f"benchmarks only ({len(snapshot.benchmarks)} runs)")
         
         report.append("")
         
-        # Latest test breakdown
-        latest = self.history[-1]
-        report.append("🔍 LATEST TEST BREAKDOWN")
-        report.append("-" * 30)
-        
-        for result in latest.test_results:
-            status = "✅ PASS" if result.passed else "❌ FAIL"
-            report.append(f"{status} | {result.test_name}")
-            report.append(f"      Statement: {result.statement[:50]}...")
-            report.append(f"      Expected: {result.expected_range}, Got: {result.actual_score}")
-            report.append(f"      Focus: {result.focus_area}")
-            report.append("")
-        
-        # Recent improvements
-        if latest.improvements:
-            report.append("🚀 RECENT IMPROVEMENTS")
+        if accuracy_history:
+            # Latest test breakdown
+            latest = accuracy_history[-1]
+            report.append("🔍 LATEST TEST BREAKDOWN")
             report.append("-" * 30)
-            for improvement in latest.improvements:
-                report.append(f"• {improvement}")
-            report.append("")
+            
+            for result in latest.test_results:
+                status = "✅ PASS" if result.passed else "❌ FAIL"
+                report.append(f"{status} | {result.test_name}")
+                report.append(f"      Statement: {result.statement[:50]}...")
+                report.append(f"      Expected: {result.expected_range}, Got: {result.actual_score}")
+                report.append(f"      Focus: {result.focus_area}")
+                report.append("")
+            
+            # Recent improvements
+            if latest.improvements:
+                report.append("🚀 RECENT IMPROVEMENTS")
+                report.append("-" * 30)
+                for improvement in latest.improvements:
+                    report.append(f"• {improvement}")
+                report.append("")
+            
+            # Current issues
+            if latest.issues:
+                report.append("⚠️ CURRENT ISSUES")
+                report.append("-" * 30)
+                for issue in latest.issues:
+                    report.append(f"• {issue}")
+                report.append("")
         
-        # Current issues
-        if latest.issues:
-            report.append("⚠️ CURRENT ISSUES")
+        # Performance benchmarks and regressions against the previous benchmark run
+        benchmark_history = [s for s in self.history if s.benchmarks]
+        if benchmark_history:
+            report.append("⚡ PERFORMANCE BENCHMARKS")
             report.append("-" * 30)
-            for issue in latest.issues:
-                report.append(f"• {issue}")
+            latest_run = benchmark_history[-1]
+            previous_results = {}
+            if len(benchmark_history) >= 2:
+                previous_results = {(b.operation, b.knowledge_size): b for b in benchmark_history[-2].benchmarks}
+            
+            for result in latest_run.benchmarks:
+                line = (f"{result.operation} @ {result.knowledge_size:,} concepts | "
+                        f"{result.throughput:,.0f} stmt/s | "
+                        f"p50 {result.p50_latency_ms:.2f}ms | p99 {result.p99_latency_ms:.2f}ms | "
+                        f"peak {result.peak_memory_mb:.1f}MB")
+                previous = previous_results.get((result.operation, result.knowledge_size))
+                if previous and previous.throughput:
+                    change = (result.throughput - previous.throughput) / previous.throughput * 100
+                    line += f" | {change:+.1f}%"
+                report.append(line)
             report.append("")
+            
+            regressions = self.detect_performance_regressions()
+            if regressions:
+                report.append("🐢 PERFORMANCE REGRESSIONS")
+                report.append("-" * 30)
+                for regression in regressions:
+                    report.append(f"• {regression}")
+                report.append("")
         
         # Trend analysis
-        if len(self.history) >= 3:
+        if len(accuracy_history) >= 3:
             report.append("📊 TREND ANALYSIS")
             report.append("-" * 30)
-            recent_rates = [s.success_rate for s in self.history[-3:]]
+            recent_rates = [s.success_rate for s in accuracy_history[-3:]]
             if all(recent_rates[i] <= recent_rates[i+1] for i in range(len(recent_rates)-1)):
                 report.append("📈 Consistent improvement trend")
             elif all(recent_rates[i] >= recent_rates[i+1] for i in range(len(recent_rates)-1)):
@@ -198,6 +271,111 @@ class TruthEngineMetrics:
         
         return "\n".join(report)
     
+    def detect_performance_regressions(self, tolerance: float = REGRESSION_TOLERANCE) -> List[str]:
+        """Compare the two most recent benchmark runs and describe any regressions."""
+        benchmark_history = [s for s in self.history if s.benchmarks]
+        if len(benchmark_history) < 2:
+            return []
+        
+        previous_results = {(b.operation, b.knowledge_size): b for b in benchmark_history[-2].benchmarks}
+        regressions = []
+        
+        for result in benchmark_history[-1].benchmarks:
+            previous = previous_results.get((result.operation, result.knowledge_size))
+            if not previous:
+                continue
+            
+            label = f"{result.operation} @ {result.knowledge_size:,} concepts"
+            if result.throughput < previous.throughput * (1 - tolerance):
+                regressions.append(f"{label}: throughput {previous.throughput:,.0f} → "
+                                   f"{result.throughput:,.0f} stmt/s")
+            if result.p99_latency_ms > previous.p99_latency_ms * (1 + tolerance):
+                regressions.append(f"{label}: p99 latency {previous.p99_latency_ms:.2f} → "
+                                   f"{result.p99_latency_ms:.2f}ms")
+            if result.peak_memory_mb > previous.peak_memory_mb * (1 + tolerance):
+                regressions.append(f"{label}: peak memory {previous.peak_memory_mb:.1f} → "
+                                   f"{result.peak_memory_mb:.1f}MB")
+        
+        return regressions
+    
+    def run_benchmarks(self,
+                       knowledge_sizes: Tuple[int, ...] = BENCHMARK_KNOWLEDGE_SIZES,
+                       statement_count: int = 500,
+                       batch_size: int = 100,
+                       seed: int = 42) -> List[BenchmarkResult]:
+        """
+        Benchmark verify_statement and batch_verify_statements.
+        
+        Each knowledge size gets a synthetic knowledge base and a fixed set of
+        statements drawn from it (same seed → same workload). Timing and memory
+        are measured in separate passes so tracemalloc does not skew latency.
+        The verification cache is disabled so every call does the full work.
+        Latencies are per statement for every operation: a batch call's time
+        is divided by its batch length, so the rows compare like for like.
+        """
+        from truth_engine import TruthEngine
+        
+        results = []
+        
+        for knowledge_size in knowledge_sizes:
+            print(f"⚡ Benchmarking {knowledge_size:,} concepts...")
+            knowledge_base = build_synthetic_knowledge_base(knowledge_size, seed)
+            truth_engine = TruthEngine(knowledge_base, verbose=False, cache_size=0)
+            statements = generate_benchmark_statements(knowledge_base, statement_count, seed)
+            batches = [statements[i:i + batch_size] for i in range(0, len(statements), batch_size)]
+            
+            operations = [
+                ('verify_statement', statements, truth_engine.verify_statement),
+                ('batch_verify_statements', batches, truth_engine.batch_verify_statements),
+                ('batch_verify_statements[vectorized]', batches,
+                 lambda batch: truth_engine.batch_verify_statements(batch, vectorized=True))
+            ]
+            
+            for operation, calls, function in operations:
+                # Warm up (also builds the vectorized concept matrix outside the timings)
+                function(calls[0])
+                
+                latencies = []
+                started = time.perf_counter()
+                for call in calls:
+                    call_started = time.perf_counter()
+                    function(call)
+                    call_statements = len(call) if isinstance(call, list) else 1
+                    latencies.append((time.perf_counter() - call_started) * 1000 / call_statements)
+                elapsed = time.perf_counter() - started
+                
+                tracemalloc.start()
+                for call in calls:
+                    function(call)
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                
+                latencies.sort()
+                result = BenchmarkResult(
+                    operation=operation,
+                    knowledge_size=knowledge_size,
+                    statement_count=len(statements),
+                    throughput=round(len(statements) / elapsed, 1) if elapsed else 0.0,
+                    p50_latency_ms=round(_percentile(latencies, 50), 3),
+                    p99_latency_ms=round(_percentile(latencies, 99), 3),
+                    peak_memory_mb=round(peak / (1024 * 1024), 2)
+                )
+                results.append(result)
+                print(f"   {operation}: {result.throughput:,.0f} stmt/s, "
+                      f"p50 {result.p50_latency_ms:.2f}ms, p99 {result.p99_latency_ms:.2f}ms, "
+                      f"peak {result.peak_memory_mb:.1f}MB")
+        
+        return results
+    
+    def record_benchmark_session(self, version: str, **benchmark_options) -> MetricsSnapshot:
+        """Run the benchmark suite and record it as a (benchmark-only) session."""
+        benchmarks = self.run_benchmarks(**benchmark_options)
+        snapshot = self.record_test_session(version, [], benchmarks=benchmarks)
+        snapshot.issues.extend(self.detect_performance_regressions())
+        if snapshot.issues:
+            self.save_history()
+        return snapshot
+    
     def add_historical_data(self, historical_snapshots: List[Dict]):
         """Add historical data from conversation backtrack."""
         print("📚 Adding historical data from conversation...")
@@ -237,7 +415,8 @@ class TruthEngineMetrics:
                 } for r in snapshot.test_results
             ],
             'improvements': snapshot.improvements,
-            'issues': snapshot.issues
+            'issues': snapshot.issues,
+            'benchmarks': [asdict(b) for b in snapshot.benchmarks]
         }
     
     def _dict_to_snapshot(self, data: Dict) -> MetricsSnapshot:
@@ -264,9 +443,90 @@ class TruthEngineMetrics:
             success_rate=data['success_rate'],
             test_results=test_results,
             improvements=data['improvements'],
-            issues=data['issues']
+            issues=data['issues'],
+            benchmarks=[BenchmarkResult(**b) for b in data.get('benchmarks', [])]
         )
 
+def _percentile(sorted_values: List[float], percentile: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(percentile / 100 * len(sorted_values) + 0.5)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+def _synthetic_word(index: int) -> str:
+    """Deterministic pronounceable keyword for a vocabulary index."""
+    syllables = []
+    index += len(SYNTHETIC_SYLLABLES)  # at least two syllables
+    while index:
+        index, digit = divmod(index, len(SYNTHETIC_SYLLABLES))
+        syllables.append(SYNTHETIC_SYLLABLES[digit])
+    return ''.join(syllables)
+
+def build_synthetic_knowledge_base(concept_count: int, seed: int = 42):
+    """
+    Build a HardCodedKnowledgeBase holding concept_count synthetic concepts.
+    
+    Concepts follow the hard-coded schema (subject, definition, keywords,
+    related_concepts) with keywords drawn from a vocabulary that grows with
+    the knowledge base, so keyword postings stay a realistic length.
+    """
+    memory_path = os.path.join(os.path.dirname(__file__), '..', 'memory')
+    if memory_path not in sys.path:
+        sys.path.append(memory_path)
+    from hard_coded_knowledge import HardCodedKnowledgeBase
+    
+    rng = random.Random(seed)
+    vocabulary = [_synthetic_word(i) for i in range(max(500, concept_count // 4))]
+    concept_ids = [f"concept_{i}" for i in range(concept_count)]
+    
+    knowledge = {}
+    for concept_id in concept_ids:
+        knowledge[concept_id] = {
+            'subject': rng.choice(SYNTHETIC_SUBJECTS),
+            'definition': ' '.join(rng.sample(vocabulary, 6)),
+            'keywords': rng.sample(vocabulary, rng.randint(3, 6)),
+            'grade_level': 'elementary',
+            'examples': [],
+            'related_concepts': rng.sample(concept_ids, 2)
+        }
+    
+    knowledge_base = HardCodedKnowledgeBase()
+    knowledge_base.knowledge_base = knowledge
+    knowledge_base.keyword_index = knowledge_base._build_keyword_index()
+    knowledge_base.relationship_map = knowledge_base._build_relationship_map()
+    return knowledge_base
+
+def generate_benchmark_statements(knowledge_base, statement_count: int, seed: int = 42) -> List[str]:
+    """
+    Generate a reproducible statement workload for a synthetic knowledge base.
+    
+    Most statements paraphrase a concept (keywords + definition words joined
+    by connectives); the rest mix terms from unrelated concepts.
+    """
+    rng = random.Random(seed)
+    concepts = list(knowledge_base.knowledge_base.values())
+    statements = []
+    
+    for _ in range(statement_count):
+        concept = rng.choice(concepts)
+        definition_words = concept['definition'].split()
+        if rng.random() < 0.8:
+            words = rng.sample(concept['keywords'], min(3, len(concept['keywords'])))
+            words += rng.sample(definition_words, 2)
+        else:
+            words = [rng.choice(rng.choice(concepts)['keywords']) for _ in range(5)]
+        statements.append(f"The {words[0]} is {' and '.join(words[1:3])} with {' '.join(words[3:])}")
+    
+    return statements
+
+def record_benchmark_session(version: str = "benchmark", **benchmark_options):
+    """Run the benchmark suite and record it next to the accuracy history."""
+    metrics = TruthEngineMetrics()
+    snapshot = metrics.record_benchmark_session(version, **benchmark_options)
+    print(f"⚡ Recorded {len(snapshot.benchmarks)} benchmark runs")
+    return metrics
+
 def record_current_session():
     """Record the current test session results."""
     
@@ -357,5 +617,8 @@ def record_current_session():
     return metrics
 
 if __name__ == "__main__":
-    metrics = record_current_session()
+    if "--benchmark" in sys.argv:
+        metrics = record_benchmark_session()
+    else:
+        metrics = record_current_session()
     print(metrics.get_progress_report())# 2025-09-11 | [XX]    | [Description]                        | [Reason]
@@ -24,9 +24,107 @@ DESIGN PRINCIPLE: Store essential facts and relationships, not comprehensive det
 Focus on core concepts that enable pattern recognition and basic reasoning.
 """
 
-from typing import Dict, List, Any, Set
+from typing import Dict, List, Any, Set, Tuple, Callable, Optional
+import heapq
+import os
 import re
+import threading
+import weakref
+from contextlib import contextmanager
 from datetime import datetime
+from knowledge_snapshot import KnowledgeSnapshot, compile_knowledge_snapshot
+
+# Compiled snapshot engines open instead of rebuilding the knowledge dicts
+KNOWLEDGE_SNAPSHOT_PATH = os.getenv("ANIOTA_KNOWLEDGE_SNAPSHOT")
+
+def load_knowledge_base(snapshot_path: str = None) -> 'HardCodedKnowledgeBase':
+    """Open the compiled snapshot when one exists, otherwise build the knowledge base"""
+    snapshot_path = snapshot_path or KNOWLEDGE_SNAPSHOT_PATH
+    if snapshot_path and os.path.exists(snapshot_path):
+        return HardCodedKnowledgeBase.from_snapshot(snapshot_path)
+    return HardCodedKnowledgeBase()
+
+class ReadWriteLock:
+    """
+    🔐 Shared/exclusive lock for knowledge served while it is being updated
+    
+    Any number of readers, or one writer. Waiting writers hold back new
+    readers so ingest is not starved by query traffic. Reads nest, and the
+    writing thread may also read; upgrading a read to a write raises.
+    """
+    
+    def __init__(self):
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = None
+        self._write_depth = 0
+        self._waiting_writers = 0
+        self._local = threading.local()
+    
+    def acquire_read(self):
+        me = threading.get_ident()
+        held_reads = getattr(self._local, 'reads', 0)
+        
+        with self._condition:
+            if self._writer != me:
+                # A nested read must not wait behind a queued writer (it would deadlock)
+                if not held_reads:
+                    while self._writer is not None or self._waiting_writers:
+                        self._condition.wait()
+                self._readers += 1
+        
+        self._local.reads = held_reads + 1
+        self._local.shared = getattr(self._local, 'shared', []) + [self._writer != me]
+    
+    def release_read(self):
+        shared = self._local.shared.pop()
+        self._local.reads -= 1
+        if shared:
+            with self._condition:
+                self._readers -= 1
+                if not self._readers:
+                    self._condition.notify_all()
+    
+    def acquire_write(self):
+        me = threading.get_ident()
+        with self._condition:
+            if self._writer == me:
+                self._write_depth += 1
+                return
+            if getattr(self._local, 'reads', 0):
+                raise RuntimeError("Cannot upgrade a read lock to a write lock")
+            
+            self._waiting_writers += 1
+            try:
+                while self._writer is not None or self._readers:
+                    self._condition.wait()
+            finally:
+                self._waiting_writers -= 1
+            self._writer = me
+            self._write_depth = 1
+    
+    def release_write(self):
+        with self._condition:
+            self._write_depth -= 1
+            if not self._write_depth:
+                self._writer = None
+                self._condition.notify_all()
+    
+    @contextmanager
+    def read(self):
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+    
+    @contextmanager
+    def write(self):
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
 
 class HardCodedKnowledgeBase:
     """
@@ -37,15 +135,62 @@ class HardCodedKnowledgeBase:
     """
     
     def __init__(self):
-        self.knowledge_base = self._initialize_core_knowledge()
+        self.snapshot = None
+        self.knowledge_base = {
+            concept_id: self._copy_concept(concept_id, concept_data)
+            for concept_id, concept_data in self._initialize_core_knowledge().items()
+        }
         self.keyword_index = self._build_keyword_index()
         self.relationship_map = self._build_relationship_map()
         
+        # Bumped whenever the knowledge changes; engines key their caches on it
+        self.version = 0
+        
+        # Term postings for find_knowledge, built on first use
+        self.relevance_index = None
+        self._relevance_build_lock = threading.Lock()
+        
+        # Incremental updates (add/update/remove_concept) take update_lock for writing;
+        # queries and the engines notified of changes read under it
+        self.update_lock = ReadWriteLock()
+        self._change_listeners: List[weakref.WeakMethod] = []
+        
         print("🧠 Hard-coded knowledge base initialized")
         print(f"   📚 Knowledge entries: {len(self.knowledge_base)}")
         print(f"   🔍 Keyword index: {len(self.keyword_index)} terms")
         print(f"   🔗 Relationships: {len(self.relationship_map)} connections")
     
+    @classmethod
+    def from_snapshot(cls, snapshot_path: str) -> 'HardCodedKnowledgeBase':
+        """
+        📦 Open a compiled knowledge snapshot read-only via mmap
+        
+        Skips building the knowledge dicts and indexes entirely; worker
+        processes opening the same file share its pages. Use save_snapshot
+        (or knowledge_snapshot.py) to compile one. The first incremental
+        update copies the snapshot into regular dicts.
+        """
+        knowledge = cls.__new__(cls)
+        knowledge.snapshot = KnowledgeSnapshot(snapshot_path)
+        knowledge.knowledge_base = knowledge.snapshot.concepts
+        knowledge.keyword_index = knowledge.snapshot.keyword_index
+        knowledge.relationship_map = knowledge.snapshot.relationship_map
+        knowledge.version = knowledge.snapshot.knowledge_version
+        knowledge.relevance_index = None
+        knowledge._relevance_build_lock = threading.Lock()
+        knowledge.update_lock = ReadWriteLock()
+        knowledge._change_listeners = []
+        
+        print("🧠 Hard-coded knowledge base opened from snapshot")
+        print(f"   📦 Snapshot: {snapshot_path}")
+        print(f"   📚 Knowledge entries: {len(knowledge.knowledge_base)}")
+        
+        return knowledge
+    
+    def save_snapshot(self, snapshot_path: str) -> Dict[str, Any]:
+        """Compile this knowledge base into a binary snapshot for from_snapshot"""
+        return compile_knowledge_snapshot(self, snapshot_path)
+    
     def _initialize_core_knowledge(self) -> Dict[str, Dict[str, Any]]:
         """Initialize core knowledge across academic subjects"""
         return {
@@ -191,19 +336,21 @@ class HardCodedKnowledgeBase:
         keyword_index = {}
         
         for concept_id, concept_data in self.knowledge_base.items():
-            keywords = concept_data.get('keywords', [])
-            
-            # Add the concept name itself as a keyword
-            keywords.append(concept_id.replace('_', ' '))
-            
-            for keyword in keywords:
-                keyword_lower = keyword.lower()
+            for keyword_lower in self._index_keywords(concept_id, concept_data):
                 if keyword_lower not in keyword_index:
                     keyword_index[keyword_lower] = []
                 keyword_index[keyword_lower].append(concept_id)
         
         return keyword_index
     
+    def _index_keywords(self, concept_id: str, concept_data: Dict[str, Any]) -> List[str]:
+        """Distinct lowercased keywords a concept is indexed under (concept_data is not modified)"""
+        # The concept name itself is indexed as a keyword too
+        concept_name = concept_id.replace('_', ' ')
+        keywords = [*concept_data.get('keywords', []), concept_name]
+        
+        return list(dict.fromkeys(keyword.lower() for keyword in keywords))
+    
     def _build_relationship_map(self) -> Dict[str, List[str]]:
         """Build map of concept relationships"""
         relationship_map = {}
@@ -214,37 +361,234 @@ class HardCodedKnowledgeBase:
         
         return relationship_map
     
-    def find_knowledge(self, query: str, subject_filter: str = None) -> List[Dict[str, Any]]:
+    def _build_relevance_index(self):
         """
-        🔍 Find relevant knowledge entries for a query
+        🗂️ Build term → concept postings for find_knowledge
         
-        This enables offline operation by matching queries to stored knowledge
+        Terms are exactly what _calculate_relevance matches on (keywords and
+        definition words), cached per concept, with an optional partition
+        by subject for subject_filter queries.
         """
-        query_lower = query.lower()
-        matches = []
+        self.concept_terms: Dict[str, frozenset] = {}
+        self.concept_order: Dict[str, int] = {}
+        self.subject_relevance_index: Dict[str, Dict[str, Set[str]]] = {}
+        self._next_relevance_order = 0
+        
+        relevance_index: Dict[str, Set[str]] = {}
+        for concept_id, concept_data in self.knowledge_base.items():
+            self._index_relevance(concept_id, concept_data, relevance_index)
+        
+        # Published last: readers treat a non-None relevance_index as complete
+        self.relevance_index = relevance_index
+    
+    def _index_relevance(self, concept_id: str, concept_data: Dict[str, Any],
+                         relevance_index: Dict[str, Set[str]] = None):
+        """Add one concept to the find_knowledge term postings"""
+        if concept_id not in self.concept_order:
+            self.concept_order[concept_id] = self._next_relevance_order
+            self._next_relevance_order += 1
+        
+        terms = frozenset(self._collect_concept_terms(concept_data))
+        self.concept_terms[concept_id] = terms
+        
+        if relevance_index is None:
+            relevance_index = self.relevance_index
+        
+        subject_postings = self.subject_relevance_index.setdefault(concept_data.get('subject'), {})
+        for term in terms:
+            relevance_index.setdefault(term, set()).add(concept_id)
+            subject_postings.setdefault(term, set()).add(concept_id)
+    
+    def _unindex_relevance(self, concept_id: str, concept_data: Dict[str, Any]):
+        """Remove one concept from the find_knowledge term postings"""
+        subject_postings = self.subject_relevance_index.get(concept_data.get('subject'), {})
+        
+        for term in self.concept_terms.pop(concept_id, ()):
+            for postings in (self.relevance_index, subject_postings):
+                concept_ids = postings.get(term)
+                if concept_ids is not None:
+                    concept_ids.discard(concept_id)
+                    if not concept_ids:
+                        del postings[term]
+    
+    def find_knowledge(self, query: str, subject_filter: str = None, top_k: int = None) -> List[Dict[str, Any]]:
+        """
+        🔍 Find relevant knowledge entries for a query
         
+        This enables offline operation by matching queries to stored knowledge.
+        Only concepts sharing a term with the query are scored, and only the
+        returned matches (at most top_k, if given) are copied. Safe to call
+        while another thread adds, updates or removes concepts.
+        """
         # Extract keywords from query
-        query_keywords = self._extract_keywords(query_lower)
+        query_keywords = self._extract_keywords(query.lower())
+        if not query_keywords:
+            return []
         
-        for concept_id, concept_data in self.knowledge_base.items():
-            # Skip if subject filter doesn't match
-            if subject_filter and concept_data.get('subject') != subject_filter:
-                continue
-            
-            # Calculate relevance score
-            relevance_score = self._calculate_relevance(query_keywords, concept_data)
+        with self.update_lock.read():
+            if self.relevance_index is None:
+                with self._relevance_build_lock:
+                    if self.relevance_index is None:
+                        self._build_relevance_index()
             
-            if relevance_score > 0:
-                match_data = concept_data.copy()
-                match_data['concept_id'] = concept_id
-                match_data['relevance_score'] = relevance_score
-                matches.append(match_data)
+            return self._find_indexed_knowledge(query_keywords, subject_filter, top_k)
+    
+    def _find_indexed_knowledge(self, query_keywords: Set[str], subject_filter: str,
+                                top_k: Optional[int]) -> List[Dict[str, Any]]:
+        """Score and copy the matches for find_knowledge (caller holds the read lock)"""
+        if subject_filter:
+            postings = self.subject_relevance_index.get(subject_filter, {})
+        else:
+            postings = self.relevance_index
+        
+        candidate_ids = set()
+        for keyword in query_keywords:
+            candidate_ids.update(postings.get(keyword, ()))
+        
+        # (relevance, -order) ranks like a stable sort over knowledge base order
+        scored: List[Tuple[float, int, str]] = []
+        for concept_id in candidate_ids:
+            overlap = len(query_keywords.intersection(self.concept_terms[concept_id]))
+            scored.append((overlap / len(query_keywords), -self.concept_order[concept_id], concept_id))
         
-        # Sort by relevance score
-        matches.sort(key=lambda x: x['relevance_score'], reverse=True)
+        if top_k is not None:
+            ranked = heapq.nlargest(top_k, scored)
+        else:
+            ranked = sorted(scored, reverse=True)
+        
+        matches = []
+        for relevance_score, _, concept_id in ranked:
+            match_data = self.knowledge_base[concept_id].copy()
+            match_data['concept_id'] = concept_id
+            match_data['relevance_score'] = relevance_score
+            matches.append(match_data)
         
         return matches
     
+    # INCREMENTAL UPDATES
+    
+    def add_change_listener(self, callback: Callable[[str, str, Optional[Dict[str, Any]], Optional[Dict[str, Any]]], None]):
+        """
+        Register a bound method called as callback(action, concept_id, old_data, new_data)
+        after every add/update/remove. Held weakly, so engines can be garbage collected.
+        """
+        self._change_listeners.append(weakref.WeakMethod(callback))
+    
+    def _notify_change(self, action: str, concept_id: str,
+                       old_data: Optional[Dict[str, Any]], new_data: Optional[Dict[str, Any]]):
+        """Bump the version and tell live listeners about a concept change"""
+        self.version += 1
+        
+        live_listeners = []
+        for listener_ref in self._change_listeners:
+            listener = listener_ref()
+            if listener is not None:
+                listener(action, concept_id, old_data, new_data)
+                live_listeners.append(listener_ref)
+        self._change_listeners = live_listeners
+    
+    def _materialize_snapshot(self):
+        """Copy a snapshot-backed knowledge base into regular dicts before the first write"""
+        if getattr(self, 'snapshot', None) is None:
+            return
+        
+        self.knowledge_base = dict(self.knowledge_base.items())
+        self.keyword_index = {keyword: list(concept_ids) for keyword, concept_ids in self.keyword_index.items()}
+        self.relationship_map = {concept_id: list(related) for concept_id, related in self.relationship_map.items()}
+        self.snapshot.close()
+        self.snapshot = None
+    
+    def _index_concept(self, concept_id: str, concept_data: Dict[str, Any]):
+        """Patch keyword index, relationship map and term postings for one new concept"""
+        for keyword_lower in self._index_keywords(concept_id, concept_data):
+            self.keyword_index.setdefault(keyword_lower, []).append(concept_id)
+        
+        self.relationship_map[concept_id] = concept_data.get('related_concepts', [])
+        
+        if self.relevance_index is not None:
+            self._index_relevance(concept_id, concept_data)
+    
+    def _unindex_concept(self, concept_id: str, concept_data: Dict[str, Any]):
+        """Remove one concept from keyword index, relationship map and term postings"""
+        for keyword_lower in self._index_keywords(concept_id, concept_data):
+            concept_ids = self.keyword_index.get(keyword_lower)
+            if concept_ids and concept_id in concept_ids:
+                concept_ids.remove(concept_id)
+                if not concept_ids:
+                    del self.keyword_index[keyword_lower]
+        
+        self.relationship_map.pop(concept_id, None)
+        
+        if self.relevance_index is not None:
+            self._unindex_relevance(concept_id, concept_data)
+    
+    def _copy_concept(self, concept_id: str, concept_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Copy concept data (never mutating the caller's dict or lists) with the
+        concept name among its keywords, which is what every matcher reads
+        """
+        copied = {key: list(value) if isinstance(value, list) else value for key, value in concept_data.items()}
+        concept_name = concept_id.replace('_', ' ')
+        keywords = copied.setdefault('keywords', [])
+        if concept_name not in keywords:
+            keywords.append(concept_name)
+        return copied
+    
+    def add_concept(self, concept_id: str, concept_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        ➕ Add a new concept without rebuilding any index
+        
+        Raises ValueError if the concept already exists.
+        """
+        with self.update_lock.write():
+            self._materialize_snapshot()
+            if concept_id in self.knowledge_base:
+                raise ValueError(f"Concept already exists: {concept_id}")
+            
+            new_data = self._copy_concept(concept_id, concept_data)
+            self.knowledge_base[concept_id] = new_data
+            self._index_concept(concept_id, new_data)
+            self._notify_change('add', concept_id, None, new_data)
+            return new_data
+    
+    def update_concept(self, concept_id: str, updates: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        ✏️ Merge field updates into an existing concept and re-index only that concept
+        
+        Raises KeyError if the concept does not exist.
+        """
+        with self.update_lock.write():
+            self._materialize_snapshot()
+            if concept_id not in self.knowledge_base:
+                raise KeyError(concept_id)
+            
+            old_data = self.knowledge_base[concept_id]
+            new_data = self._copy_concept(concept_id, {**old_data, **updates})
+            
+            self._unindex_concept(concept_id, old_data)
+            self.knowledge_base[concept_id] = new_data
+            self._index_concept(concept_id, new_data)
+            self._notify_change('update', concept_id, old_data, new_data)
+            return new_data
+    
+    def remove_concept(self, concept_id: str) -> Dict[str, Any]:
+        """
+        ➖ Remove a concept and its index entries
+        
+        Raises KeyError if the concept does not exist.
+        """
+        with self.update_lock.write():
+            self._materialize_snapshot()
+            if concept_id not in self.knowledge_base:
+                raise KeyError(concept_id)
+            
+            old_data = self.knowledge_base.pop(concept_id)
+            self._unindex_concept(concept_id, old_data)
+            if self.relevance_index is not None:
+                self.concept_order.pop(concept_id, None)
+            self._notify_change('remove', concept_id, old_data, None)
+            return old_data
+    
     def _extract_keywords(self, text: str) -> Set[str]:
         """Extract meaningful keywords from text"""
         # Remove common stop words
@@ -258,8 +602,8 @@ class HardCodedKnowledgeBase:
         
         return keywords
     
-    def _calculate_relevance(self, query_keywords: Set[str], concept_data: Dict[str, Any]) -> float:
-        """Calculate relevance score between query and concept"""
+    def _collect_concept_terms(self, concept_data: Dict[str, Any]) -> Set[str]:
+        """Collect the terms a concept is matched on: its keywords and definition words"""
         concept_keywords = set()
         
         # Add concept keywords
@@ -270,6 +614,12 @@ class HardCodedKnowledgeBase:
         definition_keywords = self._extract_keywords(concept_data.get('definition', ''))
         concept_keywords.update(definition_keywords)
         
+        return concept_keywords
+    
+    def _calculate_relevance(self, query_keywords: Set[str], concept_data: Dict[str, Any]) -> float:
+        """Calculate relevance score between query and concept"""
+        concept_keywords = self._collect_concept_terms(concept_data)
+        
         # Calculate overlap
         if not concept_keywords:
             return 0.0
@@ -288,8 +638,8 @@ class HardCodedKnowledgeBase:
         
         This enables Aniota to operate autonomously when LLM is unavailable
         """
-        # Find relevant knowledge
-        matches = self.find_knowledge(query)
+        # Find relevant knowledge (only the best match is used)
+        matches = self.find_knowledge(query, top_k=1)
         
         if not matches:
             return {
@@ -0,0 +1,487 @@
+"""
+
+import sys
+import os
+
+try:
+    from dev_log import log_file_traversal, log_file_dependency
+except ImportError:
+    def log_file_traversal(*args, **kwargs): pass
+    def log_file_dependency(*args, **kwargs): pass
+
+log_file_traversal("knowledge_snapshot.py", "system_initialization", "import", "Auto-generated dev log entry")
+
+📦 KNOWLEDGE SNAPSHOT - Compiled, memory-mapped knowledge base 📦
+
+Compiles HardCodedKnowledgeBase contents into one binary file that engines
+open read-only with mmap, so several worker processes share the same pages
+and nobody rebuilds Python dicts at startup.
+
+File layout (little-endian, every section 8-byte aligned):
+1. Header: magic, format version, knowledge version, counts, section offsets
+2. String table: u32 offsets[n + 1] followed by UTF-8 data
+3. Concept records: fixed-width u32 records in knowledge base order
+4. Concept lookup: record numbers sorted by concept id (binary search)
+5. List pool: u32 string ids for keywords / examples / related concepts
+6. Keyword index: sorted keyword string ids + CSR postings of record numbers
+7. Relationship map: CSR rows (one per record) of related concept string ids
+8. Term index: sorted term string ids + CSR postings of record numbers, where
+   a concept's terms are its lowercased keywords, definition words and name
+   (what engines correlate statements against, see TruthEngine)
+"""
+
+from typing import Dict, List, Any, Iterator, Optional
+from collections.abc import Mapping
+from array import array
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+
+SNAPSHOT_MAGIC = b'IXKB'
+SNAPSHOT_FORMAT_VERSION = 2
+
+# magic, format version, knowledge version, concept/string/keyword/term counts,
+# then the byte offset of each section
+_HEADER = struct.Struct('<4sIIIIII13Q')
+_SECTIONS = (
+    'string_offsets', 'string_data', 'records', 'lookup', 'list_pool',
+    'keyword_strings', 'keyword_indptr', 'keyword_postings',
+    'relation_indptr', 'relation_items',
+    'term_strings', 'term_indptr', 'term_postings'
+)
+
+# Concept record fields (u32 each)
+_RECORD_FIELDS = (
+    'concept_id', 'subject', 'definition', 'grade_level', 'extras', 'flags',
+    'keywords_start', 'keywords_count', 'examples_start', 'examples_count',
+    'related_start', 'related_count'
+)
+_RECORD_WIDTH = len(_RECORD_FIELDS)
+_FIELD_SLOT = {field: slot for slot, field in enumerate(_RECORD_FIELDS)}
+_NO_STRING = 0xFFFFFFFF
+_STRING_FIELDS = ('subject', 'definition', 'grade_level')
+_LIST_FIELDS = ('keywords', 'examples', 'related_concepts')
+
+def _u32(values) -> array:
+    """Build a little-endian u32 array"""
+    data = array('I', values)
+    if sys.byteorder != 'little':
+        data.byteswap()
+    return data
+
+def concept_terms(concept_data: Dict[str, Any]) -> List[str]:
+    """Distinct lowercased keywords, definition words and name of a concept (term index rows)"""
+    terms = [keyword.lower() for keyword in concept_data.get('keywords', [])]
+    terms.extend(re.findall(r'\b\w+\b', concept_data.get('definition', '').lower()))
+    concept_name = concept_data.get('concept_id', '').replace('_', ' ').lower()
+    if concept_name:
+        terms.append(concept_name)
+    return list(dict.fromkeys(terms))
+
+def compile_knowledge_snapshot(knowledge_base, snapshot_path: str) -> Dict[str, Any]:
+    """
+    🔧 Compile a knowledge base into a binary snapshot file
+
+    knowledge_base is any object with knowledge_base, keyword_index and
+    relationship_map attributes (a HardCodedKnowledgeBase). Returns
+    a short summary of what was written.
+    """
+    concepts = knowledge_base.knowledge_base
+    strings: List[str] = []
+    string_ids: Dict[str, int] = {}
+
+    def intern(value: str) -> int:
+        if value not in string_ids:
+            string_ids[value] = len(strings)
+            strings.append(value)
+        return string_ids[value]
+
+    concept_ids = list(concepts.keys())
+    record_numbers = {concept_id: number for number, concept_id in enumerate(concept_ids)}
+    records = []
+    list_pool = []
+
+    for concept_id in concept_ids:
+        concept_data = concepts[concept_id]
+        record = dict.fromkeys(_RECORD_FIELDS, 0)
+        record['concept_id'] = intern(concept_id)
+
+        for field in _STRING_FIELDS:
+            record[field] = intern(concept_data[field]) if field in concept_data else _NO_STRING
+
+        for bit, field in enumerate(_LIST_FIELDS):
+            prefix = 'related' if field == 'related_concepts' else field
+            values = concept_data.get(field)
+            record[f'{prefix}_start'] = len(list_pool)
+            record[f'{prefix}_count'] = len(values) if values else 0
+            if values is not None:
+                record['flags'] |= 1 << bit
+                list_pool.extend(intern(value) for value in values)
+
+        # Anything outside the fixed fields is kept as a JSON string
+        extras = {key: value for key, value in concept_data.items()
+                  if key not in _STRING_FIELDS and key not in _LIST_FIELDS}
+        record['extras'] = intern(json.dumps(extras, sort_keys=True)) if extras else _NO_STRING
+
+        records.extend(record[field] for field in _RECORD_FIELDS)
+
+    # Keyword index: keywords sorted by UTF-8 bytes, postings as record numbers
+    keyword_items = sorted(knowledge_base.keyword_index.items(), key=lambda item: item[0].encode('utf-8'))
+    keyword_strings = [intern(keyword) for keyword, _ in keyword_items]
+    keyword_indptr = [0]
+    keyword_postings = []
+    for _, posting in keyword_items:
+        keyword_postings.extend(record_numbers[concept_id] for concept_id in posting)
+        keyword_indptr.append(len(keyword_postings))
+
+    # Term index: same layout as the keyword index, postings in record order
+    term_postings_by_term: Dict[str, List[int]] = {}
+    for record_number, concept_id in enumerate(concept_ids):
+        for term in concept_terms(concepts[concept_id]):
+            term_postings_by_term.setdefault(term, []).append(record_number)
+    term_items = sorted(term_postings_by_term.items(), key=lambda item: item[0].encode('utf-8'))
+    term_strings = [intern(term) for term, _ in term_items]
+    term_indptr = [0]
+    term_postings = []
+    for _, posting in term_items:
+        term_postings.extend(posting)
+        term_indptr.append(len(term_postings))
+
+    # Relationship map: one CSR row per record
+    relation_indptr = [0]
+    relation_items = []
+    for concept_id in concept_ids:
+        relation_items.extend(intern(related) for related in knowledge_base.relationship_map.get(concept_id, []))
+        relation_indptr.append(len(relation_items))
+
+    lookup = sorted(range(len(concept_ids)), key=lambda number: concept_ids[number].encode('utf-8'))
+
+    # String table
+    encoded = [value.encode('utf-8') for value in strings]
+    string_offsets = [0]
+    for value in encoded:
+        string_offsets.append(string_offsets[-1] + len(value))
+
+    sections = {
+        'string_offsets': _u32(string_offsets).tobytes(),
+        'string_data': b''.join(encoded),
+        'records': _u32(records).tobytes(),
+        'lookup': _u32(lookup).tobytes(),
+        'list_pool': _u32(list_pool).tobytes(),
+        'keyword_strings': _u32(keyword_strings).tobytes(),
+        'keyword_indptr': _u32(keyword_indptr).tobytes(),
+        'keyword_postings': _u32(keyword_postings).tobytes(),
+        'relation_indptr': _u32(relation_indptr).tobytes(),
+        'relation_items': _u32(relation_items).tobytes(),
+        'term_strings': _u32(term_strings).tobytes(),
+        'term_indptr': _u32(term_indptr).tobytes(),
+        'term_postings': _u32(term_postings).tobytes()
+    }
+
+    offsets = []
+    position = _HEADER.size
+    body = bytearray()
+    for name in _SECTIONS:
+        padding = (-position) % 8
+        body.extend(b'\0' * padding)
+        position += padding
+        offsets.append(position)
+        body.extend(sections[name])
+        position += len(sections[name])
+
+    header = _HEADER.pack(
+        SNAPSHOT_MAGIC, SNAPSHOT_FORMAT_VERSION, getattr(knowledge_base, 'version', 0),
+        len(concept_ids), len(strings), len(keyword_items), len(term_items), *offsets
+    )
+
+    # Write to a temp file and rename so readers never map a half-written snapshot
+    temp_path = f"{snapshot_path}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(header)
+        f.write(body)
+    os.replace(temp_path, snapshot_path)
+
+    return {
+        'snapshot_path': snapshot_path,
+        'concepts': len(concept_ids),
+        'strings': len(strings),
+        'keywords': len(keyword_items),
+        'terms': len(term_items),
+        'size_bytes': _HEADER.size + len(body)
+    }
+
+class KnowledgeSnapshot:
+    """
+    📦 Read-only view over a compiled knowledge snapshot
+
+    All sections are memoryviews over one shared mmap; concept dicts are
+    decoded only when a concept is actually accessed.
+    """
+
+    def __init__(self, snapshot_path: str):
+        self.snapshot_path = snapshot_path
+        with open(snapshot_path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._mmap) < _HEADER.size:
+            raise ValueError(f"Truncated knowledge snapshot: {snapshot_path}")
+        (magic, format_version, self.knowledge_version, self.concept_count,
+         self.string_count, self.keyword_count, self.term_count, *offsets) = _HEADER.unpack_from(self._mmap, 0)
+
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError(f"Not a knowledge snapshot: {snapshot_path}")
+        if format_version != SNAPSHOT_FORMAT_VERSION:
+            raise ValueError(f"Unsupported knowledge snapshot format {format_version}: {snapshot_path}")
+
+        view = memoryview(self._mmap)
+        sizes = {
+            'string_offsets': (self.string_count + 1) * 4,
+            'records': self.concept_count * _RECORD_WIDTH * 4,
+            'lookup': self.concept_count * 4,
+            'keyword_strings': self.keyword_count * 4,
+            'keyword_indptr': (self.keyword_count + 1) * 4,
+            'relation_indptr': (self.concept_count + 1) * 4,
+            'term_strings': self.term_count * 4,
+            'term_indptr': (self.term_count + 1) * 4
+        }
+        self._offsets = dict(zip(_SECTIONS, offsets))
+
+        self._string_offsets = self._u32_section(view, 'string_offsets', sizes['string_offsets'])
+        self._string_data_offset = self._offsets['string_data']
+        if self._string_data_offset + self._string_offsets[-1] > len(self._mmap):
+            raise ValueError(f"Truncated knowledge snapshot: {snapshot_path}")
+        self._records = self._u32_section(view, 'records', sizes['records'])
+        self._lookup = self._u32_section(view, 'lookup', sizes['lookup'])
+        self._keyword_strings = self._u32_section(view, 'keyword_strings', sizes['keyword_strings'])
+        self._keyword_indptr = self._u32_section(view, 'keyword_indptr', sizes['keyword_indptr'])
+        self._relation_indptr = self._u32_section(view, 'relation_indptr', sizes['relation_indptr'])
+
+        list_pool_size = self._offsets['keyword_strings'] - self._offsets['list_pool']
+        self._list_pool = self._u32_section(view, 'list_pool', list_pool_size - list_pool_size % 4)
+        self._keyword_postings = self._u32_section(view, 'keyword_postings', self._keyword_indptr[-1] * 4)
+        self._relation_items = self._u32_section(view, 'relation_items', self._relation_indptr[-1] * 4)
+        self._term_strings = self._u32_section(view, 'term_strings', sizes['term_strings'])
+        self._term_indptr = self._u32_section(view, 'term_indptr', sizes['term_indptr'])
+        self._term_postings = self._u32_section(view, 'term_postings', self._term_indptr[-1] * 4)
+
+        self.concepts = SnapshotConcepts(self)
+        self.keyword_index = SnapshotKeywordIndex(self)
+        self.relationship_map = SnapshotRelationshipMap(self)
+
+    def _u32_section(self, view: memoryview, name: str, size: int):
+        """Zero-copy u32 view of a section (copied only on big-endian hosts)"""
+        start = self._offsets[name]
+        if start + size > len(self._mmap):
+            raise ValueError(f"Truncated knowledge snapshot: {self.snapshot_path}")
+        section = view[start:start + size]
+        if sys.byteorder == 'little':
+            return section.cast('I')
+        values = array('I', section.tobytes())
+        values.byteswap()
+        return values
+
+    def string(self, string_id: int) -> Optional[str]:
+        """Decode one entry of the string table"""
+        if string_id == _NO_STRING:
+            return None
+        return self.string_bytes(string_id).decode('utf-8')
+
+    def string_bytes(self, string_id: int) -> bytes:
+        """Raw UTF-8 bytes of one string table entry"""
+        start = self._string_data_offset + self._string_offsets[string_id]
+        end = self._string_data_offset + self._string_offsets[string_id + 1]
+        return self._mmap[start:end]
+
+    def record_field(self, record_number: int, field: str) -> int:
+        """Read one u32 field of a concept record"""
+        return self._records[record_number * _RECORD_WIDTH + _FIELD_SLOT[field]]
+
+    def concept_id(self, record_number: int) -> str:
+        return self.string(self.record_field(record_number, 'concept_id'))
+
+    def find_record(self, concept_id: str) -> int:
+        """Binary search the concept lookup; returns -1 when absent"""
+        target = concept_id.encode('utf-8')
+        low, high = 0, self.concept_count
+        while low < high:
+            middle = (low + high) // 2
+            record_number = self._lookup[middle]
+            candidate = self.string_bytes(self.record_field(record_number, 'concept_id'))
+            if candidate < target:
+                low = middle + 1
+            elif candidate > target:
+                high = middle
+            else:
+                return record_number
+        return -1
+
+    def find_keyword(self, keyword: str) -> int:
+        """Binary search the keyword index; returns -1 when absent"""
+        return self._find_sorted_string(self._keyword_strings, self.keyword_count, keyword)
+
+    def find_term(self, term: str) -> int:
+        """Binary search the term index; returns -1 when absent"""
+        return self._find_sorted_string(self._term_strings, self.term_count, term)
+
+    def _find_sorted_string(self, string_ids, count: int, value: str) -> int:
+        """Binary search a section of string ids sorted by UTF-8 bytes"""
+        target = value.encode('utf-8')
+        low, high = 0, count
+        while low < high:
+            middle = (low + high) // 2
+            candidate = self.string_bytes(string_ids[middle])
+            if candidate < target:
+                low = middle + 1
+            elif candidate > target:
+                high = middle
+            else:
+                return middle
+        return -1
+
+    def decode_concept(self, record_number: int) -> Dict[str, Any]:
+        """Materialize one concept record as a knowledge base dict"""
+        base = record_number * _RECORD_WIDTH
+        record = dict(zip(_RECORD_FIELDS, self._records[base:base + _RECORD_WIDTH]))
+        concept_data = {}
+
+        for field in _STRING_FIELDS:
+            if record[field] != _NO_STRING:
+                concept_data[field] = self.string(record[field])
+
+        for bit, field in enumerate(_LIST_FIELDS):
+            if record['flags'] & (1 << bit):
+                prefix = 'related' if field == 'related_concepts' else field
+                start = record[f'{prefix}_start']
+                count = record[f'{prefix}_count']
+                concept_data[field] = [self.string(string_id) for string_id in self._list_pool[start:start + count]]
+
+        if record['extras'] != _NO_STRING:
+            concept_data.update(json.loads(self.string(record['extras'])))
+
+        return concept_data
+
+    def keyword_postings(self, keyword_slot: int) -> List[str]:
+        start = self._keyword_indptr[keyword_slot]
+        end = self._keyword_indptr[keyword_slot + 1]
+        return [self.concept_id(record_number) for record_number in self._keyword_postings[start:end]]
+
+    def term_records(self, term: str):
+        """Record numbers (ascending) of the concepts with this term; empty when absent"""
+        slot = self.find_term(term)
+        if slot < 0:
+            return ()
+        return self._term_postings[self._term_indptr[slot]:self._term_indptr[slot + 1]]
+
+    def term_string(self, term_slot: int) -> str:
+        return self.string(self._term_strings[term_slot])
+
+    def related_concepts(self, record_number: int) -> List[str]:
+        start = self._relation_indptr[record_number]
+        end = self._relation_indptr[record_number + 1]
+        return [self.string(string_id) for string_id in self._relation_items[start:end]]
+
+    def close(self):
+        """
+        Release the memory map
+
+        Arrays still viewing a section (a cached BatchTruthEngine matrix) keep
+        the map open; it is unmapped once the last of them is dropped.
+        """
+        try:
+            for name in ('_string_offsets', '_records', '_lookup', '_list_pool', '_keyword_strings',
+                         '_keyword_indptr', '_keyword_postings', '_relation_indptr', '_relation_items',
+                         '_term_strings', '_term_indptr', '_term_postings'):
+                section = getattr(self, name)
+                if isinstance(section, memoryview):
+                    section.release()
+            self._mmap.close()
+        except BufferError:
+            pass
+
+class SnapshotConcepts(Mapping):
+    """concept_id → concept dict, in the original knowledge base order"""
+
+    def __init__(self, snapshot: KnowledgeSnapshot):
+        self._snapshot = snapshot
+
+    def __getitem__(self, concept_id: str) -> Dict[str, Any]:
+        record_number = self._snapshot.find_record(concept_id)
+        if record_number < 0:
+            raise KeyError(concept_id)
+        return self._snapshot.decode_concept(record_number)
+
+    def __contains__(self, concept_id) -> bool:
+        return isinstance(concept_id, str) and self._snapshot.find_record(concept_id) >= 0
+
+    def __iter__(self) -> Iterator[str]:
+        for record_number in range(self._snapshot.concept_count):
+            yield self._snapshot.concept_id(record_number)
+
+    def __len__(self) -> int:
+        return self._snapshot.concept_count
+
+    def items(self):
+        for record_number in range(self._snapshot.concept_count):
+            yield self._snapshot.concept_id(record_number), self._snapshot.decode_concept(record_number)
+
+    def values(self):
+        for record_number in range(self._snapshot.concept_count):
+            yield self._snapshot.decode_concept(record_number)
+
+class SnapshotKeywordIndex(Mapping):
+    """keyword → list of concept ids"""
+
+    def __init__(self, snapshot: KnowledgeSnapshot):
+        self._snapshot = snapshot
+
+    def __getitem__(self, keyword: str) -> List[str]:
+        slot = self._snapshot.find_keyword(keyword) if isinstance(keyword, str) else -1
+        if slot < 0:
+            raise KeyError(keyword)
+        return self._snapshot.keyword_postings(slot)
+
+    def __contains__(self, keyword) -> bool:
+        return isinstance(keyword, str) and self._snapshot.find_keyword(keyword) >= 0
+
+    def __iter__(self) -> Iterator[str]:
+        for slot in range(self._snapshot.keyword_count):
+            yield self._snapshot.string(self._snapshot._keyword_strings[slot])
+
+    def __len__(self) -> int:
+        return self._snapshot.keyword_count
+
+class SnapshotRelationshipMap(Mapping):
+    """concept_id → list of related concept names"""
+
+    def __init__(self, snapshot: KnowledgeSnapshot):
+        self._snapshot = snapshot
+
+    def __getitem__(self, concept_id: str) -> List[str]:
+        record_number = self._snapshot.find_record(concept_id) if isinstance(concept_id, str) else -1
+        if record_number < 0:
+            raise KeyError(concept_id)
+        return self._snapshot.related_concepts(record_number)
+
+    def __contains__(self, concept_id) -> bool:
+        return isinstance(concept_id, str) and self._snapshot.find_record(concept_id) >= 0
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._snapshot.concepts)
+
+    def __len__(self) -> int:
+        return self._snapshot.concept_count
+
+if __name__ == "__main__":
+    from hard_coded_knowledge import HardCodedKnowledgeBase
+
+    output_path = sys.argv[1] if len(sys.argv) > 1 else "hard_coded_knowledge.ixkb"
+    summary = compile_knowledge_snapshot(HardCodedKnowledgeBase(), output_path)
+    print(f"📦 Compiled knowledge snapshot: {summary['snapshot_path']}")
+    print(f"   📚 Concepts: {summary['concepts']}")
+    print(f"   🔍 Keywords: {summary['keywords']}")
+    print(f"   🗂️ Terms: {summary['terms']}")
+    print(f"   🧵 Strings: {summary['strings']}")
+    print(f"   💾 Size: {summary['size_bytes']} bytes")
@@ -22,15 +22,22 @@ This creates the basic cognitive infrastructure needed for consciousness to emer
 import json
 import datetime
 import hashlib
+from collections import deque
 
 class MemoryCore:
-    def __init__(self):
+    def __init__(self, max_experiences=10000, max_output_samples=20):
         # Basic memory storage
-        self.experiences = []  # Raw events
+        self.experiences = deque(maxlen=max_experiences)  # Raw events (most recent window)
+        self.experience_count = 0  # Experiences ever recorded
         self.patterns = {}     # Recognized patterns
         self.expectations = {} # What should happen based on patterns
         self.conflicts = []    # When reality doesn't match expectation
         
+        # Input groups kept up to date as experiences arrive:
+        # input_key -> {'count': int, 'outputs': deque of recent outputs}
+        self.input_groups = {}
+        self.max_output_samples = max_output_samples
+        
         # Simple pattern threshold
         self.pattern_threshold = 3  # Need 3 similar events to form a pattern
         
@@ -41,62 +48,67 @@ class MemoryCore:
             'input': input_data,
             'output': output_data,
             'context': context or {},
-            'id': len(self.experiences)
+            'id': self.experience_count
         }
         
         self.experiences.append(experience)
+        self.experience_count += 1
         
-        # Immediately try to find patterns in this new experience
-        self.detect_patterns()
+        # Update only this experience's input group and check it for a pattern
+        input_key = self.update_input_group(input_data, output_data)
+        pattern_detected = self.check_pattern(input_key)
         
         # Check if this experience matches expectations
         expectation_result = self.check_expectations(input_data, output_data)
         
         return {
             'recorded': True,
-            'pattern_detected': len(self.patterns) > len(self.patterns) - 1,
+            'pattern_detected': pattern_detected,
             'expectation_result': expectation_result
         }
     
-    def detect_patterns(self):
-        """Look for repeating patterns in experiences."""
-        if len(self.experiences) < self.pattern_threshold:
-            return
+    def update_input_group(self, input_data, output_data):
+        """Add one experience to its input group; returns the group key."""
+        input_key = self.simplify_input(input_data)
         
-        # Simple pattern detection: group by similar inputs
-        input_groups = {}
+        group = self.input_groups.get(input_key)
+        if group is None:
+            group = {'count': 0, 'outputs': deque(maxlen=max(self.max_output_samples, self.pattern_threshold))}
+            self.input_groups[input_key] = group
         
-        for exp in self.experiences:
-            # Create a simple key for the input
-            input_key = self.simplify_input(exp['input'])
-            
-            if input_key not in input_groups:
-                input_groups[input_key] = []
-            
-            input_groups[input_key].append(exp)
+        group['count'] += 1
+        group['outputs'].append(output_data)
+        return input_key
+    
+    def check_pattern(self, input_key):
+        """Form a pattern for one input group once it reaches the threshold."""
+        group = self.input_groups[input_key]
+        pattern_id = f"pattern_{input_key}"
+        
+        if group['count'] < self.pattern_threshold or pattern_id in self.patterns:
+            return False
         
-        # Look for groups with enough examples to be a pattern
+        # New pattern discovered!
+        pattern = {
+            'input_pattern': input_key,
+            'typical_outputs': list(group['outputs']),
+            'frequency': group['count'],
+            'confidence': min(0.9, group['count'] / 10),
+            'discovered_at': datetime.datetime.now().isoformat()
+        }
+        
+        self.patterns[pattern_id] = pattern
+        
+        # Generate expectation for this pattern
+        self.form_expectation(pattern_id, pattern)
+        return True
+    
+    def detect_patterns(self):
+        """Look for repeating patterns across all input groups (e.g. after changing the threshold)."""
         new_patterns = 0
-        for input_key, experiences_list in input_groups.items():
-            if len(experiences_list) >= self.pattern_threshold:
-                pattern_id = f"pattern_{input_key}"
-                
-                if pattern_id not in self.patterns:
-                    # New pattern discovered!
-                    outputs = [exp['output'] for exp in experiences_list]
-                    pattern = {
-                        'input_pattern': input_key,
-                        'typical_outputs': outputs,
-                        'frequency': len(experiences_list),
-                        'confidence': min(0.9, len(experiences_list) / 10),
-                        'discovered_at': datetime.datetime.now().isoformat()
-                    }
-                    
-                    self.patterns[pattern_id] = pattern
-                    new_patterns += 1
-                    
-                    # Generate expectation for this pattern
-                    self.form_expectation(pattern_id, pattern)
+        for input_key in self.input_groups:
+            if self.check_pattern(input_key):
+                new_patterns += 1
         
         return new_patterns
     
@@ -175,7 +187,8 @@ class MemoryCore:
     def get_cognitive_stats(self):
         """Show the current state of basic cognition."""
         return {
-            'total_experiences': len(self.experiences),
+            'total_experiences': self.experience_count,
+            'retained_experiences': len(self.experiences),
             'patterns_recognized': len(self.patterns),
             'expectations_formed': len(self.expectations),
             'conflicts_experienced': len(self.conflicts),
@@ -187,7 +200,7 @@ class MemoryCore:
         base_score = 0
         
         # Points for having experiences
-        base_score += min(20, len(self.experiences))
+        base_score += min(20, self.experience_count)
         
         # Points for recognizing patterns
         base_score += len(self.patterns) * 10
@@ -24,7 +24,7 @@ Shows how Aniota can operate for several hours without LLM access
 using her foundational knowledge and truth verification system.
 """
 
-from hard_coded_knowledge import HardCodedKnowledgeBase
+from hard_coded_knowledge import load_knowledge_base
 from truth_engine import TruthEngine
 import json
 from datetime import datetime
@@ -36,7 +36,7 @@ class OfflineOperationDemo:
         print("🧠 Initializing Offline Operation Demo...")
         
         # Initialize knowledge base and truth engine
-        self.knowledge_base = HardCodedKnowledgeBase()
+        self.knowledge_base = load_knowledge_base()
         self.truth_engine = TruthEngine(self.knowledge_base)
         
         # Sample queries for testing offline capabilities
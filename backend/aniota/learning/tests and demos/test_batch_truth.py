@@ -0,0 +1,61 @@
+
+
+
+"""
+
+import sys
+import os
+
+try:
+    from dev_log import log_file_traversal, log_file_dependency
+except ImportError:
+    def log_file_traversal(*args, **kwargs): pass
+    def log_file_dependency(*args, **kwargs): pass
+
+log_file_traversal("test_batch_truth.py", "system_initialization", "import", "Auto-generated dev log entry")
+
+Batch Truth Engine Test - Vectorized vs Sequential Scoring
+Checks that the NumPy batch path returns the same truth scores and levels
+as verifying each statement one at a time.
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'engines'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'memory'))
+
+from hard_coded_knowledge import HardCodedKnowledgeBase
+from truth_engine import TruthEngine
+
+def test_batch_matches_sequential():
+    """Vectorized batch verification must agree with the sequential path."""
+    print("🧮 BATCH TRUTH ENGINE TEST")
+    print("=" * 60)
+
+    knowledge_base = HardCodedKnowledgeBase()
+    truth_engine = TruthEngine(knowledge_base, verbose=False)
+
+    statements = [
+        "Plants use sunlight to make food through photosynthesis",
+        "Gravity pulls objects down toward Earth",
+        "Gravity makes objects fall upward",
+        "Nouns are action words",
+        "Addition means combining numbers to get a sum",
+        "Plants photosynthesis sunlight water democracy",
+        "People vote to choose their leaders in a democracy",
+        "Purple elephants dance on the moon",
+        ""
+    ]
+
+    sequential = truth_engine.batch_verify_statements(statements)
+    vectorized = truth_engine.batch_verify_statements(statements, vectorized=True)
+
+    for expected, actual in zip(sequential, vectorized):
+        status = "✅" if expected == actual else "❌"
+        print(f"{status} {actual['truth_score']:3d}/100 ({actual['truth_level']}) - '{actual['statement']}'")
+
+    assert sequential == vectorized
+
+if __name__ == "__main__":
+    test_batch_matches_sequential()
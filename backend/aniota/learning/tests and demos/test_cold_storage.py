@@ -0,0 +1,111 @@
+
+
+
+"""
+
+import sys
+import os
+
+try:
+    from dev_log import log_file_traversal, log_file_dependency
+except ImportError:
+    def log_file_traversal(*args, **kwargs): pass
+    def log_file_dependency(*args, **kwargs): pass
+
+log_file_traversal("test_cold_storage.py", "system_initialization", "import", "Auto-generated dev log entry")
+
+Cold Storage Test - Segment Archive Durability
+Checks that archived memories survive a reopen, that a torn record at the
+end of a segment is dropped, and that compaction never brings deleted
+memories back.
+"""
+
+import sys
+import os
+import tempfile
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'memory'))
+
+from cold_storage import ColdStorageSegments
+
+def make_memory(number):
+    return {'content': {'subject': f"topic {number}", 'details': 'x' * number}, 'strength': 0.05}
+
+def test_write_and_reopen():
+    """Every archived memory reads back the same after reopening the segments."""
+    print("🧊 COLD STORAGE ROUND TRIP")
+    with tempfile.TemporaryDirectory() as storage_path:
+        storage = ColdStorageSegments(storage_path)
+        memories = [(f"memory_{number}", make_memory(number)) for number in range(50)]
+        locations = storage.write_batch(memories)
+        storage.close()
+
+        assert len(locations) == 50
+        reopened = ColdStorageSegments(storage_path)
+        assert len(reopened) == 50
+        for memory_id, memory in memories:
+            assert reopened.read(memory_id) == memory
+        assert reopened.read("memory_missing") is None
+        reopened.close()
+        print("✅ 50 memories read back after reopen")
+
+def test_truncated_last_record():
+    """A torn write at the tail is dropped and later appends stay readable."""
+    print("🧊 COLD STORAGE TRUNCATED TAIL")
+    with tempfile.TemporaryDirectory() as storage_path:
+        storage = ColdStorageSegments(storage_path)
+        storage.write_batch([("first", make_memory(1)), ("second", make_memory(2))])
+        storage.write_batch([("torn", make_memory(3))])
+        segment_path = storage.segment_path(storage.active_segment)
+        storage.close()
+
+        # Cut the last record short, as an unclean shutdown would
+        os.truncate(segment_path, os.path.getsize(segment_path) - 3)
+
+        reopened = ColdStorageSegments(storage_path)
+        assert "torn" not in reopened
+        assert reopened.read("first") == make_memory(1)
+        assert reopened.read("second") == make_memory(2)
+
+        reopened.write_batch([("after", make_memory(4))])
+        reopened.close()
+
+        again = ColdStorageSegments(storage_path)
+        assert sorted(again.offset_index) == ["after", "first", "second"]
+        assert again.read("after") == make_memory(4)
+        again.close()
+        print("✅ Torn record dropped, new records appended after valid data")
+
+def test_delete_then_compact():
+    """Deleted memories stay deleted through compaction and a reopen."""
+    print("🧊 COLD STORAGE DELETE + COMPACT")
+    with tempfile.TemporaryDirectory() as storage_path:
+        # A tiny segment size puts every batch in its own segment
+        storage = ColdStorageSegments(storage_path, segment_size=1)
+        for batch in range(4):
+            storage.write_batch([(f"memory_{batch}_{number}", make_memory(number)) for number in range(10)])
+
+        # Tombstones land in a later segment than the records they delete
+        deleted = [f"memory_0_{number}" for number in range(10)] + ["memory_1_3", "memory_2_7"]
+        assert storage.delete(deleted) == len(deleted)
+        assert storage.delete(["memory_0_0"]) == 0
+
+        stats = storage.compact(force=True)
+        assert stats['segments_compacted'] > 0
+        for memory_id in deleted:
+            assert memory_id not in storage
+        storage.close()
+
+        reopened = ColdStorageSegments(storage_path, segment_size=1)
+        assert len(reopened) == 40 - len(deleted)
+        for memory_id in deleted:
+            assert memory_id not in reopened
+        assert reopened.read("memory_1_4") == make_memory(4)
+        assert reopened.read("memory_3_9") == make_memory(9)
+        reopened.close()
+        print(f"✅ {len(deleted)} deleted memories stayed deleted; compaction stats {stats}")
+
+if __name__ == "__main__":
+    test_write_and_reopen()
+    test_truncated_last_record()
+    test_delete_then_compact()
@@ -0,0 +1,120 @@
+
+
+
+"""
+
+import sys
+import os
+
+try:
+    from dev_log import log_file_traversal, log_file_dependency
+except ImportError:
+    def log_file_traversal(*args, **kwargs): pass
+    def log_file_dependency(*args, **kwargs): pass
+
+log_file_traversal("test_input_event_buffer.py", "system_initialization", "import", "Auto-generated dev log entry")
+
+Input Event Buffer Test - 'block' Overflow Policy
+Checks that a blocked producer gets space from an immediate flush and that
+events buffered after the wait still reach WMS on the flush deadline.
+"""
+
+import sys
+import os
+import time
+import types
+import builtins
+import logging
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+
+# The memory modules import aniota.base_module (not in this tree); stand in
+# a minimal CoreSystemModule so the buffer can be exercised on its own
+class CoreSystemModule:
+    def __init__(self, module_id, parent=None):
+        self.module_id = module_id
+        self.parent = parent
+        self.children = []
+        self.logger = logging.getLogger(module_id)
+        self.is_initialized = False
+
+    def add_child(self, child):
+        self.children.append(child)
+        child.parent = self
+
+    def shutdown(self):
+        self.is_initialized = False
+
+sys.modules.setdefault('aniota.base_module', types.SimpleNamespace(CoreSystemModule=CoreSystemModule))
+if not hasattr(builtins, 'log_file_dependency'):
+    builtins.log_file_dependency = lambda *args, **kwargs: None
+
+from aniota.memory.ieb import InputEventBuffer
+
+class RecordingWMS:
+    """Downstream stand-in that records delivered events"""
+    def __init__(self):
+        self.events = []
+
+    def store_memory(self, memory_id, content, memory_type):
+        self.events.extend(content['events'])
+        return True
+
+def make_buffer(downstream):
+    buffer = InputEventBuffer()
+    assert buffer.set_buffer_config({
+        'max_buffer_size': 10,
+        'flush_threshold': 10,
+        'flush_timeout': 0.3,
+        'overflow_handling': 'block',
+        'backpressure_timeout': 2.0
+    })
+    buffer.connect_downstream(downstream)
+    buffer.start_flush_thread()
+    return buffer
+
+def wait_for(condition, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return condition()
+
+def test_block_forces_flush():
+    """A 'block' producer gets room from an immediate flush, not the deadline."""
+    print("📥 IEB BLOCK POLICY - FORCED FLUSH")
+    downstream = RecordingWMS()
+    buffer = make_buffer(downstream)
+    try:
+        assert buffer.buffer_events([{'event': number} for number in range(6)])
+
+        started = time.monotonic()
+        assert buffer.buffer_events([{'event': number} for number in range(6, 12)])
+        waited = time.monotonic() - started
+
+        assert waited < 0.2, f"blocked {waited:.3f}s (flush deadline is 0.3s)"
+        assert [event['event'] for event in downstream.events] == list(range(6))
+        print(f"✅ Producer blocked {waited * 1000:.1f} ms")
+    finally:
+        buffer.stop_flush_thread()
+
+def test_block_events_reach_deadline_flush():
+    """Events added after the buffer was flushed empty start a new deadline."""
+    print("📥 IEB BLOCK POLICY - DEADLINE AFTER WAIT")
+    downstream = RecordingWMS()
+    buffer = make_buffer(downstream)
+    try:
+        buffer.buffer_events([{'event': number} for number in range(6)])
+        buffer.buffer_events([{'event': number} for number in range(6, 12)])
+
+        assert wait_for(lambda: len(downstream.events) == 12, timeout=2.0), \
+            f"{len(buffer.event_buffer)} events still buffered"
+        assert [event['event'] for event in downstream.events] == list(range(12))
+        print("✅ All 12 events delivered")
+    finally:
+        buffer.stop_flush_thread()
+
+if __name__ == "__main__":
+    test_block_forces_flush()
+    test_block_events_reach_deadline_flush()
@@ -0,0 +1,97 @@
+
+
+
+"""
+
+import sys
+import os
+
+try:
+    from dev_log import log_file_traversal, log_file_dependency
+except ImportError:
+    def log_file_traversal(*args, **kwargs): pass
+    def log_file_dependency(*args, **kwargs): pass
+
+log_file_traversal("test_knowledge_snapshot.py", "system_initialization", "import", "Auto-generated dev log entry")
+
+Knowledge Snapshot Test - Compiled Knowledge Base Round Trip
+Checks that a compiled snapshot reopens with the same concepts, indexes and
+search results as the dict knowledge base, and that a truncated snapshot
+file is rejected instead of served.
+"""
+
+import sys
+import os
+import shutil
+import tempfile
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'engines'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'memory'))
+
+from hard_coded_knowledge import HardCodedKnowledgeBase
+from knowledge_snapshot import KnowledgeSnapshot, concept_terms
+from truth_engine import TruthEngine
+
+def test_snapshot_round_trip():
+    """A reopened snapshot serves the same knowledge as the dict knowledge base."""
+    print("📦 KNOWLEDGE SNAPSHOT ROUND TRIP")
+    knowledge_base = HardCodedKnowledgeBase()
+    with tempfile.TemporaryDirectory() as snapshot_dir:
+        snapshot_path = os.path.join(snapshot_dir, "knowledge.ixkb")
+        summary = knowledge_base.save_snapshot(snapshot_path)
+        assert summary['concepts'] == len(knowledge_base.knowledge_base)
+
+        snapshot_kb = HardCodedKnowledgeBase.from_snapshot(snapshot_path)
+        assert snapshot_kb.version == knowledge_base.version
+        assert dict(snapshot_kb.knowledge_base.items()) == knowledge_base.knowledge_base
+        assert {keyword: snapshot_kb.keyword_index[keyword] for keyword in snapshot_kb.keyword_index} == \
+            {keyword: list(concept_ids) for keyword, concept_ids in knowledge_base.keyword_index.items()}
+        assert {concept_id: snapshot_kb.relationship_map[concept_id] for concept_id in snapshot_kb.relationship_map} == \
+            {concept_id: list(related) for concept_id, related in knowledge_base.relationship_map.items()}
+
+        # Term postings list exactly the concepts whose terms include the term
+        snapshot = snapshot_kb.snapshot
+        for concept_id, concept_data in knowledge_base.knowledge_base.items():
+            record_number = snapshot.find_record(concept_id)
+            for term in concept_terms(concept_data):
+                assert record_number in list(snapshot.term_records(term))
+        assert len(snapshot.term_records("definitely_not_a_term")) == 0
+
+        for query in ["photosynthesis sunlight", "gravity", "nouns verbs", "democracy vote"]:
+            assert snapshot_kb.find_knowledge(query) == knowledge_base.find_knowledge(query)
+
+        statements = [
+            "Plants use sunlight to make food through photosynthesis",
+            "Gravity makes objects fall upward",
+            "Purple elephants dance on the moon"
+        ]
+        expected = TruthEngine(knowledge_base, verbose=False).batch_verify_statements(statements)
+        actual = TruthEngine(snapshot_kb, verbose=False).batch_verify_statements(statements)
+        assert [result['truth_score'] for result in actual] == [result['truth_score'] for result in expected]
+
+        snapshot.close()
+        print(f"✅ {summary['concepts']} concepts, {summary['terms']} terms served identically from the snapshot")
+
+def test_truncated_snapshot_rejected():
+    """Opening a snapshot cut short raises ValueError for every cut point."""
+    print("📦 KNOWLEDGE SNAPSHOT TRUNCATED FILE")
+    knowledge_base = HardCodedKnowledgeBase()
+    with tempfile.TemporaryDirectory() as snapshot_dir:
+        snapshot_path = os.path.join(snapshot_dir, "knowledge.ixkb")
+        truncated_path = os.path.join(snapshot_dir, "truncated.ixkb")
+        size = knowledge_base.save_snapshot(snapshot_path)['size_bytes']
+
+        for cut in [1, 4, 100, size // 2, size - 8]:
+            shutil.copyfile(snapshot_path, truncated_path)
+            os.truncate(truncated_path, size - cut)
+            try:
+                KnowledgeSnapshot(truncated_path)
+            except ValueError:
+                continue
+            raise AssertionError(f"snapshot missing its last {cut} bytes was opened")
+
+        print("✅ Truncated snapshots rejected")
+
+if __name__ == "__main__":
+    test_snapshot_round_trip()
+    test_truncated_snapshot_rejected()
@@ -0,0 +1,227 @@
+
+
+
+"""
+
+import sys
+import os
+
+try:
+    from dev_log import log_file_traversal, log_file_dependency
+except ImportError:
+    def log_file_traversal(*args, **kwargs): pass
+    def log_file_dependency(*args, **kwargs): pass
+
+log_file_traversal("test_ldm_checkpoint.py", "system_initialization", "import", "Auto-generated dev log entry")
+
+LDM Checkpoint Test - Snapshot + Change Log Restarts
+Checks that LDM._restore_from_checkpoint rebuilds the same memories, keyword
+index, clusters and fade schedule from the newest snapshot plus the change
+logs written after it, and that a damaged snapshot does not stop a restart.
+"""
+
+import sys
+import os
+import time
+import types
+import builtins
+import logging
+import tempfile
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+
+# The memory modules import aniota.base_module (not in this tree); stand in
+# a minimal CoreSystemModule so LDM can be exercised on its own
+class CoreSystemModule:
+    def __init__(self, module_id, parent=None):
+        self.module_id = module_id
+        self.parent = parent
+        self.children = []
+        self.logger = logging.getLogger(module_id)
+        self.is_initialized = False
+
+    def add_child(self, child):
+        self.children.append(child)
+        child.parent = self
+
+    def shutdown(self):
+        self.is_initialized = False
+
+sys.modules.setdefault('aniota.base_module', types.SimpleNamespace(CoreSystemModule=CoreSystemModule))
+if not hasattr(builtins, 'log_file_dependency'):
+    builtins.log_file_dependency = lambda *args, **kwargs: None
+
+from aniota.memory.ldm import LongTermDeclarativeMemory
+from aniota.memory.ldm_checkpoint import LDMCheckpointStore, OP_PUT
+
+def make_wms_memory(number):
+    return {
+        'content': {'subject': f"topic {number}", 'details': f"fact number {number} about photosynthesis"},
+        'memory_type': 'semantic',
+        'creation_time': time.time(),
+        'strength': 1.0 - number / 100
+    }
+
+def make_ldm(data_path):
+    """LDM with its files under data_path and no background snapshot thread"""
+    ldm = LongTermDeclarativeMemory()
+    ldm.cold_storage_path = os.path.join(data_path, "cold_storage")
+    ldm.checkpoint_path = os.path.join(data_path, "ldm_checkpoint")
+    ldm.specs['checkpointing_enabled'] = False
+    return ldm
+
+def start(data_path):
+    ldm = make_ldm(data_path)
+    assert ldm.initialize()
+    return ldm
+
+def stop(ldm):
+    ldm.checkpoint_store.close()
+    ldm.cold_storage.close()
+
+def restart(data_path):
+    """Bring up a fresh LDM on the same files through _restore_from_checkpoint"""
+    ldm = make_ldm(data_path)
+    ldm._initialize_memory_storage()
+    ldm._setup_cold_storage()
+    ldm.checkpoint_store = LDMCheckpointStore(ldm.checkpoint_path)
+    ldm._restore_from_checkpoint()
+    return ldm
+
+def fade_state(ldm):
+    return {
+        memory_id: (round(memory['strength'], 9), memory['strength_anchor_time'], memory['access_count'])
+        for memory_id, memory in ldm.long_term_memories.items()
+    }
+
+def assert_rebuilt(restored, original):
+    """Indexes, clusters and fade schedule match the LDM that wrote the files"""
+    assert fade_state(restored) == fade_state(original)
+    assert restored.memory_index == original.memory_index
+    assert restored.memory_clusters == original.memory_clusters
+    assert restored._validate_memory_index() and restored._validate_memory_clusters()
+    assert set(restored.search_documents) == set(restored.long_term_memories)
+
+    # Every memory has a current fade queue entry at its projected crossing
+    for memory_id, memory in restored.long_term_memories.items():
+        assert memory['fade_due'] == original.long_term_memories[memory_id]['fade_due']
+        assert (memory['fade_due'], memory_id) in restored.fade_queue
+
+def test_snapshot_and_log_restore():
+    """Consolidations, reads and forgets logged after the snapshot are replayed on top of it."""
+    print("💾 LDM CHECKPOINT + CHANGE LOG REPLAY")
+    with tempfile.TemporaryDirectory() as data_path:
+        ldm = start(data_path)
+        ldm.consolidate_many([(f"memory_{number}", make_wms_memory(number)) for number in range(5)])
+        generation = ldm.create_checkpoint()['generation']
+
+        ldm.consolidate_from_wms("memory_5", make_wms_memory(5))
+        ldm.consolidate_from_wms("memory_1", make_wms_memory(50))
+        assert ldm.retrieve_memory("memory_2") is not None
+        with ldm.memory_lock:
+            ldm._forget_memory("memory_0")
+        stop(ldm)
+
+        restored = restart(data_path)
+        assert sorted(restored.long_term_memories) == [f"memory_{number}" for number in range(1, 6)]
+        assert restored.long_term_memories["memory_1"]['content'] == make_wms_memory(50)['content']
+        assert restored.long_term_memories["memory_2"]['access_count'] == 2
+        assert_rebuilt(restored, ldm)
+        assert restored.search_memories("photosynthesis")
+        assert restored.checkpoint_store.generation > generation
+        stop(restored)
+        print(f"✅ Snapshot generation {generation} + logged changes restored {len(restored.long_term_memories)} memories")
+
+def test_log_only_restore():
+    """Without a snapshot every change log is replayed from the start."""
+    print("💾 LDM CHANGE LOG WITHOUT SNAPSHOT")
+    with tempfile.TemporaryDirectory() as data_path:
+        ldm = start(data_path)
+        ldm.consolidate_from_wms("memory_1", make_wms_memory(1))
+        ldm.checkpoint_store.rotate()
+        ldm.consolidate_from_wms("memory_2", make_wms_memory(2))
+        with ldm.memory_lock:
+            ldm._forget_memory("memory_1")
+        stop(ldm)
+
+        restored = restart(data_path)
+        assert list(restored.long_term_memories) == ["memory_2"]
+        assert_rebuilt(restored, ldm)
+        stop(restored)
+        print("✅ Two change logs replayed in order")
+
+def test_truncated_log_tail():
+    """A torn record at the end of the newest log is skipped; earlier changes survive."""
+    print("💾 LDM TRUNCATED CHANGE LOG")
+    with tempfile.TemporaryDirectory() as data_path:
+        ldm = start(data_path)
+        ldm.consolidate_many([("memory_1", make_wms_memory(1)), ("memory_2", make_wms_memory(2))])
+        ldm.consolidate_from_wms("memory_3", make_wms_memory(3))
+        log_path = ldm.checkpoint_store.log_path(ldm.checkpoint_store.generation)
+        stop(ldm)
+
+        os.truncate(log_path, os.path.getsize(log_path) - 5)
+
+        restored = restart(data_path)
+        assert sorted(restored.long_term_memories) == ["memory_1", "memory_2"]
+        stop(restored)
+        print("✅ Torn change dropped, earlier changes restored")
+
+def test_reactivated_memory_leaves_cold_storage():
+    """A memory logged back into active storage is dropped from cold storage on restore."""
+    print("💾 LDM COLD STORAGE DEDUPE")
+    with tempfile.TemporaryDirectory() as data_path:
+        ldm = start(data_path)
+        ldm.consolidate_many([("memory_1", make_wms_memory(1)), ("memory_2", make_wms_memory(2))])
+        memory = ldm.long_term_memories["memory_1"]
+        with ldm.memory_lock:
+            ldm._archive_batch_to_cold_storage(["memory_1", "memory_2"])
+        assert sorted(ldm.cold_storage_memories) == ["memory_1", "memory_2"]
+
+        # Crash after the reactivation was logged but before cold storage dropped its copy
+        ldm.checkpoint_store.append([(OP_PUT, "memory_1", memory)])
+        stop(ldm)
+
+        restored = restart(data_path)
+        assert list(restored.long_term_memories) == ["memory_1"]
+        assert list(restored.cold_storage_memories) == ["memory_2"]
+        assert "memory_1" not in restored.cold_storage
+        assert restored._validate_cold_storage()
+        assert restored.memory_index == {keyword: {"memory_1": None} for keyword in memory['keywords']}
+        stop(restored)
+        print("✅ Reactivated memory kept active only")
+
+def test_corrupt_snapshot_falls_back_to_logs():
+    """A damaged snapshot is set aside and initialize() still succeeds from the change logs."""
+    print("💾 LDM CORRUPT SNAPSHOT")
+    with tempfile.TemporaryDirectory() as data_path:
+        ldm = start(data_path)
+        ldm.consolidate_from_wms("memory_1", make_wms_memory(1))
+        ldm.create_checkpoint()
+        ldm.consolidate_from_wms("memory_2", make_wms_memory(2))
+        snapshot_path = ldm.checkpoint_store.snapshot_path()
+        stop(ldm)
+
+        for size in [os.path.getsize(snapshot_path) - 4, 6]:
+            os.truncate(snapshot_path, size)
+            try:
+                LDMCheckpointStore(ldm.checkpoint_path).load_snapshot()
+            except ValueError:
+                pass
+            else:
+                raise AssertionError("truncated snapshot was loaded")
+
+        restored = make_ldm(data_path)
+        assert restored.initialize()
+        assert list(restored.long_term_memories) == ["memory_2"]
+        assert not os.path.exists(snapshot_path)
+        assert any(name.startswith("ldm_snapshot.bin.corrupt-") for name in os.listdir(ldm.checkpoint_path))
+        stop(restored)
+        print("✅ Corrupt snapshot set aside, logged changes restored")
+
+if __name__ == "__main__":
+    test_snapshot_and_log_restore()
+    test_log_only_restore()
+    test_truncated_log_tail()
+    test_reactivated_memory_leaves_cold_storage()
+    test_corrupt_snapshot_falls_back_to_logs()
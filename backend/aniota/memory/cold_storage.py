@@ -0,0 +1,306 @@
+"""
+
+import sys
+import os
+
+try:
+    from dev_log import log_file_traversal, log_file_dependency
+except ImportError:
+    def log_file_traversal(*args, **kwargs): pass
+    def log_file_dependency(*args, **kwargs): pass
+
+log_file_traversal("cold_storage.py", "system_initialization", "import", "Auto-generated dev log entry")
+
+Cold Storage Segments - append-only archive for LDM
+Used by LDM (Long-Term Declarative Memory)
+
+Archived memories are appended to large segment files instead of one pickle
+file per memory. Each record is self-describing, so the offset index is
+rebuilt by scanning the segments on open:
+
+    record  = header | memory_id (utf-8) | payload
+    header  = payload_length:u32, id_length:u32, flags:u8, crc32:u32
+    payload = pickle of the memory dict, zlib-compressed when FLAG_COMPRESSED
+
+Deleting (reactivation or forgetting) appends a tombstone record. Segments
+whose live data falls below compaction_ratio are rewritten by compact().
+"""
+
+from typing import Dict, List, Any, Optional, Tuple
+import os
+import pickle
+import struct
+import threading
+import zlib
+
+RECORD_HEADER = struct.Struct('<IIBI')
+FLAG_COMPRESSED = 0x01
+FLAG_TOMBSTONE = 0x02
+SEGMENT_PREFIX = "segment_"
+SEGMENT_SUFFIX = ".seg"
+
+class ColdStorageSegments:
+    """
+    Append-only segment store for archived long-term memories
+
+    - write_batch: one sequential write (and fsync) for a whole fade cycle
+    - read: a single pread of the record's payload via the offset index
+    - delete: tombstones, reclaimed later by compact()
+    """
+
+    def __init__(self, storage_path: str, segment_size: int = 64 * 1024 * 1024,
+                 compress: bool = True, compression_level: int = 6,
+                 compaction_ratio: float = 0.5):
+        self.storage_path = storage_path
+        self.segment_size = segment_size
+        self.compress = compress
+        self.compression_level = compression_level
+        self.compaction_ratio = compaction_ratio
+        self.storage_lock = threading.RLock()
+
+        # memory_id -> (segment_number, payload_offset, payload_length, flags)
+        self.offset_index: Dict[str, Tuple[int, int, int, int]] = {}
+        self.segment_live_bytes: Dict[int, int] = {}
+        self.segment_total_bytes: Dict[int, int] = {}
+        self.read_handles: Dict[int, Any] = {}
+        self.active_segment = 0
+        self.active_handle = None
+
+        os.makedirs(self.storage_path, exist_ok=True)
+        self._load_segments()
+
+    # Public API
+
+    def __contains__(self, memory_id: str) -> bool:
+        return memory_id in self.offset_index
+
+    def __len__(self) -> int:
+        return len(self.offset_index)
+
+    def segment_path(self, segment_number: int) -> str:
+        """File path of a segment"""
+        return os.path.join(self.storage_path, f"{SEGMENT_PREFIX}{segment_number:06d}{SEGMENT_SUFFIX}")
+
+    def write_batch(self, memories: List[Tuple[str, Dict[str, Any]]]) -> Dict[str, str]:
+        """
+        Append a batch of memories in one sequential write
+
+        Returns:
+            memory_id -> segment file path for every memory written
+        """
+        if not memories:
+            return {}
+
+        records = []
+        for memory_id, memory in memories:
+            payload = pickle.dumps(memory, protocol=pickle.HIGHEST_PROTOCOL)
+            flags = 0
+            if self.compress:
+                payload = zlib.compress(payload, self.compression_level)
+                flags |= FLAG_COMPRESSED
+            records.append((memory_id, payload, flags))
+
+        with self.storage_lock:
+            locations = self._append_records(records, sync=True)
+            return {memory_id: self.segment_path(location[0]) for memory_id, location in locations.items()}
+
+    def read(self, memory_id: str) -> Optional[Dict[str, Any]]:
+        """Read one archived memory with a single positional read"""
+        with self.storage_lock:
+            location = self.offset_index.get(memory_id)
+            if location is None:
+                return None
+            segment_number, offset, length, flags = location
+            handle = self._read_handle(segment_number)
+
+            if hasattr(os, 'pread'):
+                payload = os.pread(handle.fileno(), length, offset)
+            else:
+                handle.seek(offset)
+                payload = handle.read(length)
+
+        if flags & FLAG_COMPRESSED:
+            payload = zlib.decompress(payload)
+        return pickle.loads(payload)
+
+    def delete(self, memory_ids: List[str]) -> int:
+        """Drop memories from the archive (tombstones; space reclaimed by compact)"""
+        with self.storage_lock:
+            records = [(memory_id, b'', FLAG_TOMBSTONE) for memory_id in memory_ids if memory_id in self.offset_index]
+            if records:
+                self._append_records(records, sync=False)
+            return len(records)
+
+    def compact(self, force: bool = False) -> Dict[str, int]:
+        """
+        Rewrite sealed segments that are mostly dead records
+
+        Live records are copied into the active segment in one batch and the
+        old segment files are removed. Compaction always covers a prefix of
+        the sealed segments: a tombstone only ever follows the record it
+        deletes, so dropping a prefix can never resurrect a deleted memory.
+        """
+        stats = {'segments_compacted': 0, 'records_moved': 0, 'bytes_reclaimed': 0}
+
+        with self.storage_lock:
+            sealed = sorted(n for n in self.segment_total_bytes if n != self.active_segment)
+            sparse = [
+                segment_number for segment_number in sealed
+                if force or self.segment_live_bytes.get(segment_number, 0)
+                < self.segment_total_bytes[segment_number] * self.compaction_ratio
+            ]
+            if not sparse:
+                return stats
+            candidates = [segment_number for segment_number in sealed if segment_number <= sparse[-1]]
+
+            candidate_set = set(candidates)
+            moved = []
+            for memory_id, (segment_number, offset, length, flags) in self.offset_index.items():
+                if segment_number in candidate_set:
+                    handle = self._read_handle(segment_number)
+                    handle.seek(offset)
+                    moved.append((memory_id, handle.read(length), flags))
+
+            self._append_records(moved, sync=True)
+
+            for segment_number in candidates:
+                stats['bytes_reclaimed'] += self.segment_total_bytes.pop(segment_number)
+                self.segment_live_bytes.pop(segment_number, None)
+                handle = self.read_handles.pop(segment_number, None)
+                if handle:
+                    handle.close()
+                os.remove(self.segment_path(segment_number))
+
+            stats['segments_compacted'] = len(candidates)
+            stats['records_moved'] = len(moved)
+            return stats
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Segment usage statistics"""
+        with self.storage_lock:
+            total = sum(self.segment_total_bytes.values())
+            live = sum(self.segment_live_bytes.values())
+            return {
+                'archived_memories': len(self.offset_index),
+                'segments': len(self.segment_total_bytes),
+                'total_bytes': total,
+                'live_bytes': live,
+                'live_ratio': live / total if total else 1.0,
+                'compression': 'zlib' if self.compress else None
+            }
+
+    def close(self) -> None:
+        """Close all segment file handles"""
+        with self.storage_lock:
+            if self.active_handle:
+                self.active_handle.close()
+                self.active_handle = None
+            for handle in self.read_handles.values():
+                handle.close()
+            self.read_handles.clear()
+
+    # Private helper methods
+
+    def _append_records(self, records: List[Tuple[str, bytes, int]], sync: bool) -> Dict[str, Tuple[int, int, int, int]]:
+        """Append encoded records to the active segment (rolling over when full)"""
+        locations = {}
+        if not records:
+            return locations
+
+        if self.active_handle is None or self.segment_total_bytes.get(self.active_segment, 0) >= self.segment_size:
+            self._open_new_segment()
+
+        position = self.segment_total_bytes[self.active_segment]
+        buffer = bytearray()
+
+        for memory_id, payload, flags in records:
+            id_bytes = memory_id.encode('utf-8')
+            header = RECORD_HEADER.pack(len(payload), len(id_bytes), flags, zlib.crc32(id_bytes + payload))
+            record_length = len(header) + len(id_bytes) + len(payload)
+            payload_offset = position + len(buffer) + len(header) + len(id_bytes)
+            buffer += header
+            buffer += id_bytes
+            buffer += payload
+
+            self._forget_location(memory_id)
+            if not flags & FLAG_TOMBSTONE:
+                location = (self.active_segment, payload_offset, len(payload), flags)
+                self.offset_index[memory_id] = location
+                self.segment_live_bytes[self.active_segment] += record_length
+                locations[memory_id] = location
+
+        self.active_handle.write(buffer)
+        self.active_handle.flush()
+        if sync:
+            os.fsync(self.active_handle.fileno())
+        self.segment_total_bytes[self.active_segment] += len(buffer)
+
+        return locations
+
+    def _forget_location(self, memory_id: str) -> None:
+        """Mark a memory's current record as dead"""
+        location = self.offset_index.pop(memory_id, None)
+        if location is not None:
+            segment_number, _, length, _ = location
+            record_length = RECORD_HEADER.size + len(memory_id.encode('utf-8')) + length
+            self.segment_live_bytes[segment_number] -= record_length
+
+    def _open_new_segment(self) -> None:
+        """Seal the active segment and start the next one"""
+        if self.active_handle:
+            self.active_handle.close()
+        self.active_segment = max(self.segment_total_bytes, default=0) + 1
+        self.active_handle = open(self.segment_path(self.active_segment), 'ab')
+        self.segment_total_bytes[self.active_segment] = 0
+        self.segment_live_bytes[self.active_segment] = 0
+
+    def _read_handle(self, segment_number: int):
+        """Cached read-only handle for a segment"""
+        handle = self.read_handles.get(segment_number)
+        if handle is None:
+            if segment_number == self.active_segment and self.active_handle:
+                self.active_handle.flush()
+            handle = open(self.segment_path(segment_number), 'rb')
+            self.read_handles[segment_number] = handle
+        return handle
+
+    def _load_segments(self) -> None:
+        """Rebuild the offset index by scanning existing segments in order"""
+        segment_numbers = sorted(
+            int(name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)])
+            for name in os.listdir(self.storage_path)
+            if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX)
+        )
+
+        for segment_number in segment_numbers:
+            self.segment_total_bytes[segment_number] = 0
+            self.segment_live_bytes[segment_number] = 0
+            with open(self.segment_path(segment_number), 'rb') as handle:
+                data = handle.read()
+
+            position = 0
+            while position + RECORD_HEADER.size <= len(data):
+                length, id_length, flags, checksum = RECORD_HEADER.unpack_from(data, position)
+                id_start = position + RECORD_HEADER.size
+                payload_offset = id_start + id_length
+                end = payload_offset + length
+                if end > len(data) or zlib.crc32(data[id_start:end]) != checksum:
+                    break  # Torn write at the tail of the segment
+
+                memory_id = data[id_start:payload_offset].decode('utf-8')
+                self._forget_location(memory_id)
+                if not flags & FLAG_TOMBSTONE:
+                    self.offset_index[memory_id] = (segment_number, payload_offset, length, flags)
+                    self.segment_live_bytes[segment_number] += end - position
+                position = end
+
+            self.segment_total_bytes[segment_number] = position
+            if position < len(data):
+                # Drop the torn tail so new records are appended after valid data
+                with open(self.segment_path(segment_number), 'r+b') as handle:
+                    handle.truncate(position)
+
+        if segment_numbers:
+            self.active_segment = segment_numbers[-1]
+            self.active_handle = open(self.segment_path(self.active_segment), 'ab')
+
@@ -18,17 +18,82 @@ Module #3 in dependency order
 
 Buffers and manages the flow of incoming event data to downstream modules.
 
+Producers copy events into a bounded ring buffer and return; a single flush
+thread drains it when flush_threshold events are waiting or the oldest one
+is flush_timeout seconds old, and delivers each batch to the Working Memory
+System as one episodic memory per learner/session.
+
 Parent: SPE
 Children: None (leaf node in this branch)
 """
 
-from typing import Dict, List, Any, Optional, Deque, Union
-from collections import deque
+from typing import Dict, List, Any, Optional, Union
 import logging
 from datetime import datetime, timedelta
 import threading
+import time
 from ..base_module import CoreSystemModule
 
+OVERFLOW_POLICIES = ('drop_oldest', 'drop_newest', 'reject', 'block')
+
+class EventRingBuffer:
+    """
+    Fixed-capacity ring of event slots
+
+    head/tail are monotonic counters (slot = counter % capacity); writes and
+    drains copy contiguous slices, so a batch of k events costs O(k) list
+    slicing and never reallocates. Callers provide the locking.
+    """
+    
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.slots: List[Optional[Dict[str, Any]]] = [None] * capacity
+        self.head = 0  # next slot to read
+        self.tail = 0  # next slot to write
+    
+    def __len__(self) -> int:
+        return self.tail - self.head
+    
+    def free(self) -> int:
+        return self.capacity - (self.tail - self.head)
+    
+    def extend(self, events: List[Dict[str, Any]]) -> None:
+        """Append events (the caller has made room for them)"""
+        count = len(events)
+        start = self.tail % self.capacity
+        first = min(count, self.capacity - start)
+        self.slots[start:start + first] = events[:first]
+        if first < count:
+            self.slots[:count - first] = events[first:]
+        self.tail += count
+    
+    def drop_oldest(self, count: int) -> None:
+        """Discard the oldest events"""
+        self.drain(count)
+    
+    def drain(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Remove and return up to limit of the oldest events, in order"""
+        count = len(self) if limit is None else min(limit, len(self))
+        start = self.head % self.capacity
+        first = min(count, self.capacity - start)
+        events = self.slots[start:start + first]
+        self.slots[start:start + first] = [None] * first
+        if first < count:
+            events += self.slots[:count - first]
+            self.slots[:count - first] = [None] * (count - first)
+        self.head += count
+        return events
+    
+    def resize(self, capacity: int) -> int:
+        """Change capacity, keeping the newest events; returns how many were dropped"""
+        events = self.drain()
+        dropped = max(0, len(events) - capacity)
+        self.capacity = capacity
+        self.slots = [None] * capacity
+        self.head = self.tail = 0
+        self.extend(events[dropped:])
+        return dropped
+
 class InputEventBuffer(CoreSystemModule):
     """
     IEB - Input Event Buffer
@@ -41,21 +106,42 @@ class InputEventBuffer(CoreSystemModule):
     
     def __init__(self, parent_spe=None):
         super().__init__("IEB", parent_spe)
-        self.event_buffer: Deque[Dict[str, Any]] = deque()
-        self.buffer_lock = threading.Lock()
         self.max_buffer_size = 1000
+        self.event_buffer = EventRingBuffer(self.max_buffer_size)
+        self.buffer_lock = threading.Lock()  # held only to copy events in or out
+        self.flush_condition = threading.Condition(self.buffer_lock)  # wakes the flush thread
+        self.space_available = threading.Condition(self.buffer_lock)  # wakes blocked producers
+        self.flush_lock = threading.Lock()  # one consumer at a time keeps delivery in order
         self.flush_threshold = 100
         self.flush_timeout = 5.0  # seconds
+        self.backpressure_timeout = 0.05  # seconds a 'block' producer waits for space
         self.last_flush_time = datetime.now()
+        self.oldest_event_time: Optional[float] = None  # monotonic arrival of the oldest buffered event
+        self.flush_requested = False  # set by 'block' producers waiting for space
         self.total_events_processed = 0
         self.buffer_overflow_count = 0
         
+        # Overflow drops are counted under buffer_lock and reported by the
+        # flush path as one summary per overflow_report_interval
+        self.unreported_overflow: Dict[str, int] = {}  # policy -> dropped events
+        self.overflow_report_interval = 10.0  # seconds
+        self.last_overflow_report: Optional[float] = None  # monotonic
+        
+        # Background flush thread and downstream delivery
+        self.flush_thread: Optional[threading.Thread] = None
+        self.flush_stop_event = threading.Event()
+        self.downstream_wms = None
+        self.delivered_batch_count = 0
+        self.downstream_failure_count = 0
+        
         # Initialize specifications
         self.specs = {
             'max_buffer_size': 1000,
             'flush_threshold': 100,
             'flush_timeout_seconds': 5.0,
-            'overflow_handling': 'drop_oldest',
+            'overflow_handling': 'drop_oldest',  # see OVERFLOW_POLICIES
+            'backpressure_timeout_seconds': 0.05,
+            'background_flush': True,
             'persistence': False  # Session-bound only
         }
     
@@ -114,38 +200,50 @@ class InputEventBuffer(CoreSystemModule):
         """
         Add events to the buffer queue
         
+        The lock is only held to copy the events into the ring buffer; the
+        flush thread is signalled and delivery happens off the caller's thread.
+        
         Parameters:
             events: Single event or list of events to buffer
             
         Returns:
-            bool: True if buffering successful
+            bool: False if events were refused ('reject', or 'block' timing out)
         """
         try:
             if isinstance(events, dict):
                 events = [events]
             
+            # Add timestamp if not present (one clock read per call)
+            buffer_timestamp = datetime.now().isoformat()
+            for event in events:
+                if 'buffer_timestamp' not in event:
+                    event['buffer_timestamp'] = buffer_timestamp
+            
             with self.buffer_lock:
-                buffered_count = 0
-                
-                for event in events:
-                    # Add timestamp if not present
-                    if 'buffer_timestamp' not in event:
-                        event['buffer_timestamp'] = datetime.now().isoformat()
-                    
-                    # Check buffer space
-                    if len(self.event_buffer) >= self.max_buffer_size:
-                        self._handle_buffer_overflow()
-                    
-                    self.event_buffer.append(event)
-                    buffered_count += 1
-                    self.total_events_processed += 1
+                # _reserve_space may release the lock ('block'), so the buffer
+                # can be flushed empty before these events go in
+                accepted = self._reserve_space(events)
                 
-                self.logger.debug(f"Buffered {buffered_count} events, buffer size: {len(self.event_buffer)}")
+                deadline_started = False
+                if accepted:
+                    self.event_buffer.extend(accepted)
+                    self.total_events_processed += len(accepted)
+                    if self.oldest_event_time is None:
+                        self.oldest_event_time = time.monotonic()
+                        deadline_started = True
                 
-                # Check if flush is needed
-                self._check_flush_conditions()
+                self.logger.debug(f"Buffered {len(accepted)} events, buffer size: {len(self.event_buffer)}")
                 
-                return True
+                # Wake the flush thread on the threshold, or to start a new deadline
+                flush_due = self._should_flush()
+                if self.flush_thread is not None and (flush_due or deadline_started):
+                    self.flush_condition.notify()
+            
+            # Without a flush thread, flush inline after releasing the lock
+            if flush_due and self.flush_thread is None:
+                self.flush_buffer()
+            
+            return len(accepted) == len(events) or self.specs['overflow_handling'] in ('drop_oldest', 'drop_newest')
                 
         except Exception as e:
             self.logger.error(f"Event buffering failed: {e}")
@@ -162,19 +260,25 @@ class InputEventBuffer(CoreSystemModule):
             List of flushed events
         """
         try:
-            with self.buffer_lock:
-                if not force and not self._should_flush():
-                    return []
-                
-                # Extract events from buffer
-                flushed_events = list(self.event_buffer)
-                self.event_buffer.clear()
-                self.last_flush_time = datetime.now()
+            self._report_buffer_overflow(force=force)
+            
+            with self.flush_lock:
+                with self.buffer_lock:
+                    if not force and not self._should_flush():
+                        return []
+                    
+                    # Extract events from buffer
+                    flushed_events = self.event_buffer.drain()
+                    self.oldest_event_time = None
+                    self.flush_requested = False
+                    self.last_flush_time = datetime.now()
+                    self.space_available.notify_all()
                 
                 self.logger.debug(f"Flushed {len(flushed_events)} events from buffer")
                 
-                # TODO: Send events to Working Memory System
-                self._send_to_downstream(flushed_events)
+                # Deliver outside the buffer lock so producers never wait on WMS
+                if flushed_events:
+                    self._send_to_downstream(flushed_events)
                 
                 return flushed_events
                 
@@ -182,6 +286,26 @@ class InputEventBuffer(CoreSystemModule):
             self.logger.error(f"Buffer flush failed: {e}")
             return []
     
+    def connect_downstream(self, wms_module) -> None:
+        """Deliver flushed batches to a Working Memory System (plain or sharded)"""
+        self.downstream_wms = wms_module
+    
+    def start_flush_thread(self) -> None:
+        """Start the single consumer that flushes on size or deadline"""
+        self.stop_flush_thread()
+        self.flush_stop_event.clear()
+        self.flush_thread = threading.Thread(target=self._flush_loop, daemon=True, name="IEBFlushThread")
+        self.flush_thread.start()
+    
+    def stop_flush_thread(self) -> None:
+        """Stop the flush thread (buffered events stay until the next flush)"""
+        if self.flush_thread:
+            self.flush_stop_event.set()
+            with self.buffer_lock:
+                self.flush_condition.notify_all()
+            self.flush_thread.join(timeout=10.0)
+            self.flush_thread = None
+    
     def get_buffer_status(self) -> Dict[str, Any]:
         """Get current buffer status and statistics"""
         with self.buffer_lock:
@@ -189,6 +313,9 @@ class InputEventBuffer(CoreSystemModule):
             
             return {
                 'buffer_size': len(self.event_buffer),
+                'overflow_handling': self.specs['overflow_handling'],
+                'delivered_batch_count': self.delivered_batch_count,
+                'downstream_failure_count': self.downstream_failure_count,
                 'max_buffer_size': self.max_buffer_size,
                 'buffer_utilization': len(self.event_buffer) / self.max_buffer_size,
                 'total_events_processed': self.total_events_processed,
@@ -209,9 +336,15 @@ class InputEventBuffer(CoreSystemModule):
             bool: True if configuration update successful
         """
         try:
+            if config.get('overflow_handling', self.specs['overflow_handling']) not in OVERFLOW_POLICIES:
+                self.logger.error(f"Unknown overflow policy: {config['overflow_handling']}")
+                return False
+            
             with self.buffer_lock:
                 if 'max_buffer_size' in config:
                     self.max_buffer_size = config['max_buffer_size']
+                    self.buffer_overflow_count += self.event_buffer.resize(self.max_buffer_size)
+                    self.space_available.notify_all()
                 
                 if 'flush_threshold' in config:
                     self.flush_threshold = config['flush_threshold']
@@ -219,6 +352,12 @@ class InputEventBuffer(CoreSystemModule):
                 if 'flush_timeout' in config:
                     self.flush_timeout = config['flush_timeout']
                 
+                if 'overflow_handling' in config:
+                    self.specs['overflow_handling'] = config['overflow_handling']
+                
+                if 'backpressure_timeout' in config:
+                    self.backpressure_timeout = config['backpressure_timeout']
+                
                 self.logger.info(f"Buffer configuration updated: {config}")
                 return True
                 
@@ -236,18 +375,17 @@ class InputEventBuffer(CoreSystemModule):
         self.logger.debug("Buffer management initialized (placeholder)")
     
     def _setup_flush_triggers(self) -> None:
-        """Set up automatic flush triggers"""
-        # TODO: Set up time-based flush triggers
-        # TODO: Set up size-based flush triggers
-        # TODO: Set up event-based flush triggers
-        self.logger.debug("Flush triggers setup (placeholder)")
+        """Set up automatic size/deadline flush triggers"""
+        if self.specs.get('background_flush', True):
+            self.start_flush_thread()
+        self.logger.debug("Flush triggers setup")
     
     def _setup_overflow_handling(self) -> None:
         """Set up buffer overflow handling"""
-        # TODO: Configure overflow policies (drop oldest, drop newest, etc.)
-        # TODO: Set up overflow alerts
-        # TODO: Initialize overflow recovery mechanisms
-        self.logger.debug("Overflow handling setup (placeholder)")
+        if self.specs['overflow_handling'] not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {self.specs['overflow_handling']}")
+        self.backpressure_timeout = self.specs.get('backpressure_timeout_seconds', self.backpressure_timeout)
+        self.logger.debug(f"Overflow handling: {self.specs['overflow_handling']}")
     
     def _setup_buffer_monitoring(self) -> None:
         """Set up buffer performance monitoring"""
@@ -270,22 +408,86 @@ class InputEventBuffer(CoreSystemModule):
         # TODO: Check flush performance
         return True  # Placeholder
     
-    def _handle_buffer_overflow(self) -> None:
-        """Handle buffer overflow situations"""
-        if self.specs['overflow_handling'] == 'drop_oldest':
-            if self.event_buffer:
-                dropped_event = self.event_buffer.popleft()
-                self.buffer_overflow_count += 1
-                self.logger.warning(f"Buffer overflow: dropped oldest event at {dropped_event.get('buffer_timestamp')}")
+    def _reserve_space(self, events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Apply the overflow policy (call with buffer_lock held)
+        
+        Returns the events to append; room for them has been made.
+        - drop_oldest: discard the oldest buffered events
+        - drop_newest / reject: keep what fits, discard the rest of the batch
+        - block: ask the flush thread for an immediate flush and wait up to
+          backpressure_timeout for space, then behave like reject
+        """
+        free = self.event_buffer.free()
+        if len(events) <= free:
+            return events
+        
+        policy = self.specs['overflow_handling']
+        
+        if policy == 'block' and self.flush_thread is not None:
+            needed = min(len(events), self.event_buffer.capacity)
+            deadline = time.monotonic() + self.backpressure_timeout
+            self.flush_requested = True
+            self.flush_condition.notify()
+            while self.event_buffer.free() < needed:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self.space_available.wait(remaining):
+                    break
+            free = self.event_buffer.free()
+            if len(events) <= free:
+                return events
+        
+        if policy == 'drop_oldest':
+            kept = events[-self.event_buffer.capacity:]
+            dropped = len(events) - free
+            self.event_buffer.drop_oldest(len(kept) - free)
+            if len(self.event_buffer) == 0:
+                self.oldest_event_time = None  # restarted when the kept events go in
+        else:
+            kept = events[:free]
+            dropped = len(events) - free
+        
+        self.buffer_overflow_count += dropped
+        self._handle_buffer_overflow(policy, dropped)
+        return kept
+    
+    def _handle_buffer_overflow(self, policy: str, dropped: int) -> None:
+        """Handle buffer overflow situations (call with buffer_lock held; only counts the drops)"""
+        self.unreported_overflow[policy] = self.unreported_overflow.get(policy, 0) + dropped
         
-        # TODO: Implement other overflow strategies
         # TODO: Alert monitoring systems
-        # TODO: Update overflow statistics
     
-    def _check_flush_conditions(self) -> None:
-        """Check if buffer should be flushed based on conditions"""
-        if self._should_flush():
-            self.flush_buffer()
+    def _report_buffer_overflow(self, force: bool = False) -> None:
+        """Log one summary of the drops counted since the last report, at most once per interval"""
+        now = time.monotonic()
+        with self.buffer_lock:
+            if not self.unreported_overflow:
+                return
+            recent = (self.last_overflow_report is not None
+                      and now - self.last_overflow_report < self.overflow_report_interval)
+            if recent and not force:
+                return
+            unreported, self.unreported_overflow = self.unreported_overflow, {}
+            self.last_overflow_report = now
+        
+        summary = ", ".join(f"{dropped} events ({policy})" for policy, dropped in unreported.items())
+        self.logger.warning(f"Buffer overflow: dropped {summary} since the last report")
+    
+    def _flush_loop(self) -> None:
+        """Flush thread: wait for the size or deadline trigger, then flush"""
+        while not self.flush_stop_event.is_set():
+            with self.buffer_lock:
+                while not self.flush_stop_event.is_set() and not self._should_flush():
+                    self.flush_condition.wait(self._time_until_deadline())
+            
+            if not self.flush_stop_event.is_set():
+                self.flush_buffer()
+    
+    def _time_until_deadline(self) -> float:
+        """Seconds until the oldest buffered event reaches flush_timeout"""
+        if self.oldest_event_time is None:
+            return self.flush_timeout
+        return max(0.0, self.oldest_event_time + self.flush_timeout - time.monotonic())
     
     def _should_flush(self) -> bool:
         """Determine if buffer should be flushed"""
@@ -293,32 +495,69 @@ class InputEventBuffer(CoreSystemModule):
         if len(self.event_buffer) >= self.flush_threshold:
             return True
         
-        # Time-based flush condition
-        time_since_flush = datetime.now() - self.last_flush_time
-        if time_since_flush.total_seconds() >= self.flush_timeout:
+        # Deadline flush condition: the oldest buffered event has waited flush_timeout
+        if len(self.event_buffer) and self._time_until_deadline() <= 0:
+            return True
+        
+        # A 'block' producer is waiting for space
+        if self.flush_requested and len(self.event_buffer):
             return True
         
-        # TODO: Add other flush conditions
         # TODO: Add priority-based flushing
         # TODO: Add system load-based flushing
         
         return False
     
     def _send_to_downstream(self, events: List[Dict[str, Any]]) -> None:
-        """Send events to downstream modules (WMS)"""
-        # TODO: Send events to Working Memory System
-        # TODO: Handle downstream communication errors
-        # TODO: Implement retry mechanisms
-        self.logger.debug(f"Sending {len(events)} events to downstream modules (placeholder)")
+        """
+        Send events to downstream modules (WMS)
+        
+        Each batch becomes one episodic memory per learner/session, so WMS
+        takes one store_memory call per session instead of one per event.
+        """
+        if self.downstream_wms is None:
+            self.logger.debug(f"No downstream WMS connected; {len(events)} events not delivered")
+            return
+        
+        sessions: Dict[str, List[Dict[str, Any]]] = {}
+        for event in events:
+            session_key = event.get('learner_id') or event.get('session_id') or 'default'
+            sessions.setdefault(session_key, []).append(event)
+        
+        sharded = hasattr(self.downstream_wms, 'shards')
+        for session_key, session_events in sessions.items():
+            self.delivered_batch_count += 1
+            memory_id = f"ieb_{session_key}_{self.delivered_batch_count}"
+            content = {
+                'source': 'IEB',
+                'session_id': session_key,
+                'event_count': len(session_events),
+                'first_timestamp': session_events[0].get('buffer_timestamp'),
+                'last_timestamp': session_events[-1].get('buffer_timestamp'),
+                'events': session_events
+            }
+            
+            try:
+                if sharded:
+                    stored = self.downstream_wms.store_memory(memory_id, content, 'episodic', learner_id=session_key)
+                else:
+                    stored = self.downstream_wms.store_memory(memory_id, content, 'episodic')
+            except Exception as e:
+                self.logger.error(f"Downstream delivery failed for {memory_id}: {e}")
+                stored = False
+            
+            if not stored:
+                self.downstream_failure_count += 1
+        
+        self.logger.debug(f"Delivered {len(events)} events to WMS as {len(sessions)} memories")
     
     def shutdown(self) -> None:
         """Gracefully shutdown IEB"""
         self.logger.info("Shutting down Input Event Buffer")
         
-        # Flush any remaining events
-        with self.buffer_lock:
-            if self.event_buffer:
-                self.flush_buffer(force=True)
+        # Stop the flush thread, then flush any remaining events
+        self.stop_flush_thread()
+        self.flush_buffer(force=True)
         
         # TODO: Clean up buffer resources
         # TODO: Save buffer statistics if needed
@@ -31,7 +31,16 @@ import math
 import json
 import pickle
 import os
+import re
+import heapq
+import time
+from itertools import islice
 from ..base_module import CoreSystemModule
+from .cold_storage import ColdStorageSegments
+from .ldm_checkpoint import LDMCheckpointStore, OP_PUT, OP_REMOVE, OP_TOUCH
+
+# Terms indexed for search_memories (word runs of the lowercased content)
+SEARCH_TOKEN_PATTERN = re.compile(r'\w+')
 
 class LongTermDeclarativeMemory(CoreSystemModule):
     """
@@ -48,9 +57,20 @@ class LongTermDeclarativeMemory(CoreSystemModule):
     def __init__(self, parent_wms=None):
         super().__init__("LDM", parent_wms)
         self.long_term_memories: Dict[str, Dict[str, Any]] = {}
-        self.memory_index: Dict[str, List[str]] = {}  # Index by keywords/tags
+        # Postings are insertion-ordered sets (dict keys) for O(1) add/remove;
+        # the reverse maps list what each memory is filed under
+        self.memory_index: Dict[str, Dict[str, None]] = {}  # Index by keywords/tags
+        self.memory_keyword_refs: Dict[str, List[str]] = {}  # memory_id -> indexed keywords
         self.memory_lock = threading.Lock()
         
+        # Full-text search index: term -> {memory_id: term frequency}, plus cached
+        # lowercased content and term statistics per memory for BM25 scoring
+        self.search_postings: Dict[str, Dict[str, int]] = {}
+        self.search_documents: Dict[str, Dict[str, Any]] = {}
+        self.search_total_length = 0
+        self.bm25_k1 = 1.2
+        self.bm25_b = 0.75
+        
         # LDM Configuration - Much slower fade than WMS
         self.slow_fade_rate = 0.001  # Very slow fade rate (compared to WMS 0.1)
         self.fade_reset_multiplier = 2.0  # How much access strengthens memory
@@ -60,13 +80,30 @@ class LongTermDeclarativeMemory(CoreSystemModule):
         self.archival_threshold = 0.1  # Memories below this go to cold storage
         
         # Memory organization
-        self.memory_clusters: Dict[str, List[str]] = {}  # Clustered by topic/domain
+        self.memory_clusters: Dict[str, Dict[str, None]] = {}  # Clustered by topic/domain
+        self.memory_cluster_refs: Dict[str, List[str]] = {}  # memory_id -> cluster tags
         self.access_patterns: Dict[str, List[datetime]] = {}  # Track access history
         self.last_fade_cycle = datetime.now()
         
+        # Lazy fade: 'strength' is anchored at 'strength_anchor_time' and decays in
+        # closed form; the queue holds (projected threshold crossing, memory_id) and
+        # an entry is current while it matches the memory's 'fade_due'
+        self.fade_queue: List[Tuple[float, str]] = []
+        
         # Cold storage for rarely accessed memories
         self.cold_storage_path = "data/cold_storage"
-        self.cold_storage_memories: Dict[str, str] = {}  # memory_id -> file_path
+        self.cold_storage_memories: Dict[str, str] = {}  # memory_id -> segment file_path
+        self.cold_storage: Optional[ColdStorageSegments] = None  # Opened by _setup_cold_storage
+        self.cold_storage_segment_size = 64 * 1024 * 1024
+        self.cold_storage_compression = True
+        
+        # Warm restart: periodic snapshot + change log replayed by initialize
+        self.checkpoint_path = "data/ldm_checkpoint"
+        self.checkpoint_interval = 300  # seconds between background snapshots
+        self.checkpoint_store: Optional[LDMCheckpointStore] = None
+        self.checkpoint_lock = threading.Lock()  # one snapshot at a time
+        self.checkpoint_thread: Optional[threading.Thread] = None
+        self.checkpoint_stop_event = threading.Event()
         
         # Initialize specifications
         self.specs = {
@@ -79,7 +116,11 @@ class LongTermDeclarativeMemory(CoreSystemModule):
             'memory_types': ['consolidated_episodic', 'consolidated_semantic', 'consolidated_procedural'],
             'indexing_enabled': True,
             'clustering_enabled': True,
-            'cold_storage_enabled': True
+            'cold_storage_enabled': True,
+            'cold_storage_format': 'append_only_segments',
+            'cold_storage_compression': 'zlib',
+            'checkpointing_enabled': True,
+            'checkpoint_interval_seconds': 300
         }
     
     def initialize(self) -> bool:
@@ -101,6 +142,9 @@ class LongTermDeclarativeMemory(CoreSystemModule):
             # Set up cold storage
             self._setup_cold_storage()
             
+            # Restore the last snapshot and change log, start background snapshots
+            self._setup_checkpointing()
+            
             # Initialize fade processing
             self._setup_fade_processing()
             
@@ -158,48 +202,91 @@ class LongTermDeclarativeMemory(CoreSystemModule):
         Returns:
             bool: True if consolidation successful
         """
+        return memory_id in self.consolidate_many([(memory_id, wms_memory)])
+    
+    def consolidate_many(self, wms_memories: List[Tuple[str, Dict[str, Any]]]) -> List[str]:
+        """
+        Consolidate a batch of WMS memories into long-term storage
+        
+        Entries are built and tokenized before taking memory_lock; the lock is
+        then held once for the whole batch and the change log gets one write.
+        
+        Parameters:
+            wms_memories: (memory_id, memory data from WMS) pairs
+            
+        Returns:
+            List of memory ids consolidated successfully
+        """
+        prepared = []
+        for memory_id, wms_memory in wms_memories:
+            try:
+                lt_memory = self._create_long_term_memory(wms_memory)
+                prepared.append((memory_id, lt_memory, self._analyze_search_document(lt_memory)))
+            except Exception as e:
+                self.logger.error(f"Memory consolidation failed for {memory_id}: {e}")
+        
+        consolidated = []
         try:
             with self.memory_lock:
-                # Create long-term memory entry
-                lt_memory = {
-                    'content': wms_memory['content'],
-                    'memory_type': f"consolidated_{wms_memory['memory_type']}",
-                    'original_creation_time': wms_memory['creation_time'],
-                    'consolidation_time': datetime.now(),
-                    'last_access_time': datetime.now(),
-                    'access_count': wms_memory.get('access_count', 1),
-                    'strength': wms_memory.get('strength', 1.0),
-                    'consolidation_score': wms_memory.get('consolidation_score', 1.0),
-                    'temporal_context': wms_memory.get('temporal_context', {}),
-                    'fade_resistance': self._calculate_initial_fade_resistance(wms_memory),
-                    'importance_score': self._calculate_importance_score(wms_memory),
-                    'keywords': self._extract_keywords(wms_memory['content']),
-                    'cluster_tags': self._identify_cluster_tags(wms_memory['content'])
-                }
-                
-                # Store in long-term memory
-                self.long_term_memories[memory_id] = lt_memory
-                
-                # Update index
-                self._update_memory_index(memory_id, lt_memory)
-                
-                # Update clustering
-                self._update_memory_clustering(memory_id, lt_memory)
-                
-                # Initialize access pattern tracking
-                self.access_patterns[memory_id] = [datetime.now()]
+                now = time.time()
+                try:
+                    for memory_id, lt_memory, search_document in prepared:
+                        lt_memory['strength_anchor_time'] = now
+                    
+                        # Store in long-term memory (re-consolidation replaces the old entry)
+                        if memory_id in self.long_term_memories:
+                            self._unindex_memory(memory_id)
+                        self.long_term_memories[memory_id] = lt_memory
+                    
+                        # Update index
+                        self._add_postings(self.memory_index, self.memory_keyword_refs, memory_id, lt_memory['keywords'])
+                        self._index_search_document(memory_id, lt_memory, search_document)
+                    
+                        # Update clustering
+                        self._update_memory_clustering(memory_id, lt_memory)
+                    
+                        # Initialize access pattern tracking
+                        self.access_patterns[memory_id] = [lt_memory['consolidation_time']]
+                    
+                        # Schedule the fade threshold crossing
+                        self._schedule_fade(memory_id, lt_memory)
+                    
+                        consolidated.append(memory_id)
                 
-                self.logger.debug(f"Consolidated memory {memory_id} from WMS to LDM")
-                return True
+                finally:
+                    self._log_changes([(OP_PUT, memory_id, self.long_term_memories[memory_id]) for memory_id in consolidated])
                 
+            self.logger.debug(f"Consolidated {len(consolidated)} memories from WMS to LDM")
+            
         except Exception as e:
-            self.logger.error(f"Memory consolidation failed for {memory_id}: {e}")
-            return False
+            self.logger.error(f"Batch consolidation failed after {len(consolidated)} of {len(prepared)} memories: {e}")
+        
+        return consolidated
+    
+    def _create_long_term_memory(self, wms_memory: Dict[str, Any]) -> Dict[str, Any]:
+        """Create a long-term memory entry from WMS memory data"""
+        return {
+            'content': wms_memory['content'],
+            'memory_type': f"consolidated_{wms_memory['memory_type']}",
+            'original_creation_time': wms_memory['creation_time'],
+            'consolidation_time': datetime.now(),
+            'last_access_time': datetime.now(),
+            'access_count': wms_memory.get('access_count', 1),
+            'strength': wms_memory.get('strength', 1.0),
+            'strength_anchor_time': time.time(),
+            'consolidation_score': wms_memory.get('consolidation_score', 1.0),
+            'temporal_context': wms_memory.get('temporal_context', {}),
+            'fade_resistance': self._calculate_initial_fade_resistance(wms_memory),
+            'importance_score': self._calculate_importance_score(wms_memory),
+            'keywords': self._extract_keywords(wms_memory['content']),
+            'cluster_tags': self._identify_cluster_tags(wms_memory['content'])
+        }
     
     def retrieve_memory(self, memory_id: str) -> Optional[Dict[str, Any]]:
         """
         Retrieve a memory from long-term storage
-        Access resets the fade clock for this memory
+        Access resets the fade clock for this memory; only the new fade clock
+        is logged (as a touch record, after memory_lock is released)
         
         Parameters:
             memory_id: Identifier of memory to retrieve
@@ -219,8 +306,8 @@ class LongTermDeclarativeMemory(CoreSystemModule):
                     # Update access patterns
                     self._update_access_patterns(memory_id)
                     
-                    self.logger.debug(f"Retrieved memory {memory_id} from active LTM")
-                    return memory['content']
+                    touch = (memory['strength'], memory['strength_anchor_time'], memory['access_count'])
+                    content = memory['content']
                 
                 # Check cold storage
                 elif memory_id in self.cold_storage_memories:
@@ -230,8 +317,15 @@ class LongTermDeclarativeMemory(CoreSystemModule):
                         self._reactivate_from_cold_storage(memory_id, memory_content)
                         self.logger.debug(f"Retrieved and reactivated memory {memory_id} from cold storage")
                         return memory_content['content']
+                    return None
                 
-                return None
+                else:
+                    return None
+            
+            self._log_changes([(OP_TOUCH, memory_id, touch)])
+            
+            self.logger.debug(f"Retrieved memory {memory_id} from active LTM")
+            return content
                 
         except Exception as e:
             self.logger.error(f"Memory retrieval failed for {memory_id}: {e}")
@@ -241,6 +335,11 @@ class LongTermDeclarativeMemory(CoreSystemModule):
         """
         Search memories by content, keywords, or semantic similarity
         
+        Candidates come from the term index, are ranked with BM25 over the
+        cached lowercased content and kept in a bounded top-k heap. The lock
+        is only held to copy the query's postings and to apply the light
+        access update, so search does not stall consolidation.
+        
         Parameters:
             query: Search query
             max_results: Maximum number of results to return
@@ -249,24 +348,43 @@ class LongTermDeclarativeMemory(CoreSystemModule):
             List of (memory_id, memory_content, relevance_score) tuples
         """
         try:
-            results = []
             query_lower = query.lower()
+            query_terms = set(SEARCH_TOKEN_PATTERN.findall(query_lower))
             
+            # Snapshot the postings for the query terms only
             with self.memory_lock:
-                for memory_id, memory in self.long_term_memories.items():
-                    relevance_score = self._calculate_relevance_score(query_lower, memory)
-                    
-                    if relevance_score > 0.1:  # Minimum relevance threshold
-                        results.append((memory_id, memory['content'], relevance_score))
-                
-                # Sort by relevance score
-                results.sort(key=lambda x: x[2], reverse=True)
+                document_count = len(self.search_documents)
+                average_length = self.search_total_length / document_count if document_count else 0.0
+                postings = {
+                    term: list(self.search_postings[term].items())
+                    for term in query_terms if term in self.search_postings
+                }
+            
+            if not postings:
+                return []
+            
+            content_scores = self._calculate_bm25_scores(postings, document_count, average_length)
+            
+            scored = []
+            for memory_id, content_score in content_scores.items():
+                relevance_score = self._calculate_relevance_score(query_lower, query_terms, memory_id, content_score)
                 
+                if relevance_score > 0.1:  # Minimum relevance threshold
+                    scored.append((memory_id, relevance_score))
+            
+            top_matches = heapq.nlargest(max_results, scored, key=lambda x: x[1])
+            
+            results = []
+            with self.memory_lock:
                 # Update access for retrieved memories (light touch)
-                for memory_id, _, _ in results[:max_results]:
+                for memory_id, relevance_score in top_matches:
+                    memory = self.long_term_memories.get(memory_id)
+                    if memory is None:
+                        continue  # Forgotten or archived since scoring
                     self._light_access_update(memory_id)
-                
-                return results[:max_results]
+                    results.append((memory_id, memory['content'], relevance_score))
+            
+            return results
                 
         except Exception as e:
             self.logger.error(f"Memory search failed for query '{query}': {e}")
@@ -284,13 +402,13 @@ class LongTermDeclarativeMemory(CoreSystemModule):
             List of (memory_id, memory_content) tuples
         """
         try:
-            if cluster_tag not in self.memory_clusters:
-                return []
-            
             results = []
-            memory_ids = self.memory_clusters[cluster_tag][:max_results]
             
             with self.memory_lock:
+                if cluster_tag not in self.memory_clusters:
+                    return []
+                
+                memory_ids = list(islice(self.memory_clusters[cluster_tag], max_results))
                 for memory_id in memory_ids:
                     if memory_id in self.long_term_memories:
                         memory = self.long_term_memories[memory_id]
@@ -304,10 +422,13 @@ class LongTermDeclarativeMemory(CoreSystemModule):
             self.logger.error(f"Cluster retrieval failed for '{cluster_tag}': {e}")
             return []
     
-    def process_fade_cycle(self) -> Dict[str, int]:
+    def process_fade_cycle(self, now: Optional[float] = None) -> Dict[str, int]:
         """
         Process the slow fade cycle for all memories
         
+        Parameters:
+            now: Epoch seconds to fade up to (defaults to the current time)
+            
         Returns:
             Statistics about the fade cycle
         """
@@ -322,37 +443,49 @@ class LongTermDeclarativeMemory(CoreSystemModule):
                 
                 memories_to_remove = []
                 memories_to_archive = []
+                memories_to_reschedule = []
+                now = now or time.time()
                 
-                for memory_id, memory in self.long_term_memories.items():
-                    # Calculate time since last access
-                    time_since_access = datetime.now() - memory['last_access_time']
+                # Only memories whose projected crossing time has passed are touched
+                while self.fade_queue and self.fade_queue[0][0] <= now:
+                    crossing_time, memory_id = heapq.heappop(self.fade_queue)
+                    memory = self.long_term_memories.get(memory_id)
+                    if memory is None or memory.get('fade_due') != crossing_time:
+                        continue  # Stale entry (accessed, archived or forgotten since)
+                    memory['fade_due'] = None
                     
-                    # Apply slow fade
-                    fade_factor = self._calculate_slow_fade_factor(time_since_access, memory)
-                    memory['strength'] *= fade_factor
+                    strength = self._current_strength(memory, now)
                     
                     stats['processed'] += 1
                     
-                    if memory['strength'] > 0:
+                    if strength > 0:
                         stats['faded'] += 1
                     
                     # Check if memory should be forgotten
-                    if memory['strength'] < self.minimum_strength:
+                    if strength < self.minimum_strength:
                         memories_to_remove.append(memory_id)
                         stats['forgotten'] += 1
                     
                     # Check if memory should be archived to cold storage
-                    elif memory['strength'] < self.archival_threshold:
+                    elif strength < self.archival_threshold:
+                        self._anchor_strength(memory, strength, now)
                         memories_to_archive.append(memory_id)
                         stats['archived'] += 1
+                    
+                    else:
+                        self._anchor_strength(memory, strength, now)
+                        memories_to_reschedule.append(memory_id)
+                
+                # Pushed after draining so a rescheduled entry cannot be popped again this cycle
+                for memory_id in memories_to_reschedule:
+                    self._schedule_fade(memory_id, self.long_term_memories[memory_id])
                 
                 # Remove forgotten memories
                 for memory_id in memories_to_remove:
                     self._forget_memory(memory_id)
                 
-                # Archive weak memories to cold storage
-                for memory_id in memories_to_archive:
-                    self._archive_to_cold_storage(memory_id)
+                # Archive weak memories to cold storage (one segment write per cycle)
+                self._archive_batch_to_cold_storage(memories_to_archive)
                 
                 self.last_fade_cycle = datetime.now()
                 
@@ -397,8 +530,14 @@ class LongTermDeclarativeMemory(CoreSystemModule):
         """Initialize memory storage structures"""
         self.long_term_memories = {}
         self.memory_index = {}
+        self.memory_keyword_refs = {}
+        self.search_postings = {}
+        self.search_documents = {}
+        self.search_total_length = 0
         self.memory_clusters = {}
+        self.memory_cluster_refs = {}
         self.access_patterns = {}
+        self.fade_queue = []
         self.cold_storage_memories = {}
         self.logger.debug("Memory storage structures initialized")
     
@@ -415,7 +554,18 @@ class LongTermDeclarativeMemory(CoreSystemModule):
     def _setup_cold_storage(self) -> None:
         """Set up cold storage system"""
         os.makedirs(self.cold_storage_path, exist_ok=True)
-        self.logger.debug("Cold storage system setup")
+        if self.cold_storage is not None:
+            self.cold_storage.close()
+        
+        # Reopening the segments rebuilds the offset index of archived memories
+        self.cold_storage = ColdStorageSegments(
+            self.cold_storage_path,
+            segment_size=self.cold_storage_segment_size,
+            compress=self.cold_storage_compression
+        )
+        self._refresh_cold_storage_paths()
+        
+        self.logger.debug(f"Cold storage system setup ({len(self.cold_storage)} archived memories)")
     
     def _setup_fade_processing(self) -> None:
         """Set up fade processing mechanisms"""
@@ -434,18 +584,36 @@ class LongTermDeclarativeMemory(CoreSystemModule):
     
     def _validate_memory_index(self) -> bool:
         """Validate memory index consistency"""
-        # TODO: Implement index validation
-        return True  # Placeholder
+        return self._validate_postings(self.memory_index, self.memory_keyword_refs, "keyword index")
     
     def _validate_memory_clusters(self) -> bool:
         """Validate memory clustering consistency"""
-        # TODO: Implement cluster validation
-        return True  # Placeholder
+        return self._validate_postings(self.memory_clusters, self.memory_cluster_refs, "clusters")
+    
+    def _validate_postings(self, postings: Dict[str, Dict[str, None]],
+                           reverse_map: Dict[str, List[str]], name: str) -> bool:
+        """Check that postings and their reverse map describe the same (key, memory) pairs"""
+        posted = sum(len(memory_ids) for memory_ids in postings.values())
+        referenced = sum(len(keys) for keys in reverse_map.values())
+        
+        if posted != referenced or any(
+            memory_id not in postings.get(key, ()) for memory_id, keys in reverse_map.items() for key in keys
+        ):
+            self.logger.error(f"Memory {name} out of sync with its reverse map")
+            return False
+        
+        return True
     
     def _validate_cold_storage(self) -> bool:
         """Validate cold storage integrity"""
-        # TODO: Implement cold storage validation
-        return True  # Placeholder
+        if self.cold_storage is None:
+            return not self.cold_storage_memories
+        
+        if set(self.cold_storage_memories) != set(self.cold_storage.offset_index):
+            self.logger.error("Cold storage index out of sync with segment files")
+            return False
+        
+        return True
     
     def _calculate_initial_fade_resistance(self, wms_memory: Dict[str, Any]) -> float:
         """Calculate initial fade resistance based on WMS history"""
@@ -487,19 +655,80 @@ class LongTermDeclarativeMemory(CoreSystemModule):
     
     def _update_memory_index(self, memory_id: str, memory: Dict[str, Any]) -> None:
         """Update the memory index with new memory"""
-        for keyword in memory['keywords']:
-            if keyword not in self.memory_index:
-                self.memory_index[keyword] = []
-            if memory_id not in self.memory_index[keyword]:
-                self.memory_index[keyword].append(memory_id)
+        self._add_postings(self.memory_index, self.memory_keyword_refs, memory_id, memory['keywords'])
+        
+        self._index_search_document(memory_id, memory)
+    
+    def _analyze_search_document(self, memory: Dict[str, Any]) -> Dict[str, Any]:
+        """Tokenize a memory for the search index (no shared state; safe outside the lock)"""
+        content_lower = str(memory['content']).lower()
+        term_counts: Dict[str, int] = {}
+        for term in SEARCH_TOKEN_PATTERN.findall(content_lower):
+            term_counts[term] = term_counts.get(term, 0) + 1
+        
+        return {
+            'content_lower': content_lower,
+            'length': sum(term_counts.values()),
+            'terms': term_counts,
+            'keywords': set(SEARCH_TOKEN_PATTERN.findall(' '.join(memory['keywords']).lower()))
+        }
+    
+    def _index_search_document(self, memory_id: str, memory: Dict[str, Any],
+                               document: Optional[Dict[str, Any]] = None) -> None:
+        """Add a memory to the full-text search index (replacing any previous entry)"""
+        self._unindex_search_document(memory_id)
+        
+        document = document or self._analyze_search_document(memory)
+        for term, count in document['terms'].items():
+            self.search_postings.setdefault(term, {})[memory_id] = count
+        
+        self.search_documents[memory_id] = document
+        self.search_total_length += document['length']
+    
+    def _unindex_search_document(self, memory_id: str) -> None:
+        """Remove a memory from the full-text search index"""
+        document = self.search_documents.pop(memory_id, None)
+        if document is None:
+            return
+        
+        for term in document['terms']:
+            postings = self.search_postings.get(term)
+            if postings is not None:
+                postings.pop(memory_id, None)
+                if not postings:
+                    del self.search_postings[term]
+        
+        self.search_total_length -= document['length']
     
     def _update_memory_clustering(self, memory_id: str, memory: Dict[str, Any]) -> None:
         """Update memory clustering with new memory"""
-        for cluster_tag in memory['cluster_tags']:
-            if cluster_tag not in self.memory_clusters:
-                self.memory_clusters[cluster_tag] = []
-            if memory_id not in self.memory_clusters[cluster_tag]:
-                self.memory_clusters[cluster_tag].append(memory_id)
+        self._add_postings(self.memory_clusters, self.memory_cluster_refs, memory_id, memory['cluster_tags'])
+    
+    def _add_postings(self, postings: Dict[str, Dict[str, None]], reverse_map: Dict[str, List[str]],
+                      memory_id: str, keys: List[str]) -> None:
+        """File a memory under each key, recording the keys in the reverse map"""
+        filed = reverse_map.setdefault(memory_id, [])
+        for key in keys:
+            memory_ids = postings.setdefault(key, {})
+            if memory_id not in memory_ids:
+                memory_ids[memory_id] = None
+                filed.append(key)
+    
+    def _remove_postings(self, postings: Dict[str, Dict[str, None]], reverse_map: Dict[str, List[str]],
+                         memory_id: str) -> None:
+        """Remove a memory from the keys it was filed under (cost ~ its own keys)"""
+        for key in reverse_map.pop(memory_id, []):
+            memory_ids = postings.get(key)
+            if memory_ids is not None:
+                memory_ids.pop(memory_id, None)
+                if not memory_ids:
+                    del postings[key]
+    
+    def _unindex_memory(self, memory_id: str) -> None:
+        """Remove a memory from the keyword index, clusters and search index"""
+        self._remove_postings(self.memory_index, self.memory_keyword_refs, memory_id)
+        self._remove_postings(self.memory_clusters, self.memory_cluster_refs, memory_id)
+        self._unindex_search_document(memory_id)
     
     def _reset_fade_clock(self, memory_id: str, memory: Dict[str, Any]) -> None:
         """Reset the fade clock for an accessed memory"""
@@ -508,8 +737,10 @@ class LongTermDeclarativeMemory(CoreSystemModule):
         memory['access_count'] += 1
         
         # Strengthen memory (fade reset)
+        now = time.time()
         strength_boost = self.fade_reset_multiplier * memory.get('fade_resistance', 1.0)
-        memory['strength'] = min(1.0, memory['strength'] + (strength_boost * 0.1))
+        self._anchor_strength(memory, min(1.0, self._current_strength(memory, now) + (strength_boost * 0.1)), now)
+        self._schedule_fade(memory_id, memory)
         
         self.logger.debug(f"Reset fade clock for memory {memory_id}, new strength: {memory['strength']:.3f}")
     
@@ -530,37 +761,111 @@ class LongTermDeclarativeMemory(CoreSystemModule):
             memory = self.long_term_memories[memory_id]
             memory['last_access_time'] = datetime.now()
             # Small strength boost (much less than full reset)
-            memory['strength'] = min(1.0, memory['strength'] + 0.01)
+            now = time.time()
+            self._anchor_strength(memory, min(1.0, self._current_strength(memory, now) + 0.01), now)
+            self._schedule_fade(memory_id, memory)
+    
+    def _calculate_bm25_scores(self, postings: Dict[str, List[Tuple[str, int]]],
+                               document_count: int, average_length: float) -> Dict[str, float]:
+        """BM25 content scores for every candidate, normalized to 0-1 by the best possible score"""
+        k1, b = self.bm25_k1, self.bm25_b
+        scores: Dict[str, float] = {}
+        max_score = 0.0
+        
+        for term_postings in postings.values():
+            document_frequency = len(term_postings)
+            idf = math.log(1 + (document_count - document_frequency + 0.5) / (document_frequency + 0.5))
+            max_score += idf * (k1 + 1)
+            
+            for memory_id, term_frequency in term_postings:
+                document = self.search_documents.get(memory_id)
+                length = document['length'] if document else average_length
+                length_norm = 1 - b + b * (length / average_length if average_length else 1.0)
+                scores[memory_id] = scores.get(memory_id, 0.0) + (
+                    idf * term_frequency * (k1 + 1) / (term_frequency + k1 * length_norm)
+                )
+        
+        if max_score > 0:
+            for memory_id in scores:
+                scores[memory_id] /= max_score
+        
+        return scores
     
-    def _calculate_relevance_score(self, query: str, memory: Dict[str, Any]) -> float:
+    def _calculate_relevance_score(self, query: str, query_terms: set, memory_id: str, content_score: float) -> float:
         """Calculate relevance score for search query"""
+        memory = self.long_term_memories.get(memory_id)
+        document = self.search_documents.get(memory_id)
+        if memory is None or document is None:
+            return 0.0
+        
         score = 0.0
         
         # Check keywords
-        for keyword in memory['keywords']:
-            if query in keyword or keyword in query:
-                score += 0.3
+        score += 0.3 * len(query_terms & document['keywords'])
         
-        # Check content (simple text matching)
-        content_str = str(memory['content']).lower()
-        if query in content_str:
+        # Check content (BM25, or the whole query appearing verbatim)
+        if query in document['content_lower']:
             score += 0.5
+        else:
+            score += 0.5 * content_score
         
         # Boost score based on memory strength and importance
-        score *= memory['strength'] * memory.get('importance_score', 0.5)
+        score *= self._current_strength(memory) * memory.get('importance_score', 0.5)
         
         return min(1.0, score)
     
-    def _calculate_slow_fade_factor(self, time_since_access: timedelta, memory: Dict[str, Any]) -> float:
-        """Calculate slow fade factor based on time since access"""
-        hours_since_access = time_since_access.total_seconds() / 3600
-        fade_resistance = memory.get('fade_resistance', 1.0)
+    def _fade_rate(self, memory: Dict[str, Any]) -> float:
+        """Per-hour exponential fade rate of a memory"""
+        return self.slow_fade_rate / memory.get('fade_resistance', 1.0)
+    
+    def _current_strength(self, memory: Dict[str, Any], now: Optional[float] = None) -> float:
+        """Effective strength: the anchored strength decayed in closed form since its anchor time"""
+        anchor_time = memory.get('strength_anchor_time')
+        if anchor_time is None:
+            return memory['strength']
+        
+        hours = max(0.0, ((now or time.time()) - anchor_time) / 3600)
+        return memory['strength'] * math.exp(-self._fade_rate(memory) * hours)
+    
+    def _anchor_strength(self, memory: Dict[str, Any], strength: float, now: float) -> None:
+        """Re-anchor a memory's strength at the given time"""
+        memory['strength'] = strength
+        memory['strength_anchor_time'] = now
+    
+    def _schedule_fade(self, memory_id: str, memory: Dict[str, Any]) -> None:
+        """Queue the time at which the memory will fade below archival_threshold"""
+        if memory.get('strength_anchor_time') is None:
+            memory['strength_anchor_time'] = time.time()
+        
+        anchor_time = memory['strength_anchor_time']
+        rate = self._fade_rate(memory)
+        
+        # Below archival_threshold is due at once; the cycle then forgets or archives it
+        if memory['strength'] < self.archival_threshold:
+            crossing_time = anchor_time
+        elif rate <= 0:
+            memory['fade_due'] = None
+            return  # Never fades
+        else:
+            crossing_time = anchor_time + math.log(memory['strength'] / self.archival_threshold) / rate * 3600
         
-        # Very slow exponential decay, modified by fade resistance
-        effective_fade_rate = self.slow_fade_rate / fade_resistance
-        fade_factor = math.exp(-effective_fade_rate * hours_since_access)
+        memory['fade_due'] = crossing_time
+        heapq.heappush(self.fade_queue, (crossing_time, memory_id))
+        
+        # Accesses leave stale entries behind; rebuild once they dominate the queue
+        if len(self.fade_queue) > 2 * len(self.long_term_memories) + 64:
+            self._rebuild_fade_queue()
+    
+    def _rebuild_fade_queue(self) -> None:
+        """Rebuild the fade queue from the current anchors, dropping stale entries"""
+        current = {}
+        for crossing_time, memory_id in self.fade_queue:
+            memory = self.long_term_memories.get(memory_id)
+            if memory is not None and memory.get('fade_due') == crossing_time:
+                current[memory_id] = (crossing_time, memory_id)
         
-        return max(0.01, fade_factor)  # Minimum fade factor
+        self.fade_queue = list(current.values())
+        heapq.heapify(self.fade_queue)
     
     def _forget_memory(self, memory_id: str) -> None:
         """Completely forget a memory (remove from all systems)"""
@@ -568,58 +873,67 @@ class LongTermDeclarativeMemory(CoreSystemModule):
         if memory_id in self.long_term_memories:
             del self.long_term_memories[memory_id]
         
-        # Remove from index
-        for keyword_list in self.memory_index.values():
-            if memory_id in keyword_list:
-                keyword_list.remove(memory_id)
-        
-        # Remove from clusters
-        for cluster_list in self.memory_clusters.values():
-            if memory_id in cluster_list:
-                cluster_list.remove(memory_id)
+        # Remove from index and clusters
+        self._unindex_memory(memory_id)
         
         # Remove access patterns
         if memory_id in self.access_patterns:
             del self.access_patterns[memory_id]
         
+        self._log_changes([(OP_REMOVE, memory_id, None)])
+        
         self.logger.debug(f"Forgot memory {memory_id} due to insufficient strength")
     
     def _archive_to_cold_storage(self, memory_id: str) -> None:
         """Archive a memory to cold storage"""
-        if memory_id not in self.long_term_memories:
+        self._archive_batch_to_cold_storage([memory_id])
+    
+    def _archive_batch_to_cold_storage(self, memory_ids: List[str]) -> None:
+        """Archive memories to cold storage with a single segment write"""
+        batch = [(memory_id, self.long_term_memories[memory_id])
+                 for memory_id in memory_ids if memory_id in self.long_term_memories]
+        if not batch:
             return
         
-        memory = self.long_term_memories[memory_id]
-        
-        # Save to cold storage file
-        storage_file = os.path.join(self.cold_storage_path, f"{memory_id}.pkl")
-        
         try:
-            with open(storage_file, 'wb') as f:
-                pickle.dump(memory, f)
+            if self.cold_storage is None:
+                self._setup_cold_storage()
             
-            # Track in cold storage index
-            self.cold_storage_memories[memory_id] = storage_file
+            # Save to cold storage segment
+            storage_files = self.cold_storage.write_batch(batch)
             
-            # Remove from active memory
-            del self.long_term_memories[memory_id]
+            for memory_id, _ in batch:
+                # Track in cold storage index
+                self.cold_storage_memories[memory_id] = storage_files[memory_id]
+                
+                # Remove from active memory, index and clusters
+                del self.long_term_memories[memory_id]
+                self._unindex_memory(memory_id)
+            
+            self._log_changes([(OP_REMOVE, memory_id, None) for memory_id, _ in batch])
             
-            self.logger.debug(f"Archived memory {memory_id} to cold storage")
+            self.logger.debug(f"Archived {len(batch)} memories to cold storage")
+            
+            compaction = self.cold_storage.compact()
+            if compaction['segments_compacted']:
+                self._refresh_cold_storage_paths()
+                self.logger.debug(f"Compacted cold storage: {compaction}")
             
         except Exception as e:
-            self.logger.error(f"Failed to archive memory {memory_id}: {e}")
+            self.logger.error(f"Failed to archive {len(batch)} memories: {e}")
+    
+    def _refresh_cold_storage_paths(self) -> None:
+        """Point cold_storage_memories at the segment currently holding each memory"""
+        for memory_id, location in self.cold_storage.offset_index.items():
+            self.cold_storage_memories[memory_id] = self.cold_storage.segment_path(location[0])
     
     def _retrieve_from_cold_storage(self, memory_id: str) -> Optional[Dict[str, Any]]:
         """Retrieve a memory from cold storage"""
-        if memory_id not in self.cold_storage_memories:
+        if memory_id not in self.cold_storage_memories or self.cold_storage is None:
             return None
         
-        storage_file = self.cold_storage_memories[memory_id]
-        
         try:
-            with open(storage_file, 'rb') as f:
-                memory = pickle.load(f)
-            return memory
+            return self.cold_storage.read(memory_id)
             
         except Exception as e:
             self.logger.error(f"Failed to retrieve memory {memory_id} from cold storage: {e}")
@@ -628,8 +942,9 @@ class LongTermDeclarativeMemory(CoreSystemModule):
     def _reactivate_from_cold_storage(self, memory_id: str, memory: Dict[str, Any]) -> None:
         """Reactivate a memory from cold storage to active storage"""
         try:
-            # Move back to active storage
+            # Move back to active storage (strength was frozen while archived)
             self.long_term_memories[memory_id] = memory
+            memory['strength_anchor_time'] = time.time()
             
             # Reset fade clock due to access
             self._reset_fade_clock(memory_id, memory)
@@ -639,23 +954,182 @@ class LongTermDeclarativeMemory(CoreSystemModule):
             self._update_memory_clustering(memory_id, memory)
             
             # Remove from cold storage
-            storage_file = self.cold_storage_memories[memory_id]
-            if os.path.exists(storage_file):
-                os.remove(storage_file)
-            
+            self.cold_storage.delete([memory_id])
             del self.cold_storage_memories[memory_id]
             
+            self._log_changes([(OP_PUT, memory_id, memory)])
+            
             self.logger.debug(f"Reactivated memory {memory_id} from cold storage")
             
         except Exception as e:
             self.logger.error(f"Failed to reactivate memory {memory_id}: {e}")
     
+    def create_checkpoint(self) -> Dict[str, Any]:
+        """
+        Write a snapshot of active memories, index, clusters and access patterns
+        
+        The state is encoded and the change log rotated under memory_lock;
+        compression and the disk write happen after the lock is released.
+        """
+        if self.checkpoint_store is None:
+            return {'error': 'checkpointing not set up'}
+        
+        try:
+            with self.checkpoint_lock:
+                started = time.time()
+                with self.memory_lock:
+                    encoded_state = self.checkpoint_store.encode_state(self._checkpoint_state())
+                    generation = self.checkpoint_store.rotate()
+                    memory_count = len(self.long_term_memories)
+                
+                snapshot_bytes = self.checkpoint_store.write_snapshot(generation, encoded_state)
+                
+                stats = {
+                    'generation': generation,
+                    'memories': memory_count,
+                    'snapshot_bytes': snapshot_bytes,
+                    'duration_seconds': time.time() - started
+                }
+                self.logger.debug(f"LDM checkpoint written: {stats}")
+                return stats
+            
+        except Exception as e:
+            self.logger.error(f"LDM checkpoint failed: {e}")
+            return {'error': str(e)}
+    
+    def _setup_checkpointing(self) -> None:
+        """Restore from the checkpoint files and start the background snapshot thread"""
+        self.stop_checkpointing()
+        if self.checkpoint_store is not None:
+            self.checkpoint_store.close()
+        
+        self.checkpoint_store = LDMCheckpointStore(self.checkpoint_path)
+        self._restore_from_checkpoint()
+        
+        if self.specs.get('checkpointing_enabled', True) and self.checkpoint_interval > 0:
+            self.checkpoint_stop_event.clear()
+            self.checkpoint_thread = threading.Thread(
+                target=self._checkpoint_loop, daemon=True, name="LDMCheckpointThread"
+            )
+            self.checkpoint_thread.start()
+    
+    def stop_checkpointing(self) -> None:
+        """Stop the background snapshot thread"""
+        if self.checkpoint_thread:
+            self.checkpoint_stop_event.set()
+            self.checkpoint_thread.join(timeout=10.0)
+            self.checkpoint_thread = None
+    
+    def _checkpoint_loop(self) -> None:
+        """Background snapshot loop"""
+        while not self.checkpoint_stop_event.wait(self.checkpoint_interval):
+            self.create_checkpoint()
+    
+    def _checkpoint_state(self) -> Dict[str, Any]:
+        """State persisted in a snapshot (search index and fade queue are rebuilt on load)"""
+        return {
+            'long_term_memories': self.long_term_memories,
+            'memory_index': self.memory_index,
+            'memory_keyword_refs': self.memory_keyword_refs,
+            'memory_clusters': self.memory_clusters,
+            'memory_cluster_refs': self.memory_cluster_refs,
+            'access_patterns': self.access_patterns,
+            'last_fade_cycle': self.last_fade_cycle
+        }
+    
+    def _restore_from_checkpoint(self) -> None:
+        """
+        Load the latest snapshot and replay the change logs written after it
+        
+        An unreadable snapshot is set aside and the remaining change logs are
+        replayed on an empty memory instead of failing initialize().
+        """
+        try:
+            generation, state = self.checkpoint_store.load_snapshot()
+        except Exception as e:
+            corrupt_path = self.checkpoint_store.set_aside_snapshot()
+            self.logger.error(f"Unreadable LDM snapshot moved to {corrupt_path}, "
+                              f"restoring from change logs only: {e}")
+            generation, state = 0, None
+        
+        with self.memory_lock:
+            if state:
+                self.long_term_memories = state['long_term_memories']
+                self.memory_index = state['memory_index']
+                self.memory_keyword_refs = state['memory_keyword_refs']
+                self.memory_clusters = state['memory_clusters']
+                self.memory_cluster_refs = state['memory_cluster_refs']
+                self.access_patterns = state['access_patterns']
+                self.last_fade_cycle = state['last_fade_cycle']
+                
+                for memory_id, memory in self.long_term_memories.items():
+                    self._index_search_document(memory_id, memory)
+                    self._schedule_fade(memory_id, memory)
+            
+            replayed = 0
+            for op, memory_id, memory in self.checkpoint_store.replay(generation):
+                if op == OP_TOUCH:
+                    self._apply_touch(memory_id, memory)
+                    replayed += 1
+                    continue
+                
+                if memory_id in self.long_term_memories:
+                    self._unindex_memory(memory_id)
+                    del self.long_term_memories[memory_id]
+                
+                if op == OP_PUT:
+                    self.long_term_memories[memory_id] = memory
+                    self._update_memory_index(memory_id, memory)
+                    self._update_memory_clustering(memory_id, memory)
+                    self._schedule_fade(memory_id, memory)
+                    self.access_patterns.setdefault(memory_id, [datetime.now()])
+                else:
+                    self.access_patterns.pop(memory_id, None)
+                replayed += 1
+            
+            # A crash between reactivation and its tombstone leaves both copies; active wins
+            reactivated = [memory_id for memory_id in self.cold_storage_memories if memory_id in self.long_term_memories]
+            if reactivated and self.cold_storage is not None:
+                self.cold_storage.delete(reactivated)
+            for memory_id in reactivated:
+                del self.cold_storage_memories[memory_id]
+            
+            # New changes go to a fresh log after everything already on disk
+            self.checkpoint_store.open_log(max([generation] + self.checkpoint_store.log_generations()) + 1)
+        
+        if state or replayed:
+            self.logger.info(f"Restored {len(self.long_term_memories)} LDM memories "
+                             f"(snapshot generation {generation}, {replayed} logged changes)")
+    
+    def _apply_touch(self, memory_id: str, touch: Tuple[float, float, int]) -> None:
+        """Replay an access logged by retrieve_memory (ignored if the memory is gone)"""
+        memory = self.long_term_memories.get(memory_id)
+        if memory is None:
+            return
+        
+        strength, anchor_time, access_count = touch
+        self._anchor_strength(memory, strength, anchor_time)
+        memory['access_count'] = access_count
+        memory['last_access_time'] = datetime.fromtimestamp(anchor_time)
+        self._schedule_fade(memory_id, memory)
+    
+    def _log_changes(self, changes: List[Tuple[int, str, Optional[Dict[str, Any]]]]) -> None:
+        """Append changes to the checkpoint change log"""
+        if self.checkpoint_store is None:
+            return
+        
+        try:
+            self.checkpoint_store.append(changes)
+        except Exception as e:
+            self.logger.error(f"Failed to log {len(changes)} LDM changes: {e}")
+    
     def _calculate_average_strength(self) -> float:
         """Calculate average strength of active memories"""
         if not self.long_term_memories:
             return 0.0
         
-        total_strength = sum(memory['strength'] for memory in self.long_term_memories.values())
+        now = time.time()
+        total_strength = sum(self._current_strength(memory, now) for memory in self.long_term_memories.values())
         return total_strength / len(self.long_term_memories)
     
     def _get_memory_type_distribution(self) -> Dict[str, int]:
@@ -688,9 +1162,15 @@ class LongTermDeclarativeMemory(CoreSystemModule):
         # Run final fade cycle
         self.process_fade_cycle()
         
-        # TODO: Save memory statistics and state
-        # TODO: Optimize cold storage
-        # TODO: Create memory backup
+        # Save state for the next initialize
+        self.stop_checkpointing()
+        if self.checkpoint_store is not None:
+            self.create_checkpoint()
+            self.checkpoint_store.close()
+        
+        if self.cold_storage is not None:
+            self.cold_storage.compact()
+            self.cold_storage.close()
         
         super().shutdown()
 
@@ -0,0 +1,193 @@
+"""
+
+import sys
+import os
+
+try:
+    from dev_log import log_file_traversal, log_file_dependency
+except ImportError:
+    def log_file_traversal(*args, **kwargs): pass
+    def log_file_dependency(*args, **kwargs): pass
+
+log_file_traversal("ldm_checkpoint.py", "system_initialization", "import", "Auto-generated dev log entry")
+
+LDM Checkpoint Store - snapshot + change log for warm restarts
+Used by LDM (Long-Term Declarative Memory)
+
+State is persisted as a periodic snapshot plus numbered change logs:
+
+    ldm_snapshot.bin    header | zlib(pickle(state))
+                        header = magic 'LDMS', format:u16, generation:u64, crc32:u32
+    changes_<gen>.log   records of  length:u32, crc32:u32, op:u8 | pickle((memory_id, memory))
+
+OP_PUT and OP_REMOVE records carry real mutations (the whole memory, or
+None). OP_TOUCH records carry only the fade clock an access reset:
+(strength, strength_anchor_time, access_count).
+
+A snapshot of generation G contains every change logged before log G was
+opened, so a restart loads the snapshot and replays logs >= G in order.
+Logs older than the newest durable snapshot are deleted.
+"""
+
+from typing import Dict, List, Any, Optional, Tuple, Iterator
+import os
+import pickle
+import struct
+import threading
+import time
+import zlib
+
+SNAPSHOT_MAGIC = b'LDMS'
+SNAPSHOT_FORMAT = 1
+SNAPSHOT_HEADER = struct.Struct('<4sHQI')
+SNAPSHOT_FILE = "ldm_snapshot.bin"
+LOG_RECORD_HEADER = struct.Struct('<IIB')
+LOG_PREFIX = "changes_"
+LOG_SUFFIX = ".log"
+
+OP_PUT = 1
+OP_REMOVE = 2
+OP_TOUCH = 3
+
+class LDMCheckpointStore:
+    """
+    Snapshot and change-log files for one LDM instance
+
+    The store only deals with bytes on disk; LDM decides what goes into a
+    snapshot and how logged changes are applied.
+    """
+
+    def __init__(self, checkpoint_path: str, compression_level: int = 6):
+        self.checkpoint_path = checkpoint_path
+        self.compression_level = compression_level
+        self.log_lock = threading.Lock()
+        self.generation = 0
+        self.log_handle = None
+
+        os.makedirs(self.checkpoint_path, exist_ok=True)
+
+    # Snapshot
+
+    def snapshot_path(self) -> str:
+        return os.path.join(self.checkpoint_path, SNAPSHOT_FILE)
+
+    def log_path(self, generation: int) -> str:
+        return os.path.join(self.checkpoint_path, f"{LOG_PREFIX}{generation:08d}{LOG_SUFFIX}")
+
+    def encode_state(self, state: Dict[str, Any]) -> bytes:
+        """Pickle the state (call while the caller holds its lock)"""
+        return pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def write_snapshot(self, generation: int, encoded_state: bytes) -> int:
+        """Compress and atomically replace the snapshot; returns bytes written"""
+        body = zlib.compress(encoded_state, self.compression_level)
+        header = SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_FORMAT, generation, zlib.crc32(body))
+
+        temp_path = self.snapshot_path() + ".tmp"
+        with open(temp_path, 'wb') as handle:
+            handle.write(header)
+            handle.write(body)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temp_path, self.snapshot_path())
+
+        self.delete_logs_before(generation)
+        return len(header) + len(body)
+
+    def load_snapshot(self) -> Tuple[int, Optional[Dict[str, Any]]]:
+        """
+        Return (generation, state) of the snapshot, or (0, None) if there is none
+
+        Raises ValueError for a short, corrupt or unsupported snapshot file.
+        """
+        if not os.path.exists(self.snapshot_path()):
+            return 0, None
+
+        with open(self.snapshot_path(), 'rb') as handle:
+            data = handle.read()
+
+        if len(data) < SNAPSHOT_HEADER.size:
+            raise ValueError(f"Truncated LDM snapshot: {self.snapshot_path()}")
+
+        magic, version, generation, checksum = SNAPSHOT_HEADER.unpack_from(data)
+        body = data[SNAPSHOT_HEADER.size:]
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_FORMAT or zlib.crc32(body) != checksum:
+            raise ValueError(f"Corrupt or unsupported LDM snapshot: {self.snapshot_path()}")
+
+        return generation, pickle.loads(zlib.decompress(body))
+
+    def set_aside_snapshot(self) -> str:
+        """Move an unreadable snapshot out of the way, keeping it for inspection; returns its new path"""
+        corrupt_path = f"{self.snapshot_path()}.corrupt-{int(time.time())}"
+        os.replace(self.snapshot_path(), corrupt_path)
+        return corrupt_path
+
+    # Change log
+
+    def log_generations(self) -> List[int]:
+        """Generations of the change logs on disk, oldest first"""
+        return sorted(
+            int(name[len(LOG_PREFIX):-len(LOG_SUFFIX)])
+            for name in os.listdir(self.checkpoint_path)
+            if name.startswith(LOG_PREFIX) and name.endswith(LOG_SUFFIX)
+        )
+
+    def replay(self, from_generation: int) -> Iterator[Tuple[int, str, Optional[Dict[str, Any]]]]:
+        """Yield (op, memory_id, memory) for every logged change at or after a generation"""
+        for generation in self.log_generations():
+            if generation < from_generation:
+                continue
+
+            with open(self.log_path(generation), 'rb') as handle:
+                data = handle.read()
+
+            position = 0
+            while position + LOG_RECORD_HEADER.size <= len(data):
+                length, checksum, op = LOG_RECORD_HEADER.unpack_from(data, position)
+                start = position + LOG_RECORD_HEADER.size
+                payload = data[start:start + length]
+                if len(payload) < length or zlib.crc32(payload) != checksum:
+                    break  # Torn tail from an unclean shutdown
+                memory_id, memory = pickle.loads(payload)
+                yield op, memory_id, memory
+                position = start + length
+
+    def open_log(self, generation: int) -> None:
+        """Start appending to the change log of a generation"""
+        with self.log_lock:
+            if self.log_handle:
+                self.log_handle.close()
+            self.generation = generation
+            self.log_handle = open(self.log_path(generation), 'ab')
+
+    def rotate(self) -> int:
+        """Switch to a new log generation (call while the caller holds its lock)"""
+        self.open_log(self.generation + 1)
+        return self.generation
+
+    def append(self, changes: List[Tuple[int, str, Optional[Dict[str, Any]]]]) -> None:
+        """Append (op, memory_id, memory) changes to the current log in one write"""
+        if self.log_handle is None or not changes:
+            return
+
+        buffer = bytearray()
+        for op, memory_id, memory in changes:
+            payload = pickle.dumps((memory_id, memory), protocol=pickle.HIGHEST_PROTOCOL)
+            buffer += LOG_RECORD_HEADER.pack(len(payload), zlib.crc32(payload), op)
+            buffer += payload
+
+        with self.log_lock:
+            self.log_handle.write(buffer)
+            self.log_handle.flush()
+
+    def delete_logs_before(self, generation: int) -> None:
+        """Drop change logs already covered by a snapshot"""
+        for log_generation in self.log_generations():
+            if log_generation < generation:
+                os.remove(self.log_path(log_generation))
+
+    def close(self) -> None:
+        with self.log_lock:
+            if self.log_handle:
+                self.log_handle.close()
+                self.log_handle = None
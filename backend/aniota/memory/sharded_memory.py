@@ -0,0 +1,333 @@
+"""
+
+import sys
+import os
+
+try:
+    from dev_log import log_file_traversal, log_file_dependency
+except ImportError:
+    def log_file_traversal(*args, **kwargs): pass
+    def log_file_dependency(*args, **kwargs): pass
+
+log_file_traversal("sharded_memory.py", "system_initialization", "import", "Auto-generated dev log entry")
+
+Sharded Memory - per-learner WMS and LDM shards
+Used in place of WMS / LDM when many learners share one process
+
+Each shard is a complete WorkingMemorySystem or LongTermDeclarativeMemory
+with its own lock, decay/fade schedule, capacity and storage paths, so
+learners on different shards never contend on one lock (lock striping).
+
+Memories are routed by learner or session id; calls without one fall back
+to the memory id. Routing uses crc32, so a learner maps to the same shard
+across restarts and to the same index in a paired WMS/LDM.
+"""
+
+from typing import Dict, List, Any, Optional, Tuple
+import heapq
+import os
+import zlib
+from datetime import datetime, timedelta
+from ..base_module import CoreSystemModule
+from .wms import WorkingMemorySystem
+from .ldm import LongTermDeclarativeMemory
+
+def shard_index(key: str, shard_count: int) -> int:
+    """Stable shard for a learner/session id (or memory id)"""
+    return zlib.crc32(str(key).encode('utf-8')) % shard_count
+
+class ShardedWorkingMemorySystem(CoreSystemModule):
+    """
+    WMS split into independent per-learner shards
+
+    - store/retrieve/update lock only the learner's shard
+    - capacity_limit applies per shard (working memory per learner group)
+    - decay cycles are staggered so shards do not all come due at once
+    """
+
+    def __init__(self, parent_caf=None, shard_count: int = 16, capacity_per_shard: Optional[int] = None):
+        super().__init__("WMS", parent_caf)
+        self.shard_count = shard_count
+        self.shards: List[WorkingMemorySystem] = [WorkingMemorySystem(parent_caf=self) for _ in range(shard_count)]
+
+        now = datetime.now()
+        for index, shard in enumerate(self.shards):
+            if capacity_per_shard is not None:
+                shard.capacity_limit = capacity_per_shard
+                shard.specs['capacity_limit'] = capacity_per_shard
+            # Spread the first decay cycles over one interval
+            shard.last_decay_cycle = now - timedelta(seconds=shard.decay_interval * index / shard_count)
+
+        self.specs = {
+            'shard_count': shard_count,
+            'capacity_per_shard': self.shards[0].capacity_limit if self.shards else 0,
+            'shard_key': 'learner_id'
+        }
+
+    def shard_for(self, key: str) -> WorkingMemorySystem:
+        """WMS shard holding a learner's (or memory's) working memory"""
+        return self.shards[shard_index(key, self.shard_count)]
+
+    def initialize(self) -> bool:
+        """Initialize every shard"""
+        try:
+            self.logger.info(f"Initializing sharded Working Memory System ({self.shard_count} shards)")
+            self.is_initialized = all([shard.initialize() for shard in self.shards])
+            return self.is_initialized
+
+        except Exception as e:
+            self.logger.error(f"Sharded WMS initialization failed: {e}")
+            return False
+
+    def validate_integrity(self) -> bool:
+        """Validate every shard"""
+        return all([shard.validate_integrity() for shard in self.shards])
+
+    def store_memory(self, memory_id: str, content: Dict[str, Any], memory_type: str = 'working',
+                     learner_id: Optional[str] = None) -> bool:
+        """Store a memory in the learner's shard"""
+        return self._route(memory_id, learner_id).store_memory(memory_id, content, memory_type)
+
+    def retrieve_memory(self, memory_id: str, learner_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Retrieve a memory from the learner's shard"""
+        return self._route(memory_id, learner_id).retrieve_memory(memory_id)
+
+    def update_memory(self, memory_id: str, updates: Dict[str, Any], learner_id: Optional[str] = None) -> bool:
+        """Update a memory in the learner's shard"""
+        return self._route(memory_id, learner_id).update_memory(memory_id, updates)
+
+    def process_decay_cycle(self, learner_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Run the decay cycle of one learner's shard, or of every shard that is due
+
+        Each shard only holds its own lock while it decays.
+        """
+        if learner_id is not None:
+            return self.shard_for(learner_id).process_decay_cycle()
+
+        stats = {
+            'status': 'skipped',
+            'shards_processed': 0,
+            'decayed_count': 0,
+            'consolidated_count': 0,
+            'forgotten_count': 0
+        }
+        for shard in self.shards:
+            shard_stats = shard.process_decay_cycle()
+            if shard_stats.get('status') != 'completed':
+                continue
+            stats['status'] = 'completed'
+            stats['shards_processed'] += 1
+            for key in ('decayed_count', 'consolidated_count', 'forgotten_count'):
+                stats[key] += shard_stats[key]
+
+        stats['active_memories'] = sum(len(shard.active_memories) for shard in self.shards)
+        return stats
+
+    def flush_consolidation(self) -> int:
+        """Drain the consolidation queue of every shard"""
+        return sum(shard.flush_consolidation() for shard in self.shards)
+
+    def add_child(self, child) -> None:
+        """
+        Add a child module; an LDM becomes the consolidation target of every shard
+
+        A ShardedLongTermDeclarativeMemory with the same shard count is paired
+        shard by shard, so a learner's memories consolidate within one pair.
+        """
+        super().add_child(child)
+        if isinstance(child, ShardedLongTermDeclarativeMemory):
+            if child.shard_count != self.shard_count:
+                raise ValueError(f"Shard count mismatch: WMS has {self.shard_count}, LDM has {child.shard_count}")
+            for wms_shard, ldm_shard in zip(self.shards, child.shards):
+                wms_shard.add_child(ldm_shard)
+        elif getattr(child, 'module_id', None) == "LDM":
+            for wms_shard in self.shards:
+                wms_shard.ldm_module = child
+
+    def get_memory_status(self) -> Dict[str, Any]:
+        """Working memory status summed over all shards"""
+        shard_statuses = [shard.get_memory_status() for shard in self.shards]
+        active = sum(status['active_memories'] for status in shard_statuses)
+        capacity = sum(status['capacity_limit'] for status in shard_statuses)
+
+        memory_types = {}
+        for status in shard_statuses:
+            for mem_type, count in status['memory_types'].items():
+                memory_types[mem_type] = memory_types.get(mem_type, 0) + count
+
+        return {
+            'shards': self.shard_count,
+            'active_memories': active,
+            'capacity_limit': capacity,
+            'capacity_utilization': active / capacity if capacity else 0.0,
+            'busiest_shard_utilization': max((status['capacity_utilization'] for status in shard_statuses), default=0.0),
+            'memory_types': memory_types,
+            'last_decay_cycle': min((status['last_decay_cycle'] for status in shard_statuses), default=None),
+            'average_strength': (
+                sum(status['average_strength'] * status['active_memories'] for status in shard_statuses) / active
+                if active else 0.0
+            ),
+            'consolidation_candidates': sum(status['consolidation_candidates'] for status in shard_statuses),
+            'pending_consolidation': sum(status['pending_consolidation'] for status in shard_statuses)
+        }
+
+    def shutdown(self) -> None:
+        """Shut down every shard"""
+        self.logger.info("Shutting down sharded Working Memory System")
+        for shard in self.shards:
+            shard.shutdown()
+        super().shutdown()
+
+    def _route(self, memory_id: str, learner_id: Optional[str]) -> WorkingMemorySystem:
+        return self.shard_for(learner_id if learner_id is not None else memory_id)
+
+class ShardedLongTermDeclarativeMemory(CoreSystemModule):
+    """
+    LDM split into independent per-learner shards
+
+    - every shard keeps its own index, clusters, fade queue and lock
+    - cold storage and checkpoints live in shard_<n> subdirectories
+    - search with a learner_id hits one shard; without one it fans out
+      and merges the per-shard top results
+    """
+
+    def __init__(self, parent_wms=None, shard_count: int = 16, capacity_per_shard: Optional[int] = None):
+        super().__init__("LDM", parent_wms)
+        self.shard_count = shard_count
+        self.shards: List[LongTermDeclarativeMemory] = []
+
+        for index in range(shard_count):
+            shard = LongTermDeclarativeMemory(parent_wms=self)
+            shard.cold_storage_path = os.path.join(shard.cold_storage_path, f"shard_{index:02d}")
+            shard.checkpoint_path = os.path.join(shard.checkpoint_path, f"shard_{index:02d}")
+            if capacity_per_shard is not None:
+                shard.max_capacity = capacity_per_shard
+                shard.specs['max_capacity'] = capacity_per_shard
+            self.shards.append(shard)
+
+        self.specs = {
+            'shard_count': shard_count,
+            'capacity_per_shard': self.shards[0].max_capacity if self.shards else 0,
+            'shard_key': 'learner_id'
+        }
+
+    def shard_for(self, key: str) -> LongTermDeclarativeMemory:
+        """LDM shard holding a learner's (or memory's) long-term memory"""
+        return self.shards[shard_index(key, self.shard_count)]
+
+    def initialize(self) -> bool:
+        """Initialize every shard (each restores its own checkpoint)"""
+        try:
+            self.logger.info(f"Initializing sharded Long-Term Declarative Memory ({self.shard_count} shards)")
+            self.is_initialized = all([shard.initialize() for shard in self.shards])
+            return self.is_initialized
+
+        except Exception as e:
+            self.logger.error(f"Sharded LDM initialization failed: {e}")
+            return False
+
+    def validate_integrity(self) -> bool:
+        """Validate every shard"""
+        return all([shard.validate_integrity() for shard in self.shards])
+
+    def consolidate_from_wms(self, memory_id: str, wms_memory: Dict[str, Any],
+                             learner_id: Optional[str] = None) -> bool:
+        """Consolidate one memory into the learner's shard"""
+        return self._route(memory_id, learner_id).consolidate_from_wms(memory_id, wms_memory)
+
+    def consolidate_many(self, wms_memories: List[Tuple[str, Dict[str, Any]]],
+                         learner_id: Optional[str] = None) -> List[str]:
+        """Consolidate a batch, one consolidate_many call per shard touched"""
+        if learner_id is not None:
+            return self.shard_for(learner_id).consolidate_many(wms_memories)
+
+        batches: Dict[int, List[Tuple[str, Dict[str, Any]]]] = {}
+        for memory_id, wms_memory in wms_memories:
+            batches.setdefault(shard_index(memory_id, self.shard_count), []).append((memory_id, wms_memory))
+
+        consolidated = []
+        for index, batch in batches.items():
+            consolidated.extend(self.shards[index].consolidate_many(batch))
+        return consolidated
+
+    def retrieve_memory(self, memory_id: str, learner_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Retrieve a memory from the learner's shard"""
+        return self._route(memory_id, learner_id).retrieve_memory(memory_id)
+
+    def search_memories(self, query: str, max_results: int = 10,
+                        learner_id: Optional[str] = None) -> List[Tuple[str, Dict[str, Any], float]]:
+        """
+        Search one learner's shard, or every shard when no learner is given
+
+        Scores are computed per shard (BM25 statistics are shard-local), so a
+        fan-out search merges each shard's top results by relevance score.
+        """
+        if learner_id is not None:
+            return self.shard_for(learner_id).search_memories(query, max_results)
+
+        results = []
+        for shard in self.shards:
+            results.extend(shard.search_memories(query, max_results))
+        return heapq.nlargest(max_results, results, key=lambda x: x[2])
+
+    def get_memories_by_cluster(self, cluster_tag: str, max_results: int = 20,
+                                learner_id: Optional[str] = None) -> List[Tuple[str, Dict[str, Any]]]:
+        """Cluster members from one learner's shard, or from shards in order until max_results"""
+        if learner_id is not None:
+            return self.shard_for(learner_id).get_memories_by_cluster(cluster_tag, max_results)
+
+        results = []
+        for shard in self.shards:
+            if len(results) >= max_results:
+                break
+            results.extend(shard.get_memories_by_cluster(cluster_tag, max_results - len(results)))
+        return results
+
+    def process_fade_cycle(self, learner_id: Optional[str] = None) -> Dict[str, int]:
+        """Run the fade cycle of one learner's shard, or of every shard in turn"""
+        if learner_id is not None:
+            return self.shard_for(learner_id).process_fade_cycle()
+
+        stats = {'processed': 0, 'faded': 0, 'archived': 0, 'forgotten': 0}
+        for shard in self.shards:
+            shard_stats = shard.process_fade_cycle()
+            for key in stats:
+                stats[key] += shard_stats.get(key, 0)
+        return stats
+
+    def create_checkpoint(self) -> Dict[str, Any]:
+        """Snapshot every shard"""
+        shard_results = [shard.create_checkpoint() for shard in self.shards]
+        return {
+            'memories': sum(result.get('memories', 0) for result in shard_results),
+            'snapshot_bytes': sum(result.get('snapshot_bytes', 0) for result in shard_results),
+            'failed_shards': [index for index, result in enumerate(shard_results) if 'error' in result]
+        }
+
+    def get_memory_statistics(self) -> Dict[str, Any]:
+        """Counts summed over all shards"""
+        shard_stats = [shard.get_memory_statistics() for shard in self.shards]
+        active = sum(stats.get('active_memories', 0) for stats in shard_stats)
+        capacity = sum(shard.max_capacity for shard in self.shards)
+
+        return {
+            'shards': self.shard_count,
+            'active_memories': active,
+            'cold_storage_memories': sum(stats.get('cold_storage_memories', 0) for stats in shard_stats),
+            'total_memories': sum(stats.get('total_memories', 0) for stats in shard_stats),
+            'capacity_utilization': active / capacity if capacity else 0.0,
+            'busiest_shard_utilization': max((stats.get('capacity_utilization', 0.0) for stats in shard_stats), default=0.0),
+            'memory_clusters': sum(stats.get('memory_clusters', 0) for stats in shard_stats),
+            'index_keywords': sum(stats.get('index_keywords', 0) for stats in shard_stats)
+        }
+
+    def shutdown(self) -> None:
+        """Shut down every shard"""
+        self.logger.info("Shutting down sharded Long-Term Declarative Memory")
+        for shard in self.shards:
+            shard.shutdown()
+        super().shutdown()
+
+    def _route(self, memory_id: str, learner_id: Optional[str]) -> LongTermDeclarativeMemory:
+        return self.shard_for(learner_id if learner_id is not None else memory_id)
@@ -23,13 +23,111 @@ Parent: CAF
 Children: LDM
 """
 
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, List, Any, Optional, Union, Tuple, Set
 import logging
 from datetime import datetime, timedelta
 import threading
+import queue
 import math
+import time
+import numpy as np
 from ..base_module import CoreSystemModule
 
+class IndexedMinHeap:
+    """
+    Binary min-heap of (key, memory_id) with a position index
+
+    Supports O(log n) push, pop, update and remove by memory_id, so capacity
+    eviction no longer sorts every active memory.
+    """
+    
+    def __init__(self):
+        self.entries: List[Tuple[Tuple[float, int], str]] = []
+        self.positions: Dict[str, int] = {}
+    
+    def __len__(self) -> int:
+        return len(self.entries)
+    
+    def __contains__(self, memory_id: str) -> bool:
+        return memory_id in self.positions
+    
+    def peek(self) -> Optional[str]:
+        return self.entries[0][1] if self.entries else None
+    
+    def push(self, memory_id: str, key: Tuple[float, int]) -> None:
+        """Insert a memory, or re-key it if already present"""
+        if memory_id in self.positions:
+            self.update(memory_id, key)
+            return
+        self.entries.append((key, memory_id))
+        self.positions[memory_id] = len(self.entries) - 1
+        self._sift_up(len(self.entries) - 1)
+    
+    def update(self, memory_id: str, key: Tuple[float, int]) -> None:
+        """Change a memory's key"""
+        position = self.positions[memory_id]
+        old_key = self.entries[position][0]
+        self.entries[position] = (key, memory_id)
+        if key < old_key:
+            self._sift_up(position)
+        else:
+            self._sift_down(position)
+    
+    def remove(self, memory_id: str) -> None:
+        """Remove a memory if present"""
+        position = self.positions.pop(memory_id, None)
+        if position is None:
+            return
+        last = self.entries.pop()
+        if position < len(self.entries):
+            self.entries[position] = last
+            self.positions[last[1]] = position
+            self._sift_up(position)
+            self._sift_down(self.positions[last[1]])
+    
+    def pop(self) -> Optional[str]:
+        """Remove and return the memory with the smallest key"""
+        memory_id = self.peek()
+        if memory_id is not None:
+            self.remove(memory_id)
+        return memory_id
+    
+    def rebuild(self, ordered: List[Tuple[Tuple[float, int], str]]) -> None:
+        """Replace the contents with entries already sorted by key (a sorted list is a valid heap)"""
+        self.entries = ordered
+        self.positions = {memory_id: position for position, (_, memory_id) in enumerate(ordered)}
+    
+    def _sift_up(self, position: int) -> None:
+        entries, positions = self.entries, self.positions
+        entry = entries[position]
+        while position > 0:
+            parent = (position - 1) >> 1
+            if entries[parent][0] <= entry[0]:
+                break
+            entries[position] = entries[parent]
+            positions[entries[position][1]] = position
+            position = parent
+        entries[position] = entry
+        positions[entry[1]] = position
+    
+    def _sift_down(self, position: int) -> None:
+        entries, positions = self.entries, self.positions
+        size = len(entries)
+        entry = entries[position]
+        while True:
+            child = 2 * position + 1
+            if child >= size:
+                break
+            if child + 1 < size and entries[child + 1][0] < entries[child][0]:
+                child += 1
+            if entry[0] <= entries[child][0]:
+                break
+            entries[position] = entries[child]
+            positions[entries[position][1]] = position
+            position = child
+        entries[position] = entry
+        positions[entry[1]] = position
+
 class WorkingMemorySystem(CoreSystemModule):
     """
     WMS - Working Memory System
@@ -50,12 +148,38 @@ class WorkingMemorySystem(CoreSystemModule):
         self.last_decay_cycle = datetime.now()
         self.decay_interval = 60  # seconds between decay cycles
         
+        # Eviction heap keyed on (strength, insertion order) and the NumPy
+        # per-slot arrays used by the vectorized decay cycle. slot_strengths
+        # is the only copy of a memory's strength; after a decay cycle the
+        # heap keys are stale until the next eviction re-keys them.
+        self.eviction_heap = IndexedMinHeap()
+        self.eviction_heap_stale = False
+        self.memory_slots: Dict[str, int] = {}  # memory_id -> array slot
+        self.slot_memory_ids: List[Optional[str]] = [None] * 64
+        self.free_slots: List[int] = []
+        self.slot_active = np.zeros(64, dtype=bool)
+        self.slot_strengths = np.zeros(64, dtype=np.float64)
+        self.slot_last_access = np.zeros(64, dtype=np.float64)  # epoch seconds
+        self.slot_consolidation_scores = np.zeros(64, dtype=np.float64)
+        self.slot_insertion_orders = np.zeros(64, dtype=np.int64)
+        self.insertion_counter = 0
+        
+        # Consolidation queue drained in batches by a background worker
+        self.consolidation_queue: queue.Queue = queue.Queue()
+        self.pending_consolidation: Set[str] = set()
+        self.consolidation_batch_size = 64
+        self.consolidation_thread: Optional[threading.Thread] = None
+        self.consolidation_stop_event = threading.Event()
+        self.ldm_module = None
+        
         # Initialize specifications
         self.specs = {
             'capacity_limit': 50,
             'decay_rate': 0.1,
             'decay_interval_seconds': 60,
             'consolidation_threshold': 0.8,
+            'consolidation_batch_size': 64,
+            'async_consolidation': True,
             'temporal_window_hours': 24,
             'memory_types': ['episodic', 'semantic', 'procedural', 'working']
         }
@@ -136,12 +260,19 @@ class WorkingMemorySystem(CoreSystemModule):
                     'creation_time': datetime.now(),
                     'last_access_time': datetime.now(),
                     'access_count': 1,
-                    'strength': 1.0,  # Initial strength
                     'consolidation_score': 0.0,
                     'temporal_context': self._extract_temporal_context(content)
                 }
                 
+                # Replacing a memory keeps its slot and insertion order
+                previous_entry = self.active_memories.get(memory_id)
                 self.active_memories[memory_id] = memory_entry
+                if previous_entry is None:
+                    self._track_memory(memory_id, memory_entry)
+                else:
+                    memory_entry['insertion_order'] = previous_entry['insertion_order']
+                    self.slot_strengths[self.memory_slots[memory_id]] = 1.0  # Initial strength
+                    self._touch_memory(memory_id, memory_entry)
                 
                 self.logger.debug(f"Stored memory {memory_id} of type {memory_type}")
                 return True
@@ -173,6 +304,7 @@ class WorkingMemorySystem(CoreSystemModule):
                 
                 # Strengthen memory through access
                 self._strengthen_memory(memory_id)
+                self._touch_memory(memory_id, memory)
                 
                 self.logger.debug(f"Retrieved memory {memory_id}")
                 return memory['content']
@@ -207,6 +339,7 @@ class WorkingMemorySystem(CoreSystemModule):
                 
                 # Recalculate consolidation score
                 self._update_consolidation_score(memory_id)
+                self._touch_memory(memory_id, memory)
                 
                 self.logger.debug(f"Updated memory {memory_id}")
                 return True
@@ -215,6 +348,25 @@ class WorkingMemorySystem(CoreSystemModule):
             self.logger.error(f"Memory update failed for {memory_id}: {e}")
             return False
     
+    def set_consolidation_score(self, memory_id: str, score: float) -> bool:
+        """
+        Override a memory's consolidation score
+        
+        Parameters:
+            memory_id: Identifier of memory to update
+            score: New consolidation score (0.0 - 1.0)
+            
+        Returns:
+            bool: True if the memory exists
+        """
+        with self.memory_lock:
+            memory = self.active_memories.get(memory_id)
+            if memory is None:
+                return False
+            memory['consolidation_score'] = score
+            self.slot_consolidation_scores[self.memory_slots[memory_id]] = score
+            return True
+    
     def process_decay_cycle(self) -> Dict[str, Any]:
         """
         Process temporal decay for all active memories
@@ -229,46 +381,81 @@ class WorkingMemorySystem(CoreSystemModule):
                 if (current_time - self.last_decay_cycle).total_seconds() < self.decay_interval:
                     return {'status': 'skipped', 'reason': 'too_soon'}
                 
-                decayed_memories = []
                 consolidated_memories = []
                 forgotten_memories = []
                 
-                for memory_id, memory in list(self.active_memories.items()):
-                    # Calculate time-based decay
-                    time_since_access = current_time - memory['last_access_time']
-                    decay_factor = self._calculate_decay_factor(time_since_access)
-                    
-                    # Apply decay
-                    memory['strength'] *= decay_factor
-                    decayed_memories.append(memory_id)
-                    
-                    # Check for consolidation
-                    if memory['consolidation_score'] >= self.consolidation_threshold:
-                        self._consolidate_to_ldm(memory_id, memory)
+                # Exponential time-based decay (minimum factor 0.01), vectorized over every active slot
+                slots = np.flatnonzero(self.slot_active)
+                hours_since_access = (time.time() - self.slot_last_access[slots]) / 3600
+                decay_factors = np.maximum(0.01, np.exp(-self.decay_rate * hours_since_access))
+                strengths = self.slot_strengths[slots] * decay_factors
+                self.slot_strengths[slots] = strengths
+                
+                # Only consolidation and forgetting candidates are visited in Python
+                consolidating = self.slot_consolidation_scores[slots] >= self.consolidation_threshold
+                forgetting = ~consolidating & (strengths < 0.1)
+                
+                # Check for consolidation (queued; the memory stays until LDM accepts it)
+                for slot in slots[consolidating].tolist():
+                    memory_id = self.slot_memory_ids[slot]
+                    if self._queue_consolidation(memory_id, self.active_memories[memory_id]):
                         consolidated_memories.append(memory_id)
-                    
-                    # Check for forgetting (very low strength)
-                    elif memory['strength'] < 0.1:
-                        del self.active_memories[memory_id]
-                        forgotten_memories.append(memory_id)
+                
+                # Check for forgetting (very low strength)
+                for slot in slots[forgetting].tolist():
+                    memory_id = self.slot_memory_ids[slot]
+                    self._remove_memory(memory_id)
+                    forgotten_memories.append(memory_id)
+                
+                # Decay reorders strengths; the heap is re-keyed on the next eviction
+                self.eviction_heap_stale = len(slots) > 0
                 
                 self.last_decay_cycle = current_time
                 
                 stats = {
                     'status': 'completed',
-                    'decayed_count': len(decayed_memories),
+                    'decayed_count': len(slots),
                     'consolidated_count': len(consolidated_memories),
                     'forgotten_count': len(forgotten_memories),
                     'active_memories': len(self.active_memories)
                 }
                 
                 self.logger.debug(f"Decay cycle completed: {stats}")
-                return stats
+            
+            # Without a worker the queue is drained here, after releasing the lock
+            if self.consolidation_thread is None:
+                self.flush_consolidation()
+            
+            return stats
                 
         except Exception as e:
             self.logger.error(f"Decay cycle failed: {e}")
             return {'status': 'failed', 'error': str(e)}
     
+    def flush_consolidation(self) -> int:
+        """
+        Drain the consolidation queue and wait for in-flight batches
+        
+        Returns:
+            Number of memories consolidated by this call
+        """
+        consolidated = 0
+        while True:
+            batch = self._next_consolidation_batch(block=False)
+            if not batch:
+                break
+            consolidated += self._consolidate_batch(batch)
+        
+        # Wait for any batch the worker is still writing
+        self.consolidation_queue.join()
+        return consolidated
+    
+    def add_child(self, child) -> None:
+        """Add a child module, remembering the LDM for consolidation"""
+        super().add_child(child)
+        if getattr(child, 'module_id', None) == "LDM":
+            self.ldm_module = child
+    
     def get_memory_status(self) -> Dict[str, Any]:
         """Get current working memory status"""
         with self.memory_lock:
@@ -286,7 +473,8 @@ class WorkingMemorySystem(CoreSystemModule):
                 'memory_types': memory_types,
                 'last_decay_cycle': self.last_decay_cycle,
                 'average_strength': self._calculate_average_strength(),
-                'consolidation_candidates': self._count_consolidation_candidates()
+                'consolidation_candidates': self._count_consolidation_candidates(),
+                'pending_consolidation': len(self.pending_consolidation)
             }
     
     # Private methods - TODO: Implement full functionality
@@ -306,11 +494,32 @@ class WorkingMemorySystem(CoreSystemModule):
         self.logger.debug("Temporal decay setup (placeholder)")
     
     def _setup_consolidation(self) -> None:
-        """Set up memory consolidation processes"""
-        # TODO: Configure consolidation criteria
-        # TODO: Set up LDM transfer mechanisms
-        # TODO: Initialize consolidation monitoring
-        self.logger.debug("Consolidation setup (placeholder)")
+        """Start the background worker that drains the consolidation queue"""
+        self.stop_consolidation()
+        self.consolidation_batch_size = self.specs.get('consolidation_batch_size', self.consolidation_batch_size)
+        
+        if self.specs.get('async_consolidation', True):
+            self.consolidation_stop_event.clear()
+            self.consolidation_thread = threading.Thread(
+                target=self._consolidation_loop, daemon=True, name="WMSConsolidationThread"
+            )
+            self.consolidation_thread.start()
+        
+        self.logger.debug("Consolidation worker started")
+    
+    def stop_consolidation(self) -> None:
+        """Stop the background consolidation worker"""
+        if self.consolidation_thread:
+            self.consolidation_stop_event.set()
+            self.consolidation_thread.join(timeout=10.0)
+            self.consolidation_thread = None
+    
+    def _consolidation_loop(self) -> None:
+        """Background worker: consolidate queued memories to LDM in batches"""
+        while not self.consolidation_stop_event.is_set():
+            batch = self._next_consolidation_batch(block=True)
+            if batch:
+                self._consolidate_batch(batch)
     
     def _setup_memory_monitoring(self) -> None:
         """Set up memory performance monitoring"""
@@ -335,18 +544,76 @@ class WorkingMemorySystem(CoreSystemModule):
     
     def _handle_capacity_overflow(self) -> None:
         """Handle working memory capacity overflow"""
-        # Remove weakest memories to make space
-        sorted_memories = sorted(
-            self.active_memories.items(),
-            key=lambda x: x[1]['strength']
-        )
-        
-        # Remove the weakest memory
-        if sorted_memories:
-            weakest_id = sorted_memories[0][0]
-            del self.active_memories[weakest_id]
+        # Remove the weakest memory (heap minimum) to make space
+        if self.eviction_heap_stale:
+            self._rebuild_eviction_heap()
+        weakest_id = self.eviction_heap.peek()
+        if weakest_id is not None:
+            self._remove_memory(weakest_id)
             self.logger.warning(f"Capacity overflow: removed weakest memory {weakest_id}")
     
+    def _track_memory(self, memory_id: str, memory: Dict[str, Any]) -> None:
+        """Give a new memory an array slot (initial strength 1.0) and an eviction heap entry"""
+        if self.free_slots:
+            slot = self.free_slots.pop()
+        else:
+            slot = len(self.memory_slots)
+            if slot >= len(self.slot_strengths):
+                self.slot_memory_ids.extend([None] * len(self.slot_memory_ids))
+                self.slot_active = np.concatenate([self.slot_active, np.zeros_like(self.slot_active)])
+                self.slot_strengths = np.concatenate([self.slot_strengths, np.zeros_like(self.slot_strengths)])
+                self.slot_last_access = np.concatenate([self.slot_last_access, np.zeros_like(self.slot_last_access)])
+                self.slot_consolidation_scores = np.concatenate([
+                    self.slot_consolidation_scores, np.zeros_like(self.slot_consolidation_scores)
+                ])
+                self.slot_insertion_orders = np.concatenate([
+                    self.slot_insertion_orders, np.zeros_like(self.slot_insertion_orders)
+                ])
+        
+        self.memory_slots[memory_id] = slot
+        self.slot_memory_ids[slot] = memory_id
+        self.slot_active[slot] = True
+        self.slot_strengths[slot] = 1.0
+        self.insertion_counter += 1
+        memory['insertion_order'] = self.insertion_counter
+        self.slot_insertion_orders[slot] = self.insertion_counter
+        self._touch_memory(memory_id, memory)
+    
+    def _touch_memory(self, memory_id: str, memory: Dict[str, Any]) -> None:
+        """Sync a memory's access time and consolidation score into the arrays and re-key it in the heap"""
+        slot = self.memory_slots[memory_id]
+        self.slot_last_access[slot] = memory['last_access_time'].timestamp()
+        self.slot_consolidation_scores[slot] = memory['consolidation_score']
+        self.eviction_heap.push(memory_id, (float(self.slot_strengths[slot]), memory['insertion_order']))
+    
+    def _memory_strength(self, memory_id: str) -> float:
+        """Current strength of an active memory"""
+        return float(self.slot_strengths[self.memory_slots[memory_id]])
+    
+    def _remove_memory(self, memory_id: str) -> None:
+        """Remove a memory from working memory, its array slot and the eviction heap"""
+        self.active_memories.pop(memory_id, None)
+        self.eviction_heap.remove(memory_id)
+        slot = self.memory_slots.pop(memory_id, None)
+        if slot is not None:
+            self.slot_memory_ids[slot] = None
+            self.slot_active[slot] = False
+            self.free_slots.append(slot)
+    
+    def _rebuild_eviction_heap(self) -> None:
+        """Re-key the eviction heap from the slot arrays after a decay cycle"""
+        self.eviction_heap_stale = False
+        slots = np.flatnonzero(self.slot_active)
+        strengths = self.slot_strengths[slots]
+        order = slots[np.lexsort((self.slot_insertion_orders[slots], strengths))]
+        strength_list = self.slot_strengths[order].tolist()
+        insertion_list = self.slot_insertion_orders[order].tolist()
+        memory_ids = self.slot_memory_ids
+        self.eviction_heap.rebuild([
+            ((strength, insertion_order), memory_ids[slot])
+            for strength, insertion_order, slot in zip(strength_list, insertion_list, order.tolist())
+        ])
+    
     def _extract_temporal_context(self, content: Dict[str, Any]) -> Dict[str, Any]:
         """Extract temporal context from memory content"""
         # TODO: Analyze temporal patterns
@@ -356,9 +623,9 @@ class WorkingMemorySystem(CoreSystemModule):
     
     def _strengthen_memory(self, memory_id: str) -> None:
         """Strengthen a memory through access"""
-        memory = self.active_memories[memory_id]
+        slot = self.memory_slots[memory_id]
         # Simple strengthening algorithm
-        memory['strength'] = min(1.0, memory['strength'] + 0.1)
+        self.slot_strengths[slot] = min(1.0, self.slot_strengths[slot] + 0.1)
         
         # TODO: Implement sophisticated strengthening algorithms
         # TODO: Consider access patterns
@@ -371,7 +638,7 @@ class WorkingMemorySystem(CoreSystemModule):
         # Simple consolidation scoring
         age_factor = (datetime.now() - memory['creation_time']).total_seconds() / 3600  # hours
         access_factor = memory['access_count'] / 10.0
-        strength_factor = memory['strength']
+        strength_factor = self._memory_strength(memory_id)
         
         memory['consolidation_score'] = min(1.0, (age_factor + access_factor + strength_factor) / 3)
         
@@ -379,46 +646,85 @@ class WorkingMemorySystem(CoreSystemModule):
         # TODO: Consider memory importance
         # TODO: Apply domain-specific consolidation rules
     
-    def _calculate_decay_factor(self, time_since_access: timedelta) -> float:
-        """Calculate temporal decay factor"""
-        hours_since_access = time_since_access.total_seconds() / 3600
-        # Exponential decay
-        decay_factor = math.exp(-self.decay_rate * hours_since_access)
-        return max(0.01, decay_factor)  # Minimum decay factor
+    def _queue_consolidation(self, memory_id: str, memory: Dict[str, Any]) -> bool:
+        """Queue a memory for LDM consolidation (call with memory_lock held)"""
+        if memory_id in self.pending_consolidation:
+            return False
+        
+        # LDM reads a copy so later WMS updates never race with its tokenizer
+        snapshot = dict(memory)
+        snapshot['content'] = dict(memory['content'])
+        snapshot['strength'] = self._memory_strength(memory_id)
+        self.pending_consolidation.add(memory_id)
+        self.consolidation_queue.put((memory_id, memory, snapshot))
+        return True
     
-    def _consolidate_to_ldm(self, memory_id: str, memory: Dict[str, Any]) -> None:
-        """Consolidate memory to Long-Term Declarative Memory"""
+    def _next_consolidation_batch(self, block: bool) -> List[Tuple[str, Dict[str, Any], Dict[str, Any]]]:
+        """Take up to consolidation_batch_size queued memories"""
+        batch = []
         try:
-            # Find LDM module in children
-            ldm_module = None
+            if block:
+                batch.append(self.consolidation_queue.get(timeout=0.5))
+            while len(batch) < self.consolidation_batch_size:
+                batch.append(self.consolidation_queue.get_nowait())
+        except queue.Empty:
+            pass
+        return batch
+    
+    def _find_ldm_module(self):
+        """LDM child module (cached by add_child)"""
+        if self.ldm_module is None:
             for child in self.children:
                 if child.module_id == "LDM":
-                    ldm_module = child
+                    self.ldm_module = child
                     break
+        return self.ldm_module
+    
+    def _consolidate_batch(self, batch: List[Tuple[str, Dict[str, Any], Dict[str, Any]]]) -> int:
+        """
+        Consolidate a batch of queued memories to Long-Term Declarative Memory
+        
+        LDM is written without holding memory_lock; the lock is only taken
+        afterwards to drop the accepted memories from working memory.
+        """
+        consolidated = set()
+        try:
+            ldm_module = self._find_ldm_module()
             
             if ldm_module and ldm_module.is_initialized:
-                # Send memory to LDM for consolidation
-                success = ldm_module.consolidate_from_wms(memory_id, memory)
-                
-                if success:
-                    # Remove from working memory after successful consolidation
-                    if memory_id in self.active_memories:
-                        del self.active_memories[memory_id]
-                    self.logger.debug(f"Successfully consolidated memory {memory_id} to LDM")
-                else:
-                    self.logger.warning(f"Failed to consolidate memory {memory_id} to LDM")
+                # Send the whole batch to LDM in one call
+                consolidated = set(ldm_module.consolidate_many(
+                    [(memory_id, snapshot) for memory_id, _, snapshot in batch]
+                ))
+                failed = len(batch) - len(consolidated)
+                if failed:
+                    self.logger.warning(f"Failed to consolidate {failed} memories to LDM")
             else:
                 self.logger.warning("LDM module not available for consolidation")
                 
         except Exception as e:
-            self.logger.error(f"Error consolidating memory {memory_id} to LDM: {e}")
+            self.logger.error(f"Error consolidating {len(batch)} memories to LDM: {e}")
+        
+        finally:
+            with self.memory_lock:
+                for memory_id, memory, _ in batch:
+                    self.pending_consolidation.discard(memory_id)
+                    # Remove from working memory after successful consolidation,
+                    # unless the memory was replaced while it was queued
+                    if memory_id in consolidated and self.active_memories.get(memory_id) is memory:
+                        self._remove_memory(memory_id)
+            for _ in batch:
+                self.consolidation_queue.task_done()
+        
+        self.logger.debug(f"Consolidated {len(consolidated)} of {len(batch)} memories to LDM")
+        return len(consolidated)
     
     def _calculate_average_strength(self) -> float:
         """Calculate average strength of active memories"""
         if not self.active_memories:
             return 0.0
         
-        total_strength = sum(memory['strength'] for memory in self.active_memories.values())
+        total_strength = float(self.slot_strengths[self.slot_active].sum())
         return total_strength / len(self.active_memories)
     
     def _count_consolidation_candidates(self) -> int:
@@ -435,6 +741,10 @@ class WorkingMemorySystem(CoreSystemModule):
         # Run final decay cycle
         self.process_decay_cycle()
         
+        # Finish queued consolidations before stopping
+        self.stop_consolidation()
+        self.flush_consolidation()
+        
         # TODO: Consolidate remaining important memories
         # TODO: Save memory statistics
         # TODO: Clean up memory structures